@@ -26,6 +26,7 @@ NOVÉ KONCEPTY:
 - Textové zobrazení na displeji
 - Knihovna displayio pro grafiku
 - Kombinace senzoru a displeje
+- Překreslení displeje jen když se text změní
 """
 
 # import knihoven pro práci s hardware
@@ -36,6 +37,7 @@ import displayio       # základní grafické operace
 import terminalio      # vestavěný font
 import adafruit_displayio_ssd1306  # knihovna pro SSD1306 OLED
 import adafruit_sht4x  # knihovna pro SHT40 senzor
+import makerclass_dashboard  # překreslení displeje jen při změně
 from adafruit_display_text import label  # textové popisky
 
 # vytvoření I2C sběrnice (sdílená pro SHT40 i OLED)
@@ -77,6 +79,11 @@ main_group.append(time_label)
 # zobrazení skupiny na displeji
 display.root_group = main_group
 
+# panel vypne automatické překreslování a displej překreslí jen po změně textu,
+# takže se po sběrnici zbytečně neposílají stejná data
+panel = makerclass_dashboard.Dashboard(display)
+panel.refresh(force=True)  # první vykreslení všech popisků
+
 # proměnné pro čas
 start_time = time.monotonic()
 
@@ -87,15 +94,18 @@ try:
         teplota = sht.temperature
         vlhkost = sht.relative_humidity
         
-        # aktualizace textů na displeji
-        temp_value.text = f"{teplota:.1f}°C"
-        hum_value.text = f"{vlhkost:.1f}%"
+        # aktualizace textů na displeji (nezměněný text se přeskočí)
+        panel.set(temp_value, f"{teplota:.1f}°C")
+        panel.set(hum_value, f"{vlhkost:.1f}%")
         
         # přesné počítání času pomocí monotonic
         uplynuly_cas = time.monotonic() - start_time
         minuty = int(uplynuly_cas) // 60
         sekundy = int(uplynuly_cas) % 60
-        time_label.text = f"{minuty:02d}:{sekundy:02d}"
+        panel.set(time_label, f"{minuty:02d}:{sekundy:02d}")
+
+        # překreslení displeje, jen pokud se něco změnilo
+        panel.refresh()
         
         # zobrazení dat také v konzoli
         print(f"Teplota: {teplota:.1f}°C, Vlhkost: {vlhkost:.1f}%, Čas: {minuty:02d}:{sekundy:02d}")
@@ -104,5 +114,7 @@ try:
         time.sleep(1)
 
 finally: 
+    # kolik překreslení a bajtů panel ušetřil
+    print(panel.report())
     i2c.deinit()
     print("I2C sběrnice uvolněna")
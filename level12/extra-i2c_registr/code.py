@@ -0,0 +1,78 @@
+"""
+LEVEL 12 - Registr I2C zařízení: rozpoznání podle ID a rychlý start z paměti NVM
+
+ZAPOJENÍ OBVODU:
+Připojte jakákoliv I2C zařízení na sběrnici, např. SHT40, OLED a MPU:
+- SDA k GP16 (modrá)
+- SCL k GP17 (žlutá)
+- VCC k 3V3
+- GND k GND
+
+JAK TO FUNGUJE:
+Scanner v extra-i2c_scan pozná zařízení jen podle adresy. Na adrese 0x68 ale
+může být MPU6050 i hodiny DS3231. Registr se proto každého zařízení zeptá
+na jeho identitu:
+- MPU odpoví obsahem registru WHO_AM_I (0x68 = MPU6050, 0x70 = MPU6500...)
+- SHT40 pošle své sériové číslo (zkontrolované kontrolním součtem CRC)
+- OLED SSD1306 pošle stavový bajt
+
+Výsledek se uloží do paměti NVM. Při dalším startu registr jen ověří
+uložená zařízení a celé skenování přeskočí. Když zařízení odpojíte nebo
+vyměníte, ověření selže a registr sběrnici projde znovu celou.
+
+NOVÉ KONCEPTY:
+- Identifikační registry (WHO_AM_I, sériové číslo)
+- Kontrolní součet CRC
+- Ukládání výsledku do NVM pro rychlejší start
+"""
+
+# import knihoven pro práci s hardware
+import board           # přístup k pinům a hardware zařízení
+import busio           # I2C komunikace
+import time            # funkce pro čekání a práci s časem
+import makerclass_i2c_discovery  # registr I2C zařízení
+
+print("📇 REGISTR I2C ZAŘÍZENÍ")
+print()
+
+# vytvoření I2C sběrnice
+i2c = busio.I2C(board.GP17, board.GP16)  # SCL, SDA
+
+try:
+    registr = makerclass_i2c_discovery.I2CRegistry(i2c)
+
+    # první pokus: ověření zařízení uložených v NVM, jinak celé skenování
+    start = time.monotonic_ns()
+    zarizeni = registr.discover()
+    doba = (time.monotonic_ns() - start) / 1_000_000
+    if registr.from_cache:
+        print(f"✅ Zařízení z NVM ověřena za {doba:.1f} ms")
+    else:
+        print(f"🔍 Sběrnice projita celá za {doba:.1f} ms, výsledek uložen do NVM")
+
+    # pro srovnání vždy i celé skenování (nic se nemění, NVM se nepřepisuje)
+    start = time.monotonic_ns()
+    registr.scan()
+    doba = (time.monotonic_ns() - start) / 1_000_000
+    print(f"   celé skenování pro srovnání: {doba:.1f} ms")
+    print()
+
+    print("📋 SEZNAM ZAŘÍZENÍ:")
+    for adresa in sorted(zarizeni):
+        zarizeni_na_adrese = zarizeni[adresa]
+        print(f"  • 0x{adresa:02X}: {zarizeni_na_adrese.name} (identita 0x{zarizeni_na_adrese.identity:X})")
+    print()
+
+    # další programy si najdou adresu podle jména a nemusí ji mít napevno
+    adresa_mpu = registr.find("MPU")
+    if adresa_mpu is not None:
+        print(f"MPU senzor je na adrese 0x{adresa_mpu:02X}")
+    adresa_displeje = registr.find("SSD1306")
+    if adresa_displeje is not None:
+        print(f"OLED displej je na adrese 0x{adresa_displeje:02X}")
+
+finally:
+    # uvolnění I2C sběrnice
+    i2c.deinit()
+    print()
+    print("I2C sběrnice uvolněna")
@@ -0,0 +1,79 @@
+"""
+LEVEL 12 - Nejrychlejší spolehlivá rychlost I2C sběrnice
+
+ZAPOJENÍ OBVODU:
+Stejné jako Level 12 - SHT40 a OLED displej (případně i MPU) na společné sběrnici:
+- SDA k GP16 (modrá)
+- SCL k GP17 (žlutá)
+- VCC k 3V3
+- GND k GND
+
+JAK TO FUNGUJE:
+busio.I2C bez parametru frequency běží na 100 kHz. Displej SSD1306, SHT40
+i MPU přitom zvládnou 400 kHz a na krátkých vodičích často i víc. Jak rychle
+sběrnice opravdu může běžet, záleží na délce vodičů a pull-up odporech,
+proto to změříme:
+1. Pro každou rychlost (100, 400, 800, 1000 kHz) se 20x zeptáme každého
+   zařízení na jeho identitu a počítáme chyby (NACK, timeout, špatná data)
+2. Vybereme nejrychlejší rychlost bez chyb
+3. Změříme, jak dlouho trvá překreslení displeje na 100 kHz a na vybrané rychlosti
+
+NOVÉ KONCEPTY:
+- Frekvence I2C sběrnice (hodinový signál SCL)
+- Chybovost přenosu a její měření
+- Propustnost - kolik dat za sekundu sběrnice přenese
+"""
+
+# import knihoven pro práci s hardware
+import board           # přístup k pinům a hardware zařízení
+import busio           # I2C komunikace
+import time            # funkce pro čekání a práci s časem
+import displayio       # základní grafické operace
+import terminalio      # vestavěný font
+import adafruit_displayio_ssd1306  # knihovna pro SSD1306 OLED
+import makerclass_i2c_autotune  # měření rychlosti I2C sběrnice
+from adafruit_display_text import label  # textové popisky
+
+# počet překreslení displeje pro měření
+POCET_PREKRESLENI = 20
+
+print("⚡ RYCHLOST I2C SBĚRNICE")
+print("Měřím chybovost na jednotlivých rychlostech...")
+print()
+
+# uvolnění případných předchozích displejů, které by držely sběrnici
+displayio.release_displays()
+
+# měření a výběr nejrychlejší spolehlivé rychlosti
+i2c, nejrychlejsi, vysledky = makerclass_i2c_autotune.autotune(board.GP17, board.GP16)
+print(makerclass_i2c_autotune.report(vysledky))
+print()
+print(f"✅ Vybráno: {nejrychlejsi // 1000} kHz")
+print()
+i2c.deinit()
+
+
+def zmer_displej(frekvence):
+    """Vrátí průměrnou dobu překreslení displeje v milisekundách"""
+    i2c = busio.I2C(board.GP17, board.GP16, frequency=frekvence)
+    display_bus = displayio.I2CDisplay(i2c, device_address=0x3C)
+    display = adafruit_displayio_ssd1306.SSD1306(display_bus, width=128, height=64, auto_refresh=False)
+    text = label.Label(terminalio.FONT, text="", color=0xFFFFFF, x=10, y=30, scale=2)
+    display.root_group = text
+    start = time.monotonic_ns()
+    for i in range(POCET_PREKRESLENI):
+        text.text = f"{frekvence // 1000} kHz {i:2d}"
+        display.refresh(target_frames_per_second=None)  # překreslit hned
+    doba = (time.monotonic_ns() - start) / 1_000_000 / POCET_PREKRESLENI
+    displayio.release_displays()
+    i2c.deinit()
+    return doba
+
+
+# srovnání překreslení displeje
+pomalu = zmer_displej(100_000)
+rychle = zmer_displej(nejrychlejsi)
+print(f"Překreslení displeje na 100 kHz: {pomalu:6.1f} ms")
+print(f"Překreslení displeje na {nejrychlejsi // 1000} kHz: {rychle:6.1f} ms ({pomalu / rychle:.1f}x rychleji)")
+print()
+print(f"Ve svých programech použijte: busio.I2C(board.GP17, board.GP16, frequency={nejrychlejsi})")
@@ -0,0 +1,134 @@
+"""
+LEVEL 12 - Odolná I2C sběrnice: displej, který nespadne
+
+ZAPOJENÍ OBVODU:
+Stejné jako Level 12 - SHT40 a OLED displej na společné sběrnici:
+- SDA k GP16 (modrá)
+- SCL k GP17 (žlutá)
+- VCC k 3V3
+- GND k GND
+
+JAK TO FUNGUJE:
+Stačí zavadit o vodič a čtení ze senzoru skončí chybou OSError. Program
+z Level 12 pak skončí a displej zamrzne. Horší je, když se přenos přeruší
+uprostřed bajtu: zařízení pak drží SDA v nule a sběrnice nefunguje, dokud
+se neodpojí napájení.
+
+ResilientI2C (knihovna makerclass_i2c_resilient) se chová jako busio.I2C, ale:
+1. Neúspěšný přenos zopakuje, s čekáním 1 ms, 2 ms, 4 ms...
+2. Zařízení, které selže 5x za sebou, na 5 sekund přeskočí, aby nebrzdilo
+   ostatní, a pak to s ním zkusí znovu
+3. Když se sběrnice zasekne, uvolní ji: pinem SCL "doťuká" rozpracovaný bajt,
+   pošle STOP a vytvoří novou busio.I2C
+
+Chybu, která projde i přes opakování, program zachytí, ukáže na displeji
+a měří dál ve stejném rytmu. Zachytí i RuntimeError, kterým SHT40 hlásí
+poškozená data (nesedí kontrolní součet CRC) - i to je typický následek
+rušení na vodičích. Vyzkoušejte za běhu odpojit a připojit SHT40.
+
+NOVÉ KONCEPTY:
+- Opakování s rostoucím čekáním (exponential backoff)
+- Jistič (circuit breaker) - dočasné vyřazení vadného zařízení
+- Obnova zaseknuté I2C sběrnice
+"""
+
+# import knihoven pro práci s hardware
+import board           # přístup k pinům a hardware zařízení
+import time            # funkce pro čekání a práci s časem
+import displayio       # základní grafické operace
+import terminalio      # vestavěný font
+import adafruit_displayio_ssd1306  # knihovna pro SSD1306 OLED
+import adafruit_sht4x  # knihovna pro SHT40 senzor
+import makerclass_i2c_resilient  # odolná I2C sběrnice
+from adafruit_display_text import label  # textové popisky
+
+# perioda měření v sekundách
+PERIODA = 1.0
+
+# příznak, že se sběrnice obnovila a displej je potřeba vytvořit znovu
+displej_obnovit = False
+
+# počet zachycených chyb (sběrnice i CRC)
+pocet_chyb = 0
+
+
+def pred_obnovou(sbernice):
+    """Volá se před uvolněním staré sběrnice - displej na ní už nesmí kreslit"""
+    displayio.release_displays()
+
+
+def po_obnove(sbernice):
+    """Volá se po vytvoření nové sběrnice, uprostřed přenosu - displej vytvoří až hlavní smyčka"""
+    global displej_obnovit
+    displej_obnovit = True
+
+
+# vytvoření odolné I2C sběrnice (sdílená pro SHT40 i OLED)
+i2c = makerclass_i2c_resilient.ResilientI2C(
+    board.GP17, board.GP16, before_recover=pred_obnovou, on_recover=po_obnove  # SCL, SDA
+)
+
+# inicializace SHT40 senzoru
+sht = adafruit_sht4x.SHT4x(i2c)
+
+# vytvoření textových popisků
+main_group = displayio.Group()
+temp_value = label.Label(terminalio.FONT, text="--.-°C", color=0xFFFFFF, x=5, y=10, scale=2)
+hum_value = label.Label(terminalio.FONT, text="--.-%", color=0xFFFFFF, x=5, y=35)
+stav_label = label.Label(terminalio.FONT, text="", color=0xFFFFFF, x=5, y=55)
+main_group.append(temp_value)
+main_group.append(hum_value)
+main_group.append(stav_label)
+
+
+def vytvor_displej():
+    """Vytvoří displej na aktuální busio.I2C (i2c.i2c se při obnově mění)"""
+    displayio.release_displays()
+    display_bus = displayio.I2CDisplay(i2c.i2c, device_address=0x3C)
+    display = adafruit_displayio_ssd1306.SSD1306(display_bus, width=128, height=64)
+    display.root_group = main_group
+    return display
+
+
+display = vytvor_displej()
+
+print("🛡️ ODOLNÁ I2C SBĚRNICE")
+print("Zkuste za běhu odpojit a připojit SHT40")
+print()
+
+# hlavní smyčka - běží dál i při chybách sběrnice
+dalsi_mereni = time.monotonic()
+try:
+    while True:
+        if displej_obnovit:
+            displej_obnovit = False
+            display = vytvor_displej()
+            print("🔧 Sběrnice obnovena, displej znovu vytvořen")
+
+        try:
+            teplota, vlhkost = sht.measurements
+            temp_value.text = f"{teplota:.1f}°C"
+            hum_value.text = f"{vlhkost:.1f}%"
+            stav_label.text = f"opak. {i2c.retried} obnov {i2c.recoveries}"
+            print(f"Teplota: {teplota:.1f}°C, Vlhkost: {vlhkost:.1f}%")
+        except (OSError, RuntimeError) as chyba:
+            # senzor neodpověděl ani po opakování nebo poslal poškozená data
+            # (RuntimeError při chybném CRC) - ukážeme to a měříme dál
+            pocet_chyb += 1
+            if i2c.is_open(0x44):
+                stav_label.text = "SHT40 vyrazen"
+            elif isinstance(chyba, RuntimeError):
+                stav_label.text = f"chyba CRC ({pocet_chyb})"
+            else:
+                stav_label.text = f"chyba {chyba.errno} ({pocet_chyb})"
+            print(f"⚠️ Chyba: {chyba} (chyb {pocet_chyb}, opakování {i2c.retried}, "
+                  f"selhání {i2c.failed}, přeskočeno {i2c.rejected}, obnov {i2c.recoveries})")
+
+        # další měření ve stejném rytmu, i když se čekalo na opakování
+        dalsi_mereni += PERIODA
+        time.sleep(max(0, dalsi_mereni - time.monotonic()))
+
+finally:
+    displayio.release_displays()
+    i2c.deinit()
+    print("I2C sběrnice uvolněna")
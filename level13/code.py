@@ -29,6 +29,7 @@ NOVÉ KONCEPTY:
 - Gyroskop - měření úhlové rychlosti  
 - 6-axis snímání pohybu
 - Kombinace více senzorů na I2C
+- Překreslení displeje jen když se text změní
 """
 
 # import knihoven pro práci s hardware
@@ -40,13 +41,16 @@ import displayio       # základní grafické operace
 import terminalio      # vestavěný font
 import adafruit_displayio_ssd1306  # knihovna pro SSD1306 OLED
 import makerclass_accelerometer  # MakerClass univerzální knihovna pro MPU senzory
+import makerclass_dashboard  # překreslení displeje jen při změně
 from adafruit_display_text import label  # textové popisky
 
 # vytvoření I2C sběrnice (sdílená pro MPU senzor i OLED)
 i2c = busio.I2C(board.GP17, board.GP16)  # SCL, SDA
 
 # inicializace MPU senzoru (automatická detekce MPU6050/MPU6500/MPU9250)
-mpu = makerclass_accelerometer.MakerClassAccelerometer(i2c)
+# fast_init - místo pevného čekání se ptáme senzoru, jestli už je připravený
+# keep_configuration - po restartu programu přeskočí reset již nastaveného senzoru
+mpu = makerclass_accelerometer.MakerClassAccelerometer(i2c, fast_init=True, keep_configuration=True)
 
 # inicializace OLED displeje
 displayio.release_displays()  # uvolnění případných předchozích displejů
@@ -86,26 +90,34 @@ main_group.append(gyro_z)
 # zobrazení skupiny na displeji
 display.root_group = main_group
 
+# panel vypne automatické překreslování a displej překreslí jen po změně textu,
+# nejvýš 10x za sekundu, aby sběrnice zbyla i pro MPU
+panel = makerclass_dashboard.Dashboard(display, max_fps=10)
+panel.refresh(force=True)  # první vykreslení všech popisků
+
 # hlavní smyčka čtení IMU dat
 try:
     while True:
         # čtení dat z MPU senzoru (automaticky rozpoznán typ čipu)
-        accel_x_val, accel_y_val, accel_z_val = mpu.acceleration  # m/s²
-        gyro_x_val, gyro_y_val, gyro_z_val = mpu.gyro            # °/s
-        teplota = mpu.temperature                                  # °C
+        # mpu.motion přečte zrychlení, gyroskop i teplotu jednou I2C transakcí,
+        # takže všechny hodnoty pochází ze stejného okamžiku
+        (accel_x_val, accel_y_val, accel_z_val), (gyro_x_val, gyro_y_val, gyro_z_val), teplota = mpu.motion
         
         # data z gyroskopu jsou už ve stupních/s
         gyro_x_deg = gyro_x_val
         gyro_y_deg = gyro_y_val
         gyro_z_deg = gyro_z_val
         
-        # aktualizace textů na displeji - všechny 3 osy
-        accel_x.text = f"X:{accel_x_val:4.1f}"
-        accel_y.text = f"Y:{accel_y_val:4.1f}"
-        accel_z.text = f"Z:{accel_z_val:4.1f}"
-        gyro_x.text = f"X:{gyro_x_deg:4.1f}"
-        gyro_y.text = f"Y:{gyro_y_deg:4.1f}"
-        gyro_z.text = f"Z:{gyro_z_deg:4.1f}"
+        # aktualizace textů na displeji - všechny 3 osy (nezměněný text se přeskočí)
+        panel.set(accel_x, f"X:{accel_x_val:4.1f}")
+        panel.set(accel_y, f"Y:{accel_y_val:4.1f}")
+        panel.set(accel_z, f"Z:{accel_z_val:4.1f}")
+        panel.set(gyro_x, f"X:{gyro_x_deg:4.1f}")
+        panel.set(gyro_y, f"Y:{gyro_y_deg:4.1f}")
+        panel.set(gyro_z, f"Z:{gyro_z_deg:4.1f}")
+
+        # překreslení displeje, jen pokud se něco změnilo
+        panel.refresh()
         
         # zobrazení podrobných dat v konzoli
         print(f"Accel: X:{accel_x_val:5.2f} Y:{accel_y_val:5.2f} Z:{accel_z_val:5.2f} | Gyro: X:{gyro_x_deg:5.1f} Y:{gyro_y_deg:5.1f} Z:{gyro_z_deg:5.1f} | T:{teplota:.1f}°C")
@@ -114,6 +126,8 @@ try:
         time.sleep(0.2)
 
 finally:
+    # kolik překreslení a bajtů panel ušetřil
+    print(panel.report())
     # uvolnění I2C sběrnice
     i2c.deinit()
     print("I2C sběrnice uvolněna")
\ No newline at end of file
@@ -0,0 +1,69 @@
+"""
+LEVEL 13 - Čisté pomalé měření: rychlé vzorkování a průměrování z FIFO
+
+ZAPOJENÍ OBVODU:
+GY-521 MPU6500/MPU6050 IMU senzor:
+   - VCC k 3V3
+   - GND k zemi (GND)
+   - SCL k GP17 (I2C clock - žlutá)
+   - SDA k GP16 (I2C data - modrá)
+
+JAK TO FUNGUJE:
+Hlavní program čte senzor jednou za 0.2 s. Senzor ale měří mnohem rychleji
+a my z jeho proudu vzorků vybereme jen každý dvoustý. Šum v datech zůstane
+a rychlé vibrace (např. motoru) se mohou "převléct" za pomalý pohyb,
+který ve skutečnosti neexistuje - tomu se říká aliasing.
+
+Lépe je nechat senzor měřit 1000x za sekundu do jeho paměti FIFO
+a vždy 200 vzorků zprůměrovat do jednoho:
+- configure_odr() nastaví rychlost měření a k ní vhodný filtr v senzoru
+- Decimator sčítá surová celá čísla a jednou za 200 vzorků vrátí průměr
+Dostaneme 5 měření za sekundu jako hlavní program, ale bez šumu a falešných
+kmitů. Program vypisuje pro srovnání i jedno obyčejné čtení.
+
+NOVÉ KONCEPTY:
+- Vzorkovací frekvence a aliasing
+- Dolní propust (low pass filter) v senzoru
+- Decimace - průměrování na nižší frekvenci
+"""
+
+# import knihoven pro práci s hardware
+import board           # přístup k pinům a hardware zařízení
+import busio           # I2C komunikace
+import time            # funkce pro čekání a práci s časem
+import makerclass_accelerometer  # MakerClass univerzální knihovna pro MPU senzory
+import makerclass_decimator      # průměrování vzorků z FIFO
+
+# rychlost měření senzoru a kolik vzorků průměrovat
+FREKVENCE_SENZORU = 1000  # Hz
+PRUMEROVANI = 200         # 1000 Hz / 200 = 5 výsledků za sekundu
+
+# vytvoření I2C sběrnice - 400 kHz, ať FIFO stíháme vyčítat
+i2c = busio.I2C(board.GP17, board.GP16, frequency=400000)  # SCL, SDA
+
+# inicializace MPU senzoru
+mpu = makerclass_accelerometer.MakerClassAccelerometer(i2c, fast_init=True)
+
+# nastavení rychlosti měření, filtr se vybere sám
+frekvence = mpu.configure_odr(FREKVENCE_SENZORU)
+decimator = makerclass_decimator.Decimator(PRUMEROVANI)
+mpu.start_fifo()
+
+print("📉 PRŮMĚROVÁNÍ Z FIFO")
+print(f"Senzor měří {frekvence:.0f}x za sekundu, výsledek {frekvence / PRUMEROVANI:.0f}x za sekundu")
+print()
+
+try:
+    while True:
+        # vyčtení FIFO - vrátí jen hotové průměry, zbytek počká na další kolo
+        for accel, gyro, teplota in decimator.frames(mpu):
+            # jedno obyčejné čtení pro srovnání
+            okamzite = mpu.acceleration
+            print(f"Průměr Z:{accel[2]:6.3f} m/s² Gyro Z:{gyro[2]:6.2f} °/s | Jedno čtení Z:{okamzite[2]:6.3f} m/s²")
+
+        # FIFO pojme jen asi 70 ms dat při 1 kHz, vyčítáme častěji
+        time.sleep(0.02)
+
+finally:
+    # uvolnění I2C sběrnice
+    i2c.deinit()
@@ -0,0 +1,59 @@
+"""
+LEVEL 13 - Dva MPU senzory na jedné I2C sběrnici
+
+ZAPOJENÍ OBVODU:
+Dva GY-521 MPU6500/MPU6050 IMU senzory, oba zapojené stejně:
+   - VCC k 3V3
+   - GND k zemi (GND)
+   - SCL k GP17 (I2C clock - žlutá)
+   - SDA k GP16 (I2C data - modrá)
+Navíc u druhého senzoru:
+   - AD0 k 3V3 (adresa 0x69 místo 0x68)
+
+JAK TO FUNGUJE:
+Každé zařízení na I2C sběrnici má svou adresu. Senzor MPU má pin AD0,
+kterým adresu přepneme z 0x68 na 0x69 - díky tomu mohou být na jedné
+sběrnici dva. Třída MakerClassAccelerometerArray přečte oba senzory hned
+po sobě a zapamatuje si čas každého čtení. Rozdíl časů (skew) ukazuje,
+jak daleko od sebe jsou oba vzorky - čím rychlejší sběrnice, tím menší.
+
+NOVÉ KONCEPTY:
+- Více zařízení na jedné I2C sběrnici (adresy 0x68 a 0x69)
+- Časová razítka měření (time.monotonic_ns)
+- Rychlost I2C sběrnice (frequency)
+"""
+
+# import knihoven pro práci s hardware
+import board           # přístup k pinům a hardware zařízení
+import busio           # I2C komunikace
+import time            # funkce pro čekání a práci s časem
+from array import array  # pole čísel s pevným typem
+import makerclass_accelerometer  # MakerClass univerzální knihovna pro MPU senzory
+
+# vytvoření I2C sběrnice - 400 kHz zkrátí čas mezi čteními obou senzorů
+i2c = busio.I2C(board.GP17, board.GP16, frequency=400000)  # SCL, SDA
+
+# inicializace obou senzorů (adresy 0x68 a 0x69)
+mpu = makerclass_accelerometer.MakerClassAccelerometerArray(i2c)
+
+# 7 hodnot na senzor: zrychlení X,Y,Z, gyroskop X,Y,Z, teplota
+data = array("f", [0] * 14)
+
+print("🔀 DVA MPU SENZORY")
+print()
+
+try:
+    while True:
+        mpu.read_motion_into(data)
+        skew_us = (mpu.timestamps[1] - mpu.timestamps[0]) // 1000
+
+        print(f"MPU 0x68: Accel X:{data[0]:5.2f} Y:{data[1]:5.2f} Z:{data[2]:5.2f} | Gyro X:{data[3]:6.1f} Y:{data[4]:6.1f} Z:{data[5]:6.1f}")
+        print(f"MPU 0x69: Accel X:{data[7]:5.2f} Y:{data[8]:5.2f} Z:{data[9]:5.2f} | Gyro X:{data[10]:6.1f} Y:{data[11]:6.1f} Z:{data[12]:6.1f}")
+        print(f"Rozdíl času čtení: {skew_us} µs")
+        print()
+        time.sleep(0.5)
+
+finally:
+    # uvolnění I2C sběrnice
+    i2c.deinit()
+    print("I2C sběrnice uvolněna")
@@ -0,0 +1,107 @@
+"""
+LEVEL 13 - Kalibrace MPU senzoru s uložením do paměti NVM
+
+ZAPOJENÍ OBVODU:
+GY-521 MPU6500/MPU6050 IMU senzor:
+   - VCC k 3V3
+   - GND k zemi (GND)
+   - SCL k GP17 (I2C clock - žlutá)
+   - SDA k GP16 (I2C data - modrá)
+
+JAK FUNGUJE KALIBRACE:
+Žádný senzor není dokonalý. Gyroskop v klidu neukazuje přesně 0 °/s
+a akcelerometr naležato neukazuje přesně 0 / 0 / 9.81 m/s². Tyto odchylky
+(bias) změříme tak, že senzor necháme ležet v klidu a zprůměrujeme stovky
+měření. Výsledek uložíme do paměti NVM (non-volatile memory), která přežije
+i odpojení napájení. Knihovna si ji při dalším startu sama načte, takže
+kalibraci stačí udělat jen jednou.
+
+TEPLOTNÍ KOMPENZACE GYROSKOPU:
+Bias gyroskopu se mění s teplotou čipu - po zapnutí se senzor ohřívá
+a gyroskop pomalu "ujíždí". Když nastavíte UCIT_TEPLOTU = True, program
+po kalibraci ještě několik minut měří bias, zatímco se deska zahřívá,
+a proloží jím přímku (bias na °C). Knihovna pak bias podle teploty
+průběžně přepočítává. Nejlepší je začít se studenou deskou.
+
+POSTUP:
+1. Položte senzor na rovnou podložku (čipem nahoru) a nehýbejte s ním
+2. Spusťte tento program
+3. Hotovo - ostatní programy (level13, level15) už použijí kalibrovaná data
+
+NOVÉ KONCEPTY:
+- Kalibrace senzorů (bias)
+- Průměrování měření
+- Trvalá paměť NVM (microcontroller.nvm)
+- Teplotní kompenzace (lineární model, metoda nejmenších čtverců)
+"""
+
+# import knihoven pro práci s hardware
+import board           # přístup k pinům a hardware zařízení
+import busio           # I2C komunikace
+import time            # funkce pro čekání a práci s časem
+import makerclass_accelerometer  # MakerClass univerzální knihovna pro MPU senzory
+
+# počet měření pro průměrování
+POCET_MERENI = 500
+
+# učení teplotní závislosti gyroskopu během zahřívání
+UCIT_TEPLOTU = False
+DOBA_UCENI = 600  # sekund
+
+# vytvoření I2C sběrnice
+i2c = busio.I2C(board.GP17, board.GP16)  # SCL, SDA
+
+# inicializace MPU senzoru - bez načtení staré kalibrace
+mpu = makerclass_accelerometer.MakerClassAccelerometer(i2c, calibration=False)
+
+print("🎯 KALIBRACE MPU SENZORU")
+print("Senzor musí ležet naležato a v klidu!")
+print()
+
+try:
+    # data před kalibrací
+    accel_x, accel_y, accel_z = mpu.acceleration
+    gyro_x, gyro_y, gyro_z = mpu.gyro
+    print(f"Před kalibrací: Accel X:{accel_x:5.2f} Y:{accel_y:5.2f} Z:{accel_z:5.2f} | Gyro X:{gyro_x:5.2f} Y:{gyro_y:5.2f} Z:{gyro_z:5.2f}")
+
+    # odpočet, aby se senzor po spuštění uklidnil
+    for sekunda in range(3, 0, -1):
+        print(f"Kalibrace začne za {sekunda} s...")
+        time.sleep(1)
+
+    print(f"Měřím {POCET_MERENI} vzorků...")
+    mpu.calibrate(samples=POCET_MERENI)
+
+    # výpis naměřených odchylek
+    accel_bias, accel_scale, gyro_bias = mpu.calibration
+    print(f"Bias akcelerometru (g):   X:{accel_bias[0]:7.4f} Y:{accel_bias[1]:7.4f} Z:{accel_bias[2]:7.4f}")
+    print(f"Bias gyroskopu (°/s):     X:{gyro_bias[0]:7.3f} Y:{gyro_bias[1]:7.3f} Z:{gyro_bias[2]:7.3f}")
+
+    if UCIT_TEPLOTU:
+        print(f"🌡️ Učím teplotní závislost gyroskopu {DOBA_UCENI} s, nehýbejte se senzorem...")
+        mereni = mpu.learn_gyro_temperature(DOBA_UCENI)
+        print(f"Hotovo, {mereni} měření")
+
+    # teplotní model: bias platí při referenční teplotě, sklon je změna na °C
+    model = mpu.gyro_temperature_model
+    if model:
+        teplota, sklon = model
+        print(f"Referenční teplota: {teplota:.1f} °C")
+        print(f"Sklon (°/s na °C):        X:{sklon[0]:7.4f} Y:{sklon[1]:7.4f} Z:{sklon[2]:7.4f}")
+
+    # uložení do NVM - při dalším startu se kalibrace načte automaticky
+    mpu.save_calibration()
+    print("💾 Kalibrace uložena do NVM")
+    print()
+
+    # data po kalibraci
+    while True:
+        accel_x, accel_y, accel_z = mpu.acceleration
+        gyro_x, gyro_y, gyro_z = mpu.gyro
+        print(f"Po kalibraci: Accel X:{accel_x:5.2f} Y:{accel_y:5.2f} Z:{accel_z:5.2f} | Gyro X:{gyro_x:5.2f} Y:{gyro_y:5.2f} Z:{gyro_z:5.2f}")
+        time.sleep(0.5)
+
+finally:
+    # uvolnění I2C sběrnice
+    i2c.deinit()
+    print("I2C sběrnice uvolněna")
@@ -0,0 +1,89 @@
+"""
+LEVEL 13 - Kompas s magnetometrem MPU9250
+
+ZAPOJENÍ OBVODU:
+Modul s MPU9250 (GY-9250) IMU senzorem:
+   - VCC k 3V3
+   - GND k zemi (GND)
+   - SCL k GP17 (I2C clock - žlutá)
+   - SDA k GP16 (I2C data - modrá)
+
+JAK TO FUNGUJE:
+MPU9250 obsahuje kromě akcelerometru a gyroskopu i magnetometr AK8963,
+který měří magnetické pole Země (v µT). Magnetometr je uvnitř čipu připojený
+na vlastní I2C sběrnici. MPU ho umí sám číst a jeho data uložit hned za data
+gyroskopu - jedním čtením tak dostaneme všech 9 os najednou.
+
+Směr k severu spočítáme z vodorovné složky magnetického pole. Když je deska
+nakloněná, "vodorovná" rovina se posune - proto náklon změřený akcelerometrem
+nejdřív odečteme (kompenzace náklonu).
+
+KALIBRACE:
+Kovové a magnetické předměty v okolí (šroubky, baterie, reproduktor) posouvají
+naměřené hodnoty. Při startu proto desku 10 sekund pomalu otáčejte ve všech
+směrech - střed mezi nejmenší a největší hodnotou každé osy je posun, který
+pak odečítáme.
+
+NOVÉ KONCEPTY:
+- Magnetometr a magnetické pole Země
+- 9-osý senzor (akcelerometr + gyroskop + magnetometr)
+- Kompenzace náklonu
+- Kalibrace magnetometru (hard iron)
+"""
+
+# import knihoven pro práci s hardware
+import board           # přístup k pinům a hardware zařízení
+import busio           # I2C komunikace
+import time            # funkce pro čekání a práci s časem
+from array import array  # pole čísel s pevným typem
+import makerclass_accelerometer  # MakerClass univerzální knihovna pro MPU senzory
+import makerclass_orientation    # výpočet orientace a kompasu
+
+# délka kalibrace magnetometru (sekundy)
+DELKA_KALIBRACE = 10
+
+# vytvoření I2C sběrnice
+i2c = busio.I2C(board.GP17, board.GP16)  # SCL, SDA
+
+# inicializace MPU senzoru a zapnutí magnetometru
+mpu = makerclass_accelerometer.MakerClassAccelerometer(i2c)
+mpu.enable_magnetometer()
+
+# 10 hodnot: zrychlení X,Y,Z, gyroskop X,Y,Z, teplota, magnetometr X,Y,Z
+data = array("f", [0] * 10)
+
+# světové strany po 45°
+SMERY = ("S", "SV", "V", "JV", "J", "JZ", "Z", "SZ")
+
+print("🧭 KOMPAS S MPU9250")
+print(f"Kalibrace: {DELKA_KALIBRACE} s pomalu otáčejte deskou ve všech směrech...")
+
+try:
+    # kalibrace - hledáme nejmenší a největší hodnotu každé osy
+    minimum = [1000.0, 1000.0, 1000.0]
+    maximum = [-1000.0, -1000.0, -1000.0]
+    konec = time.monotonic() + DELKA_KALIBRACE
+    while time.monotonic() < konec:
+        mag_x, mag_y, mag_z = mpu.magnetic
+        for osa, hodnota in enumerate((mag_x, mag_y, mag_z)):
+            minimum[osa] = min(minimum[osa], hodnota)
+            maximum[osa] = max(maximum[osa], hodnota)
+        time.sleep(0.02)
+    mpu.magnetometer_offset = tuple((minimum[osa] + maximum[osa]) / 2 for osa in range(3))
+    print(f"Posun magnetometru (µT): {mpu.magnetometer_offset}")
+    print()
+
+    while True:
+        # všech 9 os jedním čtením
+        mpu.read_motion_mag_into(data)
+        smer = makerclass_orientation.tilt_compensated_heading(
+            data[0], data[1], data[2], data[7], data[8], data[9]
+        )
+        strana = SMERY[int((smer + 22.5) // 45) % 8]
+        print(f"Směr: {smer:5.1f}° {strana:2} | Mag X:{data[7]:6.1f} Y:{data[8]:6.1f} Z:{data[9]:6.1f} µT")
+        time.sleep(0.2)
+
+finally:
+    # uvolnění I2C sběrnice
+    i2c.deinit()
+    print("I2C sběrnice uvolněna")
@@ -0,0 +1,121 @@
+"""
+LEVEL 13 - Plánovač I2C sběrnice: MPU, SHT40 a OLED bez vzájemného zdržování
+
+ZAPOJENÍ OBVODU:
+Na jednu I2C sběrnici připojíme tři moduly:
+   - MPU6500/MPU6050 (0x68), OLED SSD1306 (0x3C) a volitelně SHT40 (0x44)
+   - VCC k 3V3, GND k zemi (GND)
+   - SCL k GP17 (I2C clock - žlutá) - SDÍLENO
+   - SDA k GP16 (I2C data - modrá) - SDÍLENO
+
+JAK TO FUNGUJE:
+Po sběrnici může v jednu chvíli mluvit jen jedno zařízení. Obnovení displeje
+posílá stovky bajtů a trvá i desítky milisekund - když ho uděláme uprostřed
+smyčky, čtení pohybu čeká a vzorky z MPU přestanou být pravidelné.
+
+Plánovač dostane pro každé zařízení úlohu s periodou a prioritou:
+- MPU: 100x za sekundu, nejvyšší priorita
+- SHT40: jednou za 2 sekundy
+- displej: 5x za sekundu, rozdělený na malé kousky (každý popisek zvlášť,
+  nakonec obnovení displeje). Funkce s "yield" se v místě yield přeruší
+  a plánovač mezi kousky stihne přečíst MPU.
+Každých 5 sekund program vypíše statistiku: kolik úloh proběhlo, o kolik
+se průměrně a nejvíc opozdily a jak dlouho trvaly (v milisekundách).
+
+NOVÉ KONCEPTY:
+- Sdílení sběrnice, priority a periody úloh
+- Generátory (yield) - funkce, která se umí přerušit a pokračovat
+- Latence - zpoždění oproti plánu
+"""
+
+# import knihoven pro práci s hardware
+import board           # přístup k pinům a hardware zařízení
+import busio           # I2C komunikace
+import displayio       # základní grafické operace
+import terminalio      # vestavěný font
+import adafruit_displayio_ssd1306  # knihovna pro SSD1306 OLED
+import adafruit_sht4x  # knihovna pro SHT40 senzor
+import makerclass_accelerometer  # MakerClass univerzální knihovna pro MPU senzory
+import makerclass_i2c_scheduler  # plánovač úloh na sdílené sběrnici
+import makerclass_motion_stats   # průběžná statistika měření
+from adafruit_display_text import label  # textové popisky
+
+# vytvoření I2C sběrnice (sdílená pro všechna zařízení)
+i2c = busio.I2C(board.GP17, board.GP16, frequency=400000)  # SCL, SDA
+
+# inicializace MPU senzoru
+mpu = makerclass_accelerometer.MakerClassAccelerometer(i2c, fast_init=True, keep_configuration=True)
+statistika = makerclass_motion_stats.MotionStats(axes=6)
+
+# SHT40 je volitelný
+try:
+    sht = adafruit_sht4x.SHT4x(i2c)
+except ValueError:
+    sht = None
+    print("SHT40 nenalezen, pokračuji bez něj")
+teplota = None
+
+# inicializace OLED displeje - obnovujeme ho sami, ne automaticky
+displayio.release_displays()
+display_bus = displayio.I2CDisplay(i2c, device_address=0x3C)
+display = adafruit_displayio_ssd1306.SSD1306(display_bus, width=128, height=64, auto_refresh=False)
+
+main_group = displayio.Group()
+main_group.append(label.Label(terminalio.FONT, text="PLANOVAC I2C", color=0xFFFFFF, x=2, y=6))
+accel_label = label.Label(terminalio.FONT, text="", color=0xFFFFFF, x=2, y=22)
+gyro_label = label.Label(terminalio.FONT, text="", color=0xFFFFFF, x=2, y=36)
+teplota_label = label.Label(terminalio.FONT, text="", color=0xFFFFFF, x=2, y=50)
+main_group.append(accel_label)
+main_group.append(gyro_label)
+main_group.append(teplota_label)
+display.root_group = main_group
+
+
+# úlohy plánovače
+def cti_mpu():
+    statistika.update_from_sensor(mpu)
+
+
+def cti_sht():
+    global teplota
+    teplota = sht.temperature
+
+
+def obnov_displej():
+    # každý yield dá plánovači příležitost přečíst mezitím MPU
+    accel_label.text = f"Z:{statistika.mean(2):5.2f} m/s2"
+    yield
+    gyro_label.text = f"G:{statistika.std_dev(3):4.1f} {statistika.std_dev(4):4.1f} {statistika.std_dev(5):4.1f}"
+    yield
+    if teplota is not None:
+        teplota_label.text = f"T:{teplota:.1f} C"
+        yield
+    statistika.reset()
+    display.refresh()
+
+
+def vypis_statistiku():
+    print(planovac.report())
+    print()
+    planovac.reset_stats()
+
+
+planovac = makerclass_i2c_scheduler.I2CScheduler()
+planovac.add("mpu", cti_mpu, period=0.01, priority=3)
+if sht:
+    planovac.add("sht40", cti_sht, period=2.0, priority=1)
+planovac.add("oled", obnov_displej, period=0.2, priority=2)
+planovac.add("vypis", vypis_statistiku, period=5.0, priority=0)
+
+print("🗓️ PLÁNOVAČ I2C SBĚRNICE")
+print("Časy ve statistice jsou v milisekundách")
+print()
+
+try:
+    planovac.run()
+
+finally:
+    # uvolnění I2C sběrnice
+    displayio.release_displays()
+    i2c.deinit()
+    print("I2C sběrnice uvolněna")
@@ -0,0 +1,106 @@
+"""
+LEVEL 13 - Profiler I2C sběrnice: kdo zdržuje smyčku?
+
+ZAPOJENÍ OBVODU:
+Stejné jako Level 13 - MPU senzor a OLED displej na společné I2C sběrnici:
+   - VCC k 3V3
+   - GND k zemi (GND)
+   - SCL k GP17 (I2C clock - žlutá)
+   - SDA k GP16 (I2C data - modrá)
+
+JAK TO FUNGUJE:
+Program dělá totéž co hlavní program Level 13, ale měří, kam jde čas.
+Sběrnici pro MPU obalíme "stopařem" (tracer), který u každého přenosu
+zapíše adresu zařízení, počet bajtů a dobu trvání. Displej posílá data
+mimo Python, proto jeho překreslení měříme jako celek (section).
+Každých 5 sekund se vypíše tabulka:
+- count - počet přenosů, bytes - přenesené bajty
+- total/avg/max - celková, průměrná a nejdelší doba
+- na posledním řádku, kolik času zabrala sběrnice a kolik Python a čekání
+
+S ULOZIT_CSV = True se po první tabulce vypíšou i jednotlivé přenosy
+ve formátu CSV - stačí je zkopírovat z konzole do tabulkového procesoru.
+
+NOVÉ KONCEPTY:
+- Profilování - měření, kde program tráví čas
+- Obalení objektu (wrapper) bez změny knihovny
+- CSV formát pro další zpracování dat
+"""
+
+# import knihoven pro práci s hardware
+import board           # přístup k pinům a hardware zařízení
+import busio           # I2C komunikace
+import time            # funkce pro čekání a práci s časem
+import displayio       # základní grafické operace
+import terminalio      # vestavěný font
+import adafruit_displayio_ssd1306  # knihovna pro SSD1306 OLED
+import makerclass_accelerometer  # MakerClass univerzální knihovna pro MPU senzory
+import makerclass_i2c_tracer     # měření přenosů na I2C sběrnici
+from adafruit_display_text import label  # textové popisky
+
+# jak často vypsat tabulku (sekundy)
+INTERVAL_VYPISU = 5
+# vypsat jednotlivé přenosy jako CSV
+ULOZIT_CSV = False
+
+# vytvoření I2C sběrnice (sdílená pro MPU senzor i OLED)
+i2c = busio.I2C(board.GP17, board.GP16)  # SCL, SDA
+
+# stopař přenosů, jména zařízení pro tabulku
+tracer = makerclass_i2c_tracer.I2CTracer(names={0x68: "MPU"})
+
+# MPU dostane místo sběrnice její obal - funguje stejně, jen se vše měří
+mpu = makerclass_accelerometer.MakerClassAccelerometer(tracer.wrap(i2c), fast_init=True, keep_configuration=True)
+
+# displej potřebuje skutečnou sběrnici, obnovujeme ho sami
+displayio.release_displays()
+display_bus = displayio.I2CDisplay(i2c, device_address=0x3C)
+display = adafruit_displayio_ssd1306.SSD1306(display_bus, width=128, height=64, auto_refresh=False)
+
+main_group = displayio.Group()
+accel_label = label.Label(terminalio.FONT, text="", color=0xFFFFFF, x=2, y=20)
+gyro_label = label.Label(terminalio.FONT, text="", color=0xFFFFFF, x=2, y=40)
+main_group.append(label.Label(terminalio.FONT, text="PROFILER", color=0xFFFFFF, x=40, y=6))
+main_group.append(accel_label)
+main_group.append(gyro_label)
+display.root_group = main_group
+
+print("⏱️ PROFILER I2C SBĚRNICE")
+print()
+
+posledni_vypis = time.monotonic()
+tracer.reset()
+
+try:
+    while True:
+        # čtení MPU - měří se automaticky přes obal sběrnice
+        (ax, ay, az), (gx, gy, gz), teplota = mpu.motion
+
+        # překreslení displeje měříme jako celek
+        with tracer.section("OLED"):
+            accel_label.text = f"A:{ax:5.1f}{ay:5.1f}{az:5.1f}"
+            gyro_label.text = f"G:{gx:5.0f}{gy:5.0f}{gz:5.0f}"
+            display.refresh()
+
+        # výpis do konzole také něco stojí
+        with tracer.section("print"):
+            print(f"Accel: X:{ax:5.2f} Y:{ay:5.2f} Z:{az:5.2f} | Gyro: X:{gx:5.1f} Y:{gy:5.1f} Z:{gz:5.1f}")
+
+        # tabulka každých INTERVAL_VYPISU sekund
+        if time.monotonic() - posledni_vypis >= INTERVAL_VYPISU:
+            print()
+            print(tracer.report())
+            if ULOZIT_CSV:
+                tracer.write_csv()
+                ULOZIT_CSV = False
+            print()
+            tracer.reset()
+            posledni_vypis = time.monotonic()
+
+        time.sleep(0.2)
+
+finally:
+    # uvolnění I2C sběrnice
+    displayio.release_displays()
+    i2c.deinit()
+    print("I2C sběrnice uvolněna")
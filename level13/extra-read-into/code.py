@@ -0,0 +1,91 @@
+"""
+LEVEL 13 - MPU senzor bez alokace paměti (read_motion_into)
+
+ZAPOJENÍ OBVODU:
+GY-521 MPU6500/MPU6050 IMU senzor:
+   - VCC k 3V3
+   - GND k zemi (GND)
+   - SCL k GP17 (I2C clock - žlutá)
+   - SDA k GP16 (I2C data - modrá)
+
+JAK TO FUNGUJE:
+Každé čtení mpu.acceleration vytvoří nové objekty (n-tice, desetinná čísla).
+Při rychlém čtení (50 Hz a víc) se paměť rychle zaplní a CircuitPython musí
+spustit garbage collector, což způsobí krátké "zaseknutí" programu.
+Metoda read_motion_into() zapisuje hodnoty do pole, které vytvoříme jen
+jednou na začátku. Se surovými hodnotami (raw=True) do pole typu 'h'
+nealokuje při čtení vůbec žádnou paměť - to si tu ověříme pomocí gc.mem_alloc().
+Metoda read_motion_milli_into() vrací celá čísla v tisícinách (mg, m°/s, m°C)
+do pole typu 'l'. Obejde se úplně bez desetinných čísel, se kterými RP2040
+(bez hardwarové podpory desetinných čísel) počítá pomalu.
+
+NOVÉ KONCEPTY:
+- Garbage collector a alokace paměti
+- Předalokovaný buffer (array)
+- Měření spotřeby paměti pomocí gc.mem_alloc()
+- Celočíselné výpočty místo desetinných čísel
+"""
+
+# import knihoven pro práci s hardware
+import board           # přístup k pinům a hardware zařízení
+import busio           # I2C komunikace
+import gc              # garbage collector - správa paměti
+import time            # funkce pro čekání a práci s časem
+from array import array  # pole čísel s pevným typem
+import makerclass_accelerometer  # MakerClass univerzální knihovna pro MPU senzory
+
+# počet čtení pro měření
+POCET_CTENI = 200
+
+# vytvoření I2C sběrnice
+i2c = busio.I2C(board.GP17, board.GP16)  # SCL, SDA
+
+# inicializace MPU senzoru
+mpu = makerclass_accelerometer.MakerClassAccelerometer(i2c)
+
+# pole vytvoříme jen jednou: zrychlení X,Y,Z, gyroskop X,Y,Z, teplota
+surova_data = array("h", [0] * 7)   # surové hodnoty ze senzoru (celá čísla)
+data = array("f", [0] * 7)          # převedené hodnoty (m/s², °/s, °C)
+data_mili = array("l", [0] * 7)     # celá čísla v tisícinách (mg, m°/s, m°C)
+
+
+def zmer_alokaci(cteni):
+    """Vrátí počet bajtů alokovaných během POCET_CTENI volání funkce cteni"""
+    cteni()  # první volání mimo měření (zahřátí)
+    gc.collect()
+    pred = gc.mem_alloc()
+    for _ in range(POCET_CTENI):
+        cteni()
+    return gc.mem_alloc() - pred
+
+
+print("🧠 MPU SENZOR - ČTENÍ BEZ ALOKACE PAMĚTI")
+print(f"Měření alokované paměti pro {POCET_CTENI} čtení:")
+print()
+
+try:
+    bajty = zmer_alokaci(lambda: mpu.motion)
+    print(f"mpu.motion:                        {bajty:6d} B")
+
+    bajty = zmer_alokaci(lambda: mpu.read_motion_into(data))
+    print(f"mpu.read_motion_into(data):        {bajty:6d} B")
+
+    bajty = zmer_alokaci(lambda: mpu.read_motion_into(surova_data, True))
+    print(f"mpu.read_motion_into(raw=True):    {bajty:6d} B")
+    print("✅ Bez alokace" if bajty == 0 else "❌ Čtení alokuje paměť")
+
+    bajty = zmer_alokaci(lambda: mpu.read_motion_milli_into(data_mili))
+    print(f"mpu.read_motion_milli_into():      {bajty:6d} B")
+    print("✅ Bez alokace" if bajty == 0 else "❌ Čtení alokuje paměť")
+    print()
+
+    # hlavní smyčka - rychlé čtení do stále stejného pole
+    while True:
+        mpu.read_motion_into(data)
+        print(f"Accel: X:{data[0]:5.2f} Y:{data[1]:5.2f} Z:{data[2]:5.2f} | Gyro: X:{data[3]:5.1f} Y:{data[4]:5.1f} Z:{data[5]:5.1f} | T:{data[6]:.1f}°C")
+        time.sleep(0.2)
+
+finally:
+    # uvolnění I2C sběrnice
+    i2c.deinit()
+    print("I2C sběrnice uvolněna")
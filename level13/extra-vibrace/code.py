@@ -0,0 +1,91 @@
+"""
+LEVEL 13 - Měření vibrací se statistikou na OLED displeji
+
+ZAPOJENÍ OBVODU:
+Stejné jako Level 13 - MPU senzor a OLED displej na společné I2C sběrnici:
+   - VCC k 3V3
+   - GND k zemi (GND)
+   - SCL k GP17 (I2C clock - žlutá)
+   - SDA k GP16 (I2C data - modrá)
+
+JAK TO FUNGUJE:
+Vibrace (např. pračky nebo motoru) jsou rychlé - desítky až stovky kmitů
+za sekundu. Vypisovat každé měření nemá smysl, nikdo by je nestihl přečíst.
+Senzor proto čteme co nejrychleji a průběžně počítáme statistiku:
+- průměr (mean) - klidová hodnota, na ose Z je to gravitace
+- směrodatná odchylka (std) - jak silně to kolem průměru kmitá
+- rozkmit (peak-to-peak) - rozdíl mezi největší a nejmenší hodnotou
+Dvakrát za sekundu výsledek zobrazíme na displeji a začneme počítat znovu.
+Jednotlivá měření se nikam neukládají, statistika se počítá "za chodu".
+
+NOVÉ KONCEPTY:
+- Statistika: průměr, směrodatná odchylka, rozkmit
+- Průběžný výpočet bez ukládání všech hodnot
+- Oddělení rychlého měření od pomalého zobrazování
+"""
+
+# import knihoven pro práci s hardware
+import board           # přístup k pinům a hardware zařízení
+import busio           # I2C komunikace
+import time            # funkce pro čekání a práci s časem
+import displayio       # základní grafické operace
+import terminalio      # vestavěný font
+import adafruit_displayio_ssd1306  # knihovna pro SSD1306 OLED
+import makerclass_accelerometer  # MakerClass univerzální knihovna pro MPU senzory
+import makerclass_motion_stats   # průběžná statistika měření
+from adafruit_display_text import label  # textové popisky
+
+# jak často obnovit displej (sekundy)
+INTERVAL_ZOBRAZENI = 0.5
+
+# vytvoření I2C sběrnice (sdílená pro MPU senzor i OLED) - 400 kHz pro rychlé čtení
+i2c = busio.I2C(board.GP17, board.GP16, frequency=400000)  # SCL, SDA
+
+# inicializace MPU senzoru
+mpu = makerclass_accelerometer.MakerClassAccelerometer(i2c, fast_init=True, keep_configuration=True)
+
+# statistika zrychlení X, Y, Z
+statistika = makerclass_motion_stats.MotionStats(axes=3)
+
+# inicializace OLED displeje
+displayio.release_displays()
+display_bus = displayio.I2CDisplay(i2c, device_address=0x3C)
+display = adafruit_displayio_ssd1306.SSD1306(display_bus, width=128, height=64)
+
+# textové popisky: nadpis a jeden řádek pro každou osu
+main_group = displayio.Group()
+main_group.append(label.Label(terminalio.FONT, text="VIBRACE m/s2", color=0xFFFFFF, x=2, y=6))
+main_group.append(label.Label(terminalio.FONT, text="   std   p-p  mean", color=0xFFFFFF, x=2, y=18))
+radky = []
+for i, osa in enumerate("XYZ"):
+    radek = label.Label(terminalio.FONT, text=f"{osa}:", color=0xFFFFFF, x=2, y=30 + 11 * i)
+    main_group.append(radek)
+    radky.append(radek)
+frekvence_label = label.Label(terminalio.FONT, text="", color=0xFFFFFF, x=2, y=60)
+main_group.append(frekvence_label)
+display.root_group = main_group
+
+print("📳 MĚŘENÍ VIBRACÍ")
+print(f"Statistika se zobrazuje každých {INTERVAL_ZOBRAZENI} s na OLED displeji")
+
+try:
+    dalsi_zobrazeni = time.monotonic() + INTERVAL_ZOBRAZENI
+    while True:
+        # rychlé měření - jen přidání vzorku do statistiky
+        statistika.update_from_sensor(mpu)
+
+        # pomalé zobrazení
+        if time.monotonic() >= dalsi_zobrazeni:
+            for osa in range(3):
+                radky[osa].text = (
+                    f"{'XYZ'[osa]}:{statistika.std_dev(osa):5.2f} "
+                    f"{statistika.peak_to_peak(osa):5.2f} {statistika.mean(osa):5.2f}"
+                )
+            frekvence_label.text = f"{statistika.count / INTERVAL_ZOBRAZENI:.0f} vzorku/s"
+            statistika.reset()
+            dalsi_zobrazeni += INTERVAL_ZOBRAZENI
+
+finally:
+    # uvolnění I2C sběrnice
+    i2c.deinit()
+    print("I2C sběrnice uvolněna")
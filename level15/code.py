@@ -60,7 +60,7 @@ BUZZER_PIN = board.GP6                # pin pro bzučák
 # vytvoření objektů
 pixels = neopixel.NeoPixel(NEOPIXEL_PIN, NUM_PIXELS, brightness=BRIGHTNESS, auto_write=False)
 i2c = busio.I2C(board.GP17, board.GP16)  # SCL, SDA
-mpu = makerclass_accelerometer.MakerClassAccelerometer(i2c)
+mpu = makerclass_accelerometer.MakerClassAccelerometer(i2c, fast_init=True, keep_configuration=True)  # rychlý start
 
 # herní konstanty
 MATRIX_SIZE = 4                    # velikost matice (4x4)
@@ -0,0 +1,100 @@
+"""
+LEVEL 15 - Gesta: ťuknutí, zatřesení, pád a otočení
+
+ZAPOJENÍ OBVODU:
+Stejné jako Level 15:
+1) NeoPixel matrix 4x4:
+   - VCC k 3V3 nebo 5V
+   - GND k zemi (GND)
+   - DIN k GP18
+
+2) MPU6500/MPU6050 akcelerometr (I2C):
+   - VCC k 3V3
+   - GND k zemi (GND)
+   - SDA k GP16 (I2C data - modrá)
+   - SCL k GP17 (I2C clock - žlutá)
+
+JAK TO FUNGUJE:
+Místo toho, abychom v programu sami hlídali čísla z akcelerometru, předáváme
+každé měření detektoru gest. Ten pozná:
+- ťuknutí (TAP) a dvojité ťuknutí (DOUBLE_TAP) - krátký prudký náraz
+- zatřesení (SHAKE) - několik silných pohybů za sebou
+- volný pád (FREE_FALL) - senzor necítí skoro žádnou gravitaci
+- otočení (FLIP) - deska se otočila vzhůru nohama nebo zpět
+Rozpoznaná gesta ukládá do fronty událostí. Program si je z fronty vybírá
+a na každé gesto zareaguje jinou barvou matice.
+
+NOVÉ KONCEPTY:
+- Události (events) místo neustálého kontrolování hodnot
+- Fronta událostí
+- Rozpoznávání gest z akcelerometru
+"""
+
+# import knihoven pro práci s hardware
+import board                           # přístup k pinům a hardware zařízení
+import busio                           # I2C komunikace
+import neopixel                        # knihovna pro NeoPixel LED
+import time                            # funkce pro čekání a práci s časem
+import makerclass_accelerometer        # naše univerzální knihovna pro MPU senzory
+import makerclass_gestures             # rozpoznávání gest
+
+# konfigurace hardware
+NEOPIXEL_PIN = board.GP18
+NUM_PIXELS = 16
+BRIGHTNESS = 0.3
+
+# jak často čteme senzor (Hz) - detektor gest to potřebuje vědět
+VZORKOVANI = 100
+
+# barva pro každé gesto
+BARVY = {
+    makerclass_gestures.Gesture.TAP: (0, 0, 255),          # modrá
+    makerclass_gestures.Gesture.DOUBLE_TAP: (0, 255, 255),  # tyrkysová
+    makerclass_gestures.Gesture.SHAKE: (255, 255, 0),      # žlutá
+    makerclass_gestures.Gesture.FREE_FALL: (255, 0, 0),    # červená
+    makerclass_gestures.Gesture.FLIP: (0, 255, 0),         # zelená
+}
+
+# vytvoření objektů
+pixels = neopixel.NeoPixel(NEOPIXEL_PIN, NUM_PIXELS, brightness=BRIGHTNESS, auto_write=False)
+i2c = busio.I2C(board.GP17, board.GP16)  # SCL, SDA
+mpu = makerclass_accelerometer.MakerClassAccelerometer(i2c, fast_init=True, keep_configuration=True)
+gesta = makerclass_gestures.GestureDetector(sample_rate=VZORKOVANI)
+
+print("👋 GESTA")
+print("Ťukněte, zatřeste, otočte deskou...")
+
+try:
+    zhasnout = 0
+    dalsi_mereni = time.monotonic()
+    while True:
+        # měření v pravidelném rytmu
+        gesta.update_from_sensor(mpu)
+
+        # zpracování všech událostí ve frontě
+        udalost = gesta.get()
+        while udalost:
+            gesto, _ = udalost
+            print(f"Gesto: {makerclass_gestures.Gesture.NAMES[gesto]}")
+            pixels.fill(BARVY[gesto])
+            pixels.show()
+            zhasnout = time.monotonic() + 0.5
+            udalost = gesta.get()
+
+        # po půl sekundě matici zhasneme
+        if zhasnout and time.monotonic() >= zhasnout:
+            pixels.fill((0, 0, 0))
+            pixels.show()
+            zhasnout = 0
+
+        dalsi_mereni += 1 / VZORKOVANI
+        cekani = dalsi_mereni - time.monotonic()
+        if cekani > 0:
+            time.sleep(cekani)
+
+finally:
+    # zhasnutí matice a uvolnění I2C sběrnice
+    pixels.fill((0, 0, 0))
+    pixels.show()
+    i2c.deinit()
+    print("I2C sběrnice uvolněna")
@@ -27,20 +27,24 @@ Implementation Notes
 * Adafruit's Register library:
   https://github.com/adafruit/Adafruit_CircuitPython_Register
 
+* makerclass_nvm
+
 """
 
 # imports
 __version__ = "1.0.0"
 __repo__ = "https://github.com/makerclass/workshop"
 
+from array import array
 from math import radians
-from time import sleep
+from struct import pack, unpack_from
+from time import monotonic, monotonic_ns, sleep
 
 from adafruit_bus_device import i2c_device
-from adafruit_register.i2c_bit import RWBit
+from adafruit_register.i2c_bit import ROBit, RWBit
 from adafruit_register.i2c_bits import RWBits
 from adafruit_register.i2c_struct import ROUnaryStruct, UnaryStruct
-from adafruit_register.i2c_struct_array import StructArray
+import makerclass_nvm
 
 try:
     from typing import Tuple
@@ -59,6 +63,9 @@ _SUPPORTED_CHIPS = {
     0x71: "MPU9250",  # WHO_AM_I for MPU9250
 }
 
+# Chips with user offset registers that take the calibration in hardware
+_HARDWARE_OFFSET_CHIPS = (0x70, 0x71)  # MPU6500, MPU9250
+
 # Registers (same for all MPU variants)
 _MPU_SELF_TEST_X = 0x0D      # Self test factory calibrated values register
 _MPU_SELF_TEST_Y = 0x0E      # Self test factory calibrated values register
@@ -68,12 +75,22 @@ _MPU_SMPLRT_DIV = 0x19       # sample rate divisor register
 _MPU_CONFIG = 0x1A           # General configuration register
 _MPU_GYRO_CONFIG = 0x1B      # Gyro specfic configuration register
 _MPU_ACCEL_CONFIG = 0x1C     # Accelerometer specific configration register
+_MPU_MOT_THR = 0x1F          # Motion detection threshold (WOM_THR on MPU6500/MPU9250)
+_MPU_MOT_DUR = 0x20          # Motion detection duration (MPU6050 only)
 _MPU_FIFO_EN = 0x23          # FIFO Enable
+_MPU_I2C_MST_CTRL = 0x24     # I2C Master control register
+_MPU_I2C_SLV0_ADDR = 0x25    # I2C slave 0 address, REG and CTRL follow
 _MPU_INT_PIN_CONFIG = 0x37   # Interrupt pin configuration register
+_MPU_INT_ENABLE = 0x38       # Interrupt enable register
+_MPU_INT_STATUS = 0x3A       # Interrupt status register (cleared on read)
+_INT_DATA_READY = 0x01       # INT_STATUS / INT_ENABLE DATA_RDY bit
+_INT_FIFO_OVERFLOW = 0x10    # INT_STATUS / INT_ENABLE FIFO_OFLOW bit
 _MPU_ACCEL_OUT = 0x3B        # base address for sensor data reads
 _MPU_TEMP_OUT = 0x41         # Temperature data high byte register
 _MPU_GYRO_OUT = 0x43         # base address for sensor data reads
+_MPU_EXT_SENS_DATA = 0x49    # Data read by the I2C master from external sensors, right after GYRO_OUT
 _MPU_SIG_PATH_RESET = 0x68   # register to reset sensor signal paths
+_MPU_MOT_DETECT_CTRL = 0x69  # Motion detection control (ACCEL_INTEL_CTRL on MPU6500/MPU9250)
 _MPU_USER_CTRL = 0x6A        # FIFO and I2C Master control register
 _MPU_PWR_MGMT_1 = 0x6B       # Primary power/sleep control register
 _MPU_PWR_MGMT_2 = 0x6C       # Secondary power/sleep control register
@@ -81,8 +98,68 @@ _MPU_FIFO_COUNT = 0x72       # FIFO byte count register (high half)
 _MPU_FIFO_R_W = 0x74         # FIFO data register
 _MPU_WHO_AM_I = 0x75         # Device ID register
 
+# MPU6500/MPU9250 only
+_MPU6500_XG_OFFSET = 0x13    # Gyro X offset high byte, Y and Z follow (2 bytes each)
+_MPU6500_XA_OFFSET = 0x77    # Accel X offset high byte, Y and Z follow (3 bytes apart)
+_MPU6500_ACCEL_CONFIG2 = 0x1D  # Accelerometer low pass filter register
+_MPU6500_LP_ACCEL_ODR = 0x1E   # Low power accelerometer output data rate register
+_GYRO_OFFSET_SENSITIVITY = 32.8   # Gyro offset LSB/(°/s), ±1000 °/s scale
+_ACCEL_OFFSET_SENSITIVITY = 1024  # Accel offset LSB/g, 0.98 mg steps
+
+_MOTION_DATA_LENGTH = 14     # ACCEL_OUT (6) + TEMP_OUT (2) + GYRO_OUT (6)
+
+# AK8963 magnetometer inside the MPU9250
+_AK8963_ADDRESS = 0x0C
+_AK8963_WIA = 0x00           # Device ID register
+_AK8963_DEVICE_ID = 0x48
+_AK8963_HXL = 0x03           # Measurement data, little endian X/Y/Z, ST2 follows
+_AK8963_CNTL1 = 0x0A         # Mode control register
+_AK8963_ASAX = 0x10          # Sensitivity adjustment values (fuse ROM), Y and Z follow
+_AK8963_MODE_POWER_DOWN = 0x00
+_AK8963_MODE_FUSE_ROM = 0x0F
+_AK8963_MODE_CONTINUOUS_100HZ = 0x16  # 16 bit output, continuous measurement mode 2
+_AK8963_MODE_DELAY = 0.010   # wait after every mode change (s)
+_AK8963_SENSITIVITY = 0.15   # µT/LSB in 16 bit mode
+_MAG_DATA_LENGTH = 7         # HXL..HZH (6) + ST2 (1), reading ST2 releases the next sample
+_I2C_MASTER_400KHZ = 0x0D
+
+_FAST_INIT_TIMEOUT = 0.2     # worst case wait for reset / first sample in fast_init mode (s)
+
+# Calibration record in microcontroller.nvm, one slot per I2C address (0x68, 0x69),
+# see makerclass_nvm for the layout
+_CALIBRATION_MAGIC = b"MC"
+_CALIBRATION_VERSION = 3
+# magic, version, WHO_AM_I, address, accel bias/scale, gyro bias, factory accel offset registers,
+# gyro bias reference temperature (NaN = no temperature model), gyro bias slopes
+_CALIBRATION_FORMAT = "<2sBBB9f3h4f"
+
+# Gyro bias temperature compensation
+_TEMPERATURE_SENSITIVITY = 340.0  # LSB/°C
+_GYRO_TEMPERATURE_STEP = 0.5      # °C change that updates the compensated gyro bias
+_GYRO_TEMPERATURE_REFRESH = 1.0   # s between temperature reads for reads without temperature
+_GYRO_TEMPERATURE_MIN_SPAN = 2.0  # °C between calibration points needed to fit the slope
+
+# FIFO capacity in bytes for each chip
+_FIFO_SIZE = {
+    0x68: 1024,  # MPU6050
+    0x70: 512,   # MPU6500
+    0x71: 512,   # MPU9250
+}
+
 STANDARD_GRAVITY = 9.80665
 
+# Sensitivity (LSB per unit) for each Range / GyroRange value
+_ACCEL_SENSITIVITY = (16384, 8192, 4096, 2048)  # LSB/g
+_GYRO_SENSITIVITY = (131, 65.5, 32.8, 16.4)     # LSB/(°/s)
+
+# Fixed point factors for the integer (milli unit) outputs: value = (raw * factor) >> shift.
+# Shifts keep raw * factor below 2**30, so the math stays in small ints on CircuitPython.
+_ACCEL_MILLI_SHIFT = 15  # mg factor is 2000 (±2 g) ... 16000 (±16 g)
+_GYRO_MILLI_SHIFT = 8    # mdps factor is 1954 (±250 °/s) ... 15610 (±2000 °/s)
+_TEMP_MILLI_SHIFT = 10
+_TEMP_MILLI_FACTOR = 3012  # 1000 / 340 * 2**10
+_TEMP_MILLI_OFFSET = 36530
+
 
 class ClockSource:
     """Allowed values for clock_source."""
@@ -131,11 +208,36 @@ class Rate:
     CYCLE_40_HZ = 3    # 40 Hz
 
 
+class FifoSource:
+    """Flags for the sensors written into the FIFO by `start_fifo`."""
+    TEMPERATURE = 0b10000000  # TEMP_FIFO_EN
+    GYRO = 0b01110000         # XG_FIFO_EN | YG_FIFO_EN | ZG_FIFO_EN
+    ACCEL = 0b00001000        # ACCEL_FIFO_EN
+
+
+# Low pass filter cutoff in Hz for each Bandwidth
+_BANDWIDTH_CUTOFF = (260, 184, 94, 44, 21, 10, 5)
+
+# LP_ACCEL_ODR closest to each Rate on the MPU6500/MPU9250 (0.98, 3.91, 15.63, 31.25 Hz)
+_LP_ACCEL_ODR = (2, 4, 6, 7)
+
+
 class MakerClassAccelerometer:
     """Universal driver for MPU6050/MPU6500/MPU9250 6-DoF accelerometer and gyroscope.
 
     :param ~busio.I2C i2c_bus: The I2C bus the device is connected to
     :param int address: The I2C device address. Defaults to 0x68
+    :param bool fast_init: Poll the sensor for readiness after reset and wake-up
+        instead of sleeping fixed worst-case delays. Defaults to `False`
+    :param bool keep_configuration: Skip the reset if the sensor is already awake
+        and configured the way this driver sets it up, e.g. after a soft reload
+        of ``code.py``. On the MPU6500/MPU9250 the first calibration written
+        then needs the factory accelerometer trim: it is taken from the stored
+        calibration, or without one the sensor is reset once, keeping its
+        configuration. Defaults to `False`
+    :param bool calibration: Apply the calibration stored in NVM by
+        `save_calibration`, if there is one for this chip and address.
+        Defaults to `True`
 
     **Quickstart: Importing and using the device**
 
@@ -154,6 +256,10 @@ class MakerClassAccelerometer:
             i2c = board.I2C()  # uses board.SCL and board.SDA
             mpu = makerclass_accelerometer.MakerClassAccelerometer(i2c)
 
+        Configuration getters such as :attr:`gyro_range` return a cached copy of
+        the register, so reading them (and scaling samples) costs no I2C traffic.
+        Call :meth:`sync` if something else changed the registers behind the driver.
+
         Now you have access to the :attr:`acceleration`, :attr:`gyro`
         and :attr:`temperature` attributes:
 
@@ -162,63 +268,371 @@ class MakerClassAccelerometer:
             acc_x, acc_y, acc_z = mpu.acceleration
             gyro_x, gyro_y, gyro_z = mpu.gyro
             temperature = mpu.temperature
+
+        When you need all of them, :attr:`motion` reads them in one I2C transaction:
+
+        .. code-block:: python
+
+            acceleration, gyro, temperature = mpu.motion
+
+        In tight loops, :meth:`read_motion_into` fills a buffer you allocate once
+        instead of creating new tuples for every sample:
+
+        .. code-block:: python
+
+            from array import array
+
+            motion = array("f", [0] * 7)  # accel X/Y/Z, gyro X/Y/Z, temperature
+            while True:
+                mpu.read_motion_into(motion)
+
+        :meth:`read_motion_milli_into` does the same with integer milli-g and
+        milli-°/s into an ``array("l")``, avoiding float math altogether.
+
+        For higher sample rates let the sensor buffer samples in its FIFO and
+        drain them in bulk:
+
+        .. code-block:: python
+
+            mpu.start_fifo(sample_rate_divisor=7)
+            while True:
+                for acceleration, gyro, temperature in mpu.fifo_frames():
+                    ...
+
+        To read every new sample exactly once, wire the sensor's INT pin to the
+        board and wait for it instead of sleeping:
+
+        .. code-block:: python
+
+            mpu.enable_data_ready(board.GP15)
+            while True:
+                mpu.wait_for_data()
+                acceleration, gyro, temperature = mpu.motion
+
+        On the MPU9250, :meth:`enable_magnetometer` adds the AK8963 magnetometer
+        to the same burst read:
+
+        .. code-block:: python
+
+            mpu.enable_magnetometer()
+            motion = array("f", [0] * 10)  # read_motion_into values + magnetic X/Y/Z
+            mpu.read_motion_mag_into(motion)
     """
 
-    def __init__(self, i2c_bus: I2C, address: int = _MPU_DEFAULT_ADDRESS) -> None:
+    def __init__(
+        self,
+        i2c_bus: I2C,
+        address: int = _MPU_DEFAULT_ADDRESS,
+        *,
+        fast_init: bool = False,
+        keep_configuration: bool = False,
+        calibration: bool = True,
+    ) -> None:
+        self._fast_init = fast_init
+        self._address = address
         self.i2c_device = i2c_device.I2CDevice(i2c_bus, address)
+        self._motion_register = bytes([_MPU_ACCEL_OUT])
+        self._gyro_register = bytes([_MPU_GYRO_OUT])
+        self._motion_buffer = bytearray(_MOTION_DATA_LENGTH)
+        self._mag_scales = None
+        self._mag_buffer = None
+        self.magnetometer_offset = (0.0, 0.0, 0.0)
+        """Hard iron offset in µT subtracted from `magnetic`, the middle between
+        the extremes of each axis while the sensor is turned in all directions"""
         
         # Read WHO_AM_I and identify chip
         device_id = self._device_id
         if device_id not in _SUPPORTED_CHIPS:
             supported_list = ', '.join([f'{name} (0x{id:02x})' for id, name in _SUPPORTED_CHIPS.items()])
             raise RuntimeError(f"Unsupported chip! WHO_AM_I = 0x{device_id:02x}. Supported: {supported_list}")
-      
+        self._chip_id = device_id
+
+        # FIFO streaming state, see start_fifo()
+        self._fifo_register = bytes([_MPU_FIFO_R_W])
+        self._fifo_buffer = bytearray(_FIFO_SIZE[device_id])
+        self._fifo_frame_size = 0
+        self._fifo_format = ""
+        self._fifo_layout = (-1, -1, -1)
+        self.fifo_overflows = 0
+        """Number of times the FIFO overflowed and had to be reset by `fifo_frames`"""
+        self._int_status_pending = 0  # INT_STATUS flags read but not yet handled, see _take_int_status()
+
+        # Data ready interrupt state, see enable_data_ready()
+        self._data_ready_counter = None
+        self._data_ready_counted = 0  # counter.count already seen by data_ready
+        self._data_ready_keys = None
+        self._data_ready_event = None
+        self._data_ready_armed = False  # re-enabled by reset()
+        self.data_ready_overruns = 0
+        """Number of samples that were replaced by a newer one before `wait_for_data` saw them"""
+
+        # Calibration in sensor independent units, see calibrate()
+        self._cal_accel_bias = (0.0, 0.0, 0.0)   # g
+        self._cal_accel_scale = (1.0, 1.0, 1.0)
+        self._cal_gyro_bias = (0.0, 0.0, 0.0)    # °/s
+        self._cal_gyro_temperature = None         # °C the gyro bias applies at
+        self._cal_gyro_slope = (0.0, 0.0, 0.0)   # °/s per °C
+        self._cal_gyro_points = []                # (°C, gyro bias) measured in this session
+        self._gyro_bias_applied = (0.0, 0.0, 0.0)
+        self._gyro_temperature_compensation = False
+        self._temperature_low = 0
+        self._temperature_high = 0
+        self._temperature_refresh = 0.0
+        self._cal_accel_up = [None, None, None]
+        self._cal_accel_down = [None, None, None]
+        self._hardware_offsets = device_id in _HARDWARE_OFFSET_CHIPS
+        self._factory_accel_offsets = None
+
+        if keep_configuration:
+            self.sync()
+        if not (keep_configuration and self._has_default_configuration()):
+            self._configure_defaults()
+        if calibration:
+            self.load_calibration()
+
+    def _configure_defaults(self) -> None:
+        fast_init = self._fast_init
         self.reset()
         self._sample_rate_divisor = 0
         self._filter_bandwidth = Bandwidth.BAND_260_HZ
         self._gyro_range = GyroRange.RANGE_500_DPS
         self._accel_range = Range.RANGE_2_G
-        self._accel_scale = 1.0 / [16384, 8192, 4096, 2048][self._accel_range]
-        sleep(0.100)
-        self.clock_source = ClockSource.CLKSEL_INTERNAL_X  # set to use gyro x-axis as reference
-        sleep(0.100)
-        self.sleep = False
-        sleep(0.010)
+        if not fast_init:
+            sleep(0.100)
+        self._clksel = ClockSource.CLKSEL_INTERNAL_X  # set to use gyro x-axis as reference
+        if not fast_init:
+            sleep(0.100)
+        self._sleep = False
+        if fast_init:
+            self._wait_for_first_sample()
+        else:
+            sleep(0.010)
+        self.sync()
 
     def reset(self) -> None:
-        """Reinitialize the sensor"""
+        """Reinitialize the sensor.
+
+        Data ready signalling from `enable_data_ready` is set up again, the
+        FIFO has to be started again with `start_fifo`.
+        """
+        # The I2C master is off after a reset, enable_magnetometer() starts it again
+        self._mag_scales = None
+        self._mag_buffer = None
         self._reset = True
-        while self._reset is True:
+        if self._fast_init:
+            # The chip may not acknowledge while it reloads its registers
+            self._poll(lambda: not self._reset and self._device_id == self._chip_id, "did not come out of reset")
+        else:
+            while self._reset is True:
+                sleep(0.001)
+            sleep(0.100)
+
+        self._signal_path_reset = 0b111  # reset all sensors
+        if not self._fast_init:
+            sleep(0.100)
+        # The reset also stopped the FIFO and cleared the interrupt configuration
+        self._fifo_frame_size = 0
+        self._int_status_pending = 0
+        if self._data_ready_armed:
+            self._arm_data_ready()
+        self.sync()
+        if self._hardware_offsets:
+            # A reset reloads the factory trim into the offset registers
+            self._factory_accel_offsets = self._read_accel_offsets()
+            self._write_offsets(self._cal_accel_bias, self._gyro_bias_applied)
+
+    def _poll(self, condition, failure: str) -> None:
+        deadline = monotonic() + _FAST_INIT_TIMEOUT
+        while monotonic() < deadline:
+            try:
+                if condition():
+                    return
+            except OSError:
+                pass
             sleep(0.001)
-        sleep(0.100)
-
-        _signal_path_reset = 0b111  # reset all sensors
-        sleep(0.100)
+        raise RuntimeError(f"The sensor {failure} within {_FAST_INIT_TIMEOUT} s")
+
+    def _wait_for_first_sample(self) -> None:
+        # DATA_RDY only shows up in INT_STATUS while the interrupt is enabled
+        data_ready_enabled = self._data_ready_enable
+        self._data_ready_enable = True
+        self._data_ready_status  # reading INT_STATUS clears stale flags
+        try:
+            self._poll(lambda: self._data_ready_status, "produced no sample")
+        finally:
+            self._data_ready_enable = data_ready_enabled
+
+    def _has_default_configuration(self) -> bool:
+        return (
+            not self._cached_sleep
+            and not self._cached_cycle
+            and self._cached_clksel == ClockSource.CLKSEL_INTERNAL_X
+            and self._cached_sample_rate_divisor == 0
+            and self._cached_filter_bandwidth == Bandwidth.BAND_260_HZ
+            and self._cached_gyro_range == GyroRange.RANGE_500_DPS
+            and self._cached_accel_range == Range.RANGE_2_G
+        )
+
+    def sync(self) -> None:
+        """Re-read all configuration registers into the driver's cache and
+        recompute the scale factors. Only needed if the registers were changed
+        without going through this driver."""
+        self._cached_clksel = self._clksel
+        self._cached_sleep = self._sleep
+        self._cached_cycle = self._cycle
+        self._cached_cycle_rate = self._cycle_rate
+        self._cached_sample_rate_divisor = self._sample_rate_divisor
+        self._cached_filter_bandwidth = self._filter_bandwidth
+        self._cached_gyro_range = self._gyro_range
+        self._cached_accel_range = self._accel_range
+        self._update_scales()
+
+    def _update_scales(self) -> None:
+        # Fold the calibration into per-axis raw offsets and scale factors for the current
+        # ranges. Offsets are None when the chip subtracts the bias in hardware.
+        accel_sensitivity = _ACCEL_SENSITIVITY[self._cached_accel_range]
+        accel_scale = STANDARD_GRAVITY / accel_sensitivity
+        scale = self._cal_accel_scale
+        self._accel_scales = (accel_scale * scale[0], accel_scale * scale[1], accel_scale * scale[2])
+        gyro_sensitivity = _GYRO_SENSITIVITY[self._cached_gyro_range]
+        gyro_scale = 1.0 / gyro_sensitivity
+        self._gyro_scales = (gyro_scale, gyro_scale, gyro_scale)
+        accel_milli = 1000 * (1 << _ACCEL_MILLI_SHIFT) / accel_sensitivity
+        self._accel_milli = (round(accel_milli * scale[0]), round(accel_milli * scale[1]), round(accel_milli * scale[2]))
+        gyro_milli = round(1000 * (1 << _GYRO_MILLI_SHIFT) / gyro_sensitivity)
+        self._gyro_milli = (gyro_milli, gyro_milli, gyro_milli)
+
+        if self._hardware_offsets:
+            self._accel_offset = None
+            self._gyro_offset = None
+            return
+        bias = self._cal_accel_bias
+        self._accel_offset = (
+            round(bias[0] * accel_sensitivity),
+            round(bias[1] * accel_sensitivity),
+            round(bias[2] * accel_sensitivity),
+        )
+        bias = self._gyro_bias_applied
+        self._gyro_offset = (
+            round(bias[0] * gyro_sensitivity),
+            round(bias[1] * gyro_sensitivity),
+            round(bias[2] * gyro_sensitivity),
+        )
+
+    def _read_accel_offsets(self) -> Tuple[int, int, int]:
+        buf = bytearray(2)
+        offsets = []
+        with self.i2c_device:
+            for axis in range(3):
+                self.i2c_device.write_then_readinto(bytes([_MPU6500_XA_OFFSET + 3 * axis]), buf)
+                offsets.append(unpack_from(">h", buf)[0])
+        return tuple(offsets)
+
+    def _write_offsets(self, accel_bias, gyro_bias) -> None:
+        # Program the calibration into the MPU6500/MPU9250 user offset registers
+        factory = self._factory_accel_offsets
+        if factory is None:
+            factory = self._factory_accel_offsets = self._factory_trim()
+        with self.i2c_device:
+            for axis in range(3):
+                # 15 bit offset in bits 15:1, bit 0 is reserved and must be kept
+                value = (factory[axis] >> 1) - round(accel_bias[axis] * _ACCEL_OFFSET_SENSITIVITY)
+                value = max(-16384, min(16383, value))
+                word = ((value << 1) | (factory[axis] & 1)) & 0xFFFF
+                self.i2c_device.write(bytes([_MPU6500_XA_OFFSET + 3 * axis, word >> 8, word & 0xFF]))
+        self._write_gyro_offsets(gyro_bias)
+
+    def _factory_trim(self) -> Tuple[int, int, int]:
+        # Without a reset in this session (keep_configuration) the offset registers
+        # may hold a calibration programmed before a soft reload. The stored
+        # calibration keeps the factory trim, otherwise only a reset reloads it.
+        record = self._stored_calibration()
+        if record is not None:
+            return record[13:16]
+        configuration = (
+            self._cached_sample_rate_divisor,
+            self._cached_filter_bandwidth,
+            self._cached_gyro_range,
+            self._cached_accel_range,
+            self._cached_cycle_rate,
+            self._cached_clksel,
+            self._cached_cycle,
+            self._cached_sleep,
+        )
+        self.reset()
+        (
+            self._sample_rate_divisor,
+            self._filter_bandwidth,
+            self._gyro_range,
+            self._accel_range,
+            self._cycle_rate,
+            self._clksel,
+            self._cycle,
+            self._sleep,
+        ) = configuration
+        if not self._cached_sleep:
+            if self._fast_init and not self._cached_cycle:
+                self._wait_for_first_sample()
+            else:
+                sleep(0.010)
+        self.sync()
+        return self._factory_accel_offsets
+
+    def _write_gyro_offsets(self, gyro_bias) -> None:
+        buf = bytearray(7)
+        buf[0] = _MPU6500_XG_OFFSET
+        for axis in range(3):
+            value = -round(gyro_bias[axis] * _GYRO_OFFSET_SENSITIVITY)
+            word = max(-32768, min(32767, value)) & 0xFFFF
+            buf[1 + 2 * axis] = word >> 8
+            buf[2 + 2 * axis] = word & 0xFF
+        with self.i2c_device:
+            self.i2c_device.write(buf)
 
     _clksel = RWBits(3, _MPU_PWR_MGMT_1, 0)
     _device_id = ROUnaryStruct(_MPU_WHO_AM_I, ">B")
 
     _reset = RWBit(_MPU_PWR_MGMT_1, 7, 1)
-    _signal_path_reset = RWBits(3, _MPU_SIG_PATH_RESET, 3)
+    _signal_path_reset = RWBits(3, _MPU_SIG_PATH_RESET, 0)
 
     _gyro_range = RWBits(2, _MPU_GYRO_CONFIG, 3)
     _accel_range = RWBits(2, _MPU_ACCEL_CONFIG, 3)
 
-    _filter_bandwidth = RWBits(2, _MPU_CONFIG, 3)
+    _filter_bandwidth = RWBits(3, _MPU_CONFIG, 0)
 
-    _raw_accel_data = StructArray(_MPU_ACCEL_OUT, ">h", 3)
-    _raw_gyro_data = StructArray(_MPU_GYRO_OUT, ">h", 3)
     _raw_temp_data = ROUnaryStruct(_MPU_TEMP_OUT, ">h")
 
     _cycle = RWBit(_MPU_PWR_MGMT_1, 5)
     _cycle_rate = RWBits(2, _MPU_PWR_MGMT_2, 6, 1)
 
-    sleep = RWBit(_MPU_PWR_MGMT_1, 6, 1)
-    """Shuts down the accelerometers and gyroscopes, saving power. No new data will
-    be recorded until the sensor is taken out of sleep by setting to `False`"""
-    
-    sample_rate_divisor = UnaryStruct(_MPU_SMPLRT_DIV, ">B")
-    """Sample rate divisor. See datasheet for details"""
+    _sleep = RWBit(_MPU_PWR_MGMT_1, 6, 1)
+    _sample_rate_divisor = UnaryStruct(_MPU_SMPLRT_DIV, ">B")
+
+    _fifo_sources = UnaryStruct(_MPU_FIFO_EN, ">B")
+    _fifo_enable = RWBit(_MPU_USER_CTRL, 6)
+    _fifo_reset = RWBit(_MPU_USER_CTRL, 2)
+
+    _int_active_low = RWBit(_MPU_INT_PIN_CONFIG, 7)
+    _int_open_drain = RWBit(_MPU_INT_PIN_CONFIG, 6)
+    _int_latch = RWBit(_MPU_INT_PIN_CONFIG, 5)
+    _int_any_read_clears = RWBit(_MPU_INT_PIN_CONFIG, 4)
+    _i2c_bypass = RWBit(_MPU_INT_PIN_CONFIG, 1)
+    _i2c_master_enable = RWBit(_MPU_USER_CTRL, 5)
+    _i2c_master_clock = UnaryStruct(_MPU_I2C_MST_CTRL, ">B")
+    _data_ready_enable = RWBit(_MPU_INT_ENABLE, 0)
+    _data_ready_status = ROBit(_MPU_INT_STATUS, 0)
+    _fifo_overflow_enable = RWBit(_MPU_INT_ENABLE, 4)
+    _int_status = ROUnaryStruct(_MPU_INT_STATUS, ">B")
+
+    _interrupt_enable = UnaryStruct(_MPU_INT_ENABLE, ">B")
+    _motion_status = ROBit(_MPU_INT_STATUS, 6)
+    _motion_threshold = UnaryStruct(_MPU_MOT_THR, ">B")
+    _motion_duration = UnaryStruct(_MPU_MOT_DUR, ">B")
+    _motion_detect_ctrl = UnaryStruct(_MPU_MOT_DETECT_CTRL, ">B")
+    _accel_high_pass = RWBits(3, _MPU_ACCEL_CONFIG, 0)
+    _standby = UnaryStruct(_MPU_PWR_MGMT_2, ">B")
+    _accel_config2 = UnaryStruct(_MPU6500_ACCEL_CONFIG2, ">B")
+    _lp_accel_odr = UnaryStruct(_MPU6500_LP_ACCEL_ODR, ">B")
 
     fifo_count = ROUnaryStruct(_MPU_FIFO_COUNT, ">H")
     """The number of bytes currently stored in the sensor's FIFO buffer"""
@@ -227,117 +641,362 @@ class MakerClassAccelerometer:
     def temperature(self) -> float:
         """Current temperature in °C"""
         raw_temperature = self._raw_temp_data
+        if self._gyro_temperature_compensation:
+            self._check_temperature(raw_temperature)
+        return self.scale_temperature(raw_temperature)
+
+    def scale_temperature(self, raw_temperature: int) -> float:
+        """Scale raw temperature data to °C"""
         # Temperature calibration (according to datasheet)
-        temp = (raw_temperature / 340.0) + 36.53
-        return temp
+        return (raw_temperature / 340.0) + 36.53
 
     @property
     def acceleration(self) -> Tuple[float, float, float]:
         """Acceleration X, Y, and Z axis data in m/s^2"""
-        raw_data = self._raw_accel_data
-        return self.scale_accel([raw_data[0][0], raw_data[1][0], raw_data[2][0]])
+        buf = self._motion_buffer
+        with self.i2c_device:
+            self.i2c_device.write_then_readinto(self._motion_register, buf, in_end=6)
+        return self.scale_accel(unpack_from(">3h", buf))
 
     def scale_accel(self, raw_data) -> Tuple[float, float, float]:
-        """Scale raw X, Y, and Z axis data to m/s^2"""
-        accel_x = (raw_data[0] * self._accel_scale) * STANDARD_GRAVITY
-        accel_y = (raw_data[1] * self._accel_scale) * STANDARD_GRAVITY
-        accel_z = (raw_data[2] * self._accel_scale) * STANDARD_GRAVITY
+        """Scale raw X, Y, and Z axis data to m/s^2, applying the calibration"""
+        scale_x, scale_y, scale_z = self._accel_scales
+        offset = self._accel_offset
+        if offset is None:
+            return (raw_data[0] * scale_x, raw_data[1] * scale_y, raw_data[2] * scale_z)
+        accel_x = (raw_data[0] - offset[0]) * scale_x
+        accel_y = (raw_data[1] - offset[1]) * scale_y
+        accel_z = (raw_data[2] - offset[2]) * scale_z
         return (accel_x, accel_y, accel_z)
 
     @property
     def gyro(self) -> Tuple[float, float, float]:
         """Gyroscope X, Y, and Z axis data in °/s"""
-        raw_data = self._raw_gyro_data
-        return self.scale_gyro((raw_data[0][0], raw_data[1][0], raw_data[2][0]))
+        if self._gyro_temperature_compensation:
+            self._refresh_temperature()
+        buf = self._motion_buffer
+        with self.i2c_device:
+            self.i2c_device.write_then_readinto(self._gyro_register, buf, in_end=6)
+        return self.scale_gyro(unpack_from(">3h", buf))
 
     def scale_gyro(self, raw_data) -> Tuple[float, float, float]:
-        """Scale raw gyro data to °/s"""
-        raw_x = raw_data[0]
-        raw_y = raw_data[1]
-        raw_z = raw_data[2]
-
-        gyro_scale = 1
-        gyro_range = self._gyro_range
-        if gyro_range == GyroRange.RANGE_250_DPS:
-            gyro_scale = 131
-        if gyro_range == GyroRange.RANGE_500_DPS:
-            gyro_scale = 65.5
-        if gyro_range == GyroRange.RANGE_1000_DPS:
-            gyro_scale = 32.8
-        if gyro_range == GyroRange.RANGE_2000_DPS:
-            gyro_scale = 16.4
-
-        # Scale to °/s (not radians!)
-        gyro_x = raw_x / gyro_scale
-        gyro_y = raw_y / gyro_scale
-        gyro_z = raw_z / gyro_scale
+        """Scale raw gyro data to °/s, applying the calibration"""
+        # Scale to °/s (not radians!), the factors are precomputed from the cached gyro_range
+        gyro_scale = self._gyro_scales[0]
+        offset = self._gyro_offset
+        if offset is None:
+            return (raw_data[0] * gyro_scale, raw_data[1] * gyro_scale, raw_data[2] * gyro_scale)
+        gyro_x = (raw_data[0] - offset[0]) * gyro_scale
+        gyro_y = (raw_data[1] - offset[1]) * gyro_scale
+        gyro_z = (raw_data[2] - offset[2]) * gyro_scale
 
         return (gyro_x, gyro_y, gyro_z)
 
+    @property
+    def acceleration_mg(self) -> Tuple[int, int, int]:
+        """Acceleration X, Y, and Z axis data in milli-g as integers, see `read_motion_milli_into`"""
+        buf = self._motion_buffer
+        with self.i2c_device:
+            self.i2c_device.write_then_readinto(self._motion_register, buf, in_end=6)
+        return self.scale_accel_mg(unpack_from(">3h", buf))
+
+    def scale_accel_mg(self, raw_data) -> Tuple[int, int, int]:
+        """Scale raw X, Y, and Z axis data to integer milli-g, applying the calibration"""
+        factor = self._accel_milli
+        offset = self._accel_offset or (0, 0, 0)
+        rounding = 1 << (_ACCEL_MILLI_SHIFT - 1)
+        return (
+            ((raw_data[0] - offset[0]) * factor[0] + rounding) >> _ACCEL_MILLI_SHIFT,
+            ((raw_data[1] - offset[1]) * factor[1] + rounding) >> _ACCEL_MILLI_SHIFT,
+            ((raw_data[2] - offset[2]) * factor[2] + rounding) >> _ACCEL_MILLI_SHIFT,
+        )
+
+    @property
+    def gyro_mdps(self) -> Tuple[int, int, int]:
+        """Gyroscope X, Y, and Z axis data in milli-°/s as integers, see `read_motion_milli_into`"""
+        if self._gyro_temperature_compensation:
+            self._refresh_temperature()
+        buf = self._motion_buffer
+        with self.i2c_device:
+            self.i2c_device.write_then_readinto(self._gyro_register, buf, in_end=6)
+        return self.scale_gyro_mdps(unpack_from(">3h", buf))
+
+    def scale_gyro_mdps(self, raw_data) -> Tuple[int, int, int]:
+        """Scale raw gyro data to integer milli-°/s, applying the calibration"""
+        factor = self._gyro_milli[0]
+        offset = self._gyro_offset or (0, 0, 0)
+        rounding = 1 << (_GYRO_MILLI_SHIFT - 1)
+        return (
+            ((raw_data[0] - offset[0]) * factor + rounding) >> _GYRO_MILLI_SHIFT,
+            ((raw_data[1] - offset[1]) * factor + rounding) >> _GYRO_MILLI_SHIFT,
+            ((raw_data[2] - offset[2]) * factor + rounding) >> _GYRO_MILLI_SHIFT,
+        )
+
+    @property
+    def motion(self) -> Tuple[Tuple[float, float, float], Tuple[float, float, float], float]:
+        """Acceleration (m/s^2), gyroscope (°/s) and temperature (°C) from a single
+        snapshot. See `read_all`"""
+        return self.read_all()
+
+    def read_all(self) -> Tuple[Tuple[float, float, float], Tuple[float, float, float], float]:
+        """Read acceleration, gyroscope and temperature in one I2C transaction.
+
+        The 14 data bytes starting at ACCEL_XOUT_H are fetched with a single
+        ``write_then_readinto``, so all values come from the same sample and the
+        bus is busy for roughly a third of the time needed by reading
+        `acceleration`, `gyro` and `temperature` one after another.
+
+        :return: ``(acceleration, gyro, temperature)``
+        """
+        buf = self._motion_buffer
+        with self.i2c_device:
+            self.i2c_device.write_then_readinto(self._motion_register, buf)
+        raw = unpack_from(">7h", buf)
+        if self._gyro_temperature_compensation:
+            self._check_temperature(raw[3])
+        return (
+            self.scale_accel(raw[0:3]),
+            self.scale_gyro(raw[4:7]),
+            self.scale_temperature(raw[3]),
+        )
+
+    def read_accel_into(self, buf, raw: bool = False) -> None:
+        """Read acceleration X, Y and Z into ``buf`` without allocating memory.
+
+        :param buf: Caller-owned buffer with room for 3 values, usually an
+            ``array("f")`` for m/s^2 or an ``array("h")`` when ``raw`` is set
+        :param bool raw: Store raw sensor counts instead of m/s^2. Raw counts
+            only include the calibration on chips with hardware offsets
+        """
+        data = self._motion_buffer
+        with self.i2c_device:
+            self.i2c_device.write_then_readinto(self._motion_register, data, in_end=6)
+        if raw:
+            self._decode_into(data, 0, buf, 0, 3, None, None)
+        else:
+            self._decode_into(data, 0, buf, 0, 3, self._accel_offset, self._accel_scales)
+
+    def read_motion_into(self, buf, raw: bool = False) -> None:
+        """Read a `read_all` snapshot into ``buf`` without allocating memory.
+
+        ``buf`` receives acceleration X, Y, Z, gyroscope X, Y, Z and temperature,
+        in that order.
+
+        With ``raw`` set and an ``array("h")`` buffer no heap memory is used at
+        all. Scaled values into an ``array("f")`` skip all tuples and lists, but
+        on builds without immediate floats every product is still a short-lived
+        float object.
+
+        :param buf: Caller-owned buffer with room for 7 values
+        :param bool raw: Store raw sensor counts instead of m/s^2, °/s and °C.
+            Raw counts only include the calibration on chips with hardware offsets
+        """
+        with self.i2c_device:
+            self.i2c_device.write_then_readinto(self._motion_register, self._motion_buffer)
+        self._decode_motion_into(self._motion_buffer, buf, 0, raw)
+
+    def read_motion_milli_into(self, buf) -> None:
+        """Read a `read_all` snapshot into ``buf`` as integers, without floats.
+
+        ``buf`` receives acceleration X, Y, Z in milli-g, gyroscope X, Y, Z in
+        milli-°/s and temperature in milli-°C, in that order. The conversion
+        uses precomputed integer multiply and shift factors (about 0.1 % of
+        the float result), so an ``array("l")`` buffer is filled without any
+        float math or heap allocation. That pays off on boards without a
+        floating point unit, such as the RP2040.
+
+        :param buf: Caller-owned buffer with room for 7 values, usually ``array("l")``
+        """
+        with self.i2c_device:
+            self.i2c_device.write_then_readinto(self._motion_register, self._motion_buffer)
+        self._decode_motion_milli_into(self._motion_buffer, buf, 0)
+
+    def _decode_motion_milli_into(self, data, buf, offset: int) -> None:
+        if self._gyro_temperature_compensation:
+            self._check_temperature_data(data)
+        self._decode_milli_into(data, 0, buf, offset, self._accel_offset, self._accel_milli, _ACCEL_MILLI_SHIFT)
+        self._decode_milli_into(data, 8, buf, offset + 3, self._gyro_offset, self._gyro_milli, _GYRO_MILLI_SHIFT)
+        value = (data[6] << 8) | data[7]
+        if value > 32767:
+            value -= 65536
+        buf[offset + 6] = ((value * _TEMP_MILLI_FACTOR) >> _TEMP_MILLI_SHIFT) + _TEMP_MILLI_OFFSET
+
+    @staticmethod
+    def _decode_milli_into(data, start, buf, offset, bias, factor, shift) -> None:
+        # Like _decode_into, with integer multiply and round-to-nearest shift instead of float scale
+        rounding = 1 << (shift - 1)
+        for i in range(3):
+            value = (data[start] << 8) | data[start + 1]
+            if value > 32767:
+                value -= 65536
+            if bias is not None:
+                value -= bias[i]
+            buf[offset + i] = (value * factor[i] + rounding) >> shift
+            start += 2
+
+    def _decode_motion_into(self, data, buf, offset: int, raw: bool) -> None:
+        # Decode the 14 bytes from ACCEL_OUT in data into 7 values of buf starting at offset
+        if self._gyro_temperature_compensation:
+            self._check_temperature_data(data)
+        if raw:
+            self._decode_into(data, 0, buf, offset, 3, None, None)
+            self._decode_into(data, 8, buf, offset + 3, 3, None, None)
+            self._decode_into(data, 6, buf, offset + 6, 1, None, None)
+        else:
+            self._decode_into(data, 0, buf, offset, 3, self._accel_offset, self._accel_scales)
+            self._decode_into(data, 8, buf, offset + 3, 3, self._gyro_offset, self._gyro_scales)
+            self._decode_into(data, 6, buf, offset + 6, 1, None, None)
+            buf[offset + 6] = self.scale_temperature(buf[offset + 6])
+
+    @staticmethod
+    def _decode_into(data, start, buf, offset, count, bias, scale) -> None:
+        # Big-endian int16 decoding by hand, struct.unpack would allocate a tuple
+        for i in range(count):
+            value = (data[start] << 8) | data[start + 1]
+            if value > 32767:
+                value -= 65536
+            if scale is None:
+                buf[offset + i] = value
+            elif bias is None:
+                buf[offset + i] = value * scale[i]
+            else:
+                buf[offset + i] = (value - bias[i]) * scale[i]
+            start += 2
+
+    @property
+    def sleep(self) -> bool:
+        """Shuts down the accelerometers and gyroscopes, saving power. No new data will
+        be recorded until the sensor is taken out of sleep by setting to `False`"""
+        return self._cached_sleep
+
+    @sleep.setter
+    def sleep(self, value: bool) -> None:
+        self._sleep = value
+        self._cached_sleep = bool(value)
+
+    @property
+    def sample_rate_divisor(self) -> int:
+        """Sample rate divisor. See datasheet for details"""
+        return self._cached_sample_rate_divisor
+
+    @sample_rate_divisor.setter
+    def sample_rate_divisor(self, value: int) -> None:
+        self._sample_rate_divisor = value
+        self._cached_sample_rate_divisor = value
+
     @property
     def cycle(self) -> bool:
         """Enable or disable periodic measurement at a rate set by cycle_rate.
         If the sensor was in sleep mode, it will be waken up to cycle"""
-        return self._cycle
+        return self._cached_cycle
 
     @cycle.setter
     def cycle(self, value: bool) -> None:
         self.sleep = not value
         self._cycle = value
+        self._cached_cycle = bool(value)
 
     @property
     def gyro_range(self) -> int:
         """The measurement range of all gyroscope axes. Must be a `GyroRange`"""
-        return self._gyro_range
+        return self._cached_gyro_range
 
     @gyro_range.setter
     def gyro_range(self, value: int) -> None:
         if (value < 0) or (value > 3):
             raise ValueError("gyro_range must be a GyroRange")
         self._gyro_range = value
+        self._cached_gyro_range = value
+        self._update_scales()
         sleep(0.01)
 
     @property
     def accelerometer_range(self) -> int:
         """The measurement range of all accelerometer axes. Must be a `Range`"""
-        return self._accel_range
+        return self._cached_accel_range
 
     @accelerometer_range.setter
     def accelerometer_range(self, value: int) -> None:
         if (value < 0) or (value > 3):
             raise ValueError("accelerometer_range must be a Range")
         self._accel_range = value
-        self._accel_scale = 1.0 / [16384, 8192, 4096, 2048][value]
+        self._cached_accel_range = value
+        self._update_scales()
         sleep(0.01)
 
     @property
     def filter_bandwidth(self) -> int:
-        """The bandwidth of the gyroscope Digital Low Pass Filter. Must be a `GyroRange`"""
-        return self._filter_bandwidth
+        """The bandwidth of the Digital Low Pass Filter. Must be a `Bandwidth`.
+
+        Applies to the gyroscope and the accelerometer; the MPU6500/MPU9250 get
+        the same setting in their separate accelerometer filter. Any value but
+        `Bandwidth.BAND_260_HZ` also lowers the internal rate from 8 kHz to 1 kHz,
+        see `data_rate`."""
+        return self._cached_filter_bandwidth
 
     @filter_bandwidth.setter
     def filter_bandwidth(self, value: int) -> None:
         if (value < 0) or (value > 6):
             raise ValueError("filter_bandwidth must be a Bandwidth")
         self._filter_bandwidth = value
+        self._cached_filter_bandwidth = value
+        if self._chip_id != 0x68:
+            self._accel_config2 = value
         sleep(0.01)
 
+    @property
+    def data_rate(self) -> float:
+        """Output data rate in Hz, set by `sample_rate_divisor` and `filter_bandwidth`.
+
+        This is how often new samples appear in the data registers and the FIFO.
+        """
+        base_rate = 8000 if self._cached_filter_bandwidth == Bandwidth.BAND_260_HZ else 1000
+        return base_rate / (1 + self._cached_sample_rate_divisor)
+
+    def configure_odr(self, hz: float, bandwidth: int = None) -> float:
+        """Set the output data rate and a matching low pass filter.
+
+        Reading the sensor slower than it samples without filtering lets fast
+        vibrations fold into slow false readings (aliasing). Pick the rate
+        the application needs and read every sample, best through the FIFO.
+        For a very clean low rate, sample faster and average the FIFO frames
+        with ``makerclass_decimator.Decimator``.
+
+        :param float hz: Requested rate, 3.9 Hz up to 1 kHz with the filter on
+        :param int bandwidth: A `Bandwidth`. Defaults to the widest filter
+            below half the rate, so nothing above the Nyquist frequency gets through
+        :return: The rate actually set, see `data_rate`
+        """
+        if hz <= 0:
+            raise ValueError("hz must be positive")
+        if bandwidth is None:
+            bandwidth = Bandwidth.BAND_5_HZ
+            for candidate in range(Bandwidth.BAND_184_HZ, Bandwidth.BAND_5_HZ):
+                if _BANDWIDTH_CUTOFF[candidate] <= hz / 2:
+                    bandwidth = candidate
+                    break
+        base_rate = 8000 if bandwidth == Bandwidth.BAND_260_HZ else 1000
+        self.filter_bandwidth = bandwidth
+        self.sample_rate_divisor = min(max(round(base_rate / hz) - 1, 0), 255)
+        return self.data_rate
+
     @property
     def cycle_rate(self) -> int:
         """The rate that measurements are taken while in `cycle` mode. Must be a `Rate`"""
-        return self._cycle_rate
+        return self._cached_cycle_rate
 
     @cycle_rate.setter
     def cycle_rate(self, value: int) -> None:
         if (value < 0) or (value > 3):
             raise ValueError("cycle_rate must be a Rate")
         self._cycle_rate = value
+        self._cached_cycle_rate = value
         sleep(0.01)
 
     @property
     def clock_source(self) -> int:
         """The clock source for the sensor"""
-        return self._clksel
+        return self._cached_clksel
 
     @clock_source.setter
     def clock_source(self, value: int) -> None:
@@ -345,17 +1004,824 @@ class MakerClassAccelerometer:
         if value not in range(8):
             raise ValueError("clock_source must be ClockSource value, integer from 0 - 7.")
         self._clksel = value
+        self._cached_clksel = value
 
     def read_whole_fifo(self):
         """Return raw FIFO bytes"""
         # This code must be fast to ensure samples are contiguous
         count = self.fifo_count
         buf = bytearray(count)
+        if not count:
+            return buf
         buf[0] = _MPU_FIFO_R_W
         with self.i2c_device:
             self.i2c_device.write_then_readinto(buf, buf, out_end=1, in_start=0)
         return buf
 
+    def start_fifo(
+        self,
+        accel: bool = True,
+        gyro: bool = True,
+        temperature: bool = False,
+        sample_rate_divisor: int = None,
+    ) -> None:
+        """Start buffering samples in the sensor's FIFO.
+
+        :param bool accel: Store accelerometer data in the FIFO
+        :param bool gyro: Store gyroscope data in the FIFO
+        :param bool temperature: Store temperature data in the FIFO
+        :param int sample_rate_divisor: If set, also changes `sample_rate_divisor`,
+            which sets the rate new frames are written to the FIFO
+        """
+        if not (accel or gyro or temperature):
+            raise ValueError("At least one FIFO source must be enabled")
+        if sample_rate_divisor is not None:
+            self.sample_rate_divisor = sample_rate_divisor
+
+        # Frames are stored in register order: accel, temperature, gyro
+        sources = 0
+        words = 0
+        layout = [-1, -1, -1]
+        if accel:
+            sources |= FifoSource.ACCEL
+            layout[0] = words
+            words += 3
+        if temperature:
+            sources |= FifoSource.TEMPERATURE
+            layout[2] = words
+            words += 1
+        if gyro:
+            sources |= FifoSource.GYRO
+            layout[1] = words
+            words += 3
+        self._fifo_layout = tuple(layout)
+        self._fifo_format = f">{words}h"
+        self._fifo_frame_size = words * 2
+
+        self._fifo_enable = False
+        self._fifo_sources = sources
+        self._fifo_overflow_enable = True
+        self.reset_fifo()
+        self._take_int_status(_INT_FIFO_OVERFLOW)  # forget an overflow from before
+        self._fifo_enable = True
+
+    def stop_fifo(self) -> None:
+        """Stop writing samples into the FIFO"""
+        self._fifo_enable = False
+        self._fifo_sources = 0
+        self._fifo_overflow_enable = False
+        self._fifo_frame_size = 0
+
+    def _take_int_status(self, mask: int) -> int:
+        # Reading INT_STATUS clears all its flags. Keep those not asked for,
+        # so FIFO overflow checks and DATA_RDY polling don't lose each other's
+        status = self._int_status | self._int_status_pending
+        self._int_status_pending = status & ~mask
+        return status & mask
+
+    @property
+    def fifo_contents(self) -> Tuple[bool, bool, bool]:
+        """Whether the running FIFO holds ``(acceleration, gyro, temperature)``,
+        all `False` when it is not running"""
+        if not self._fifo_frame_size:
+            return (False, False, False)
+        accel_index, gyro_index, temp_index = self._fifo_layout
+        return (accel_index >= 0, gyro_index >= 0, temp_index >= 0)
+
+    def reset_fifo(self) -> None:
+        """Discard everything stored in the FIFO"""
+        self._fifo_reset = True
+
+    def fifo_frames(self, raw: bool = False):
+        """Drain the FIFO and yield the decoded frames, oldest first.
+
+        All complete frames are read in one I2C transaction. Each frame is
+        ``(acceleration, gyro, temperature)`` scaled like `read_all`, with
+        ``None`` for sensors not enabled in `start_fifo`. A partially written
+        frame is left in the FIFO for the next call.
+
+        With ``raw`` the frames are tuples of the raw values in FIFO order
+        instead, to be scaled later with `scale_fifo_frame`.
+
+        If the FIFO overflowed (FIFO_OFLOW in INT_STATUS), the oldest bytes
+        were overwritten and frame boundaries are lost, even if the FIFO has
+        drained since. The FIFO is then reset, `fifo_overflows` is incremented
+        and nothing is yielded for that call.
+        """
+        frame_size = self._fifo_frame_size
+        if not frame_size:
+            raise RuntimeError("FIFO is not running, call start_fifo() first")
+
+        if self._gyro_temperature_compensation:
+            self._refresh_temperature()
+        overflowed = self._take_int_status(_INT_FIFO_OVERFLOW)
+        count = self.fifo_count
+        if overflowed or count >= len(self._fifo_buffer):
+            self.reset_fifo()
+            self.fifo_overflows += 1
+            return
+        count -= count % frame_size
+        if not count:
+            return
+
+        buf = self._fifo_buffer
+        with self.i2c_device:
+            self.i2c_device.write_then_readinto(self._fifo_register, buf, in_end=count)
+
+        fmt = self._fifo_format
+        if raw:
+            for offset in range(0, count, frame_size):
+                yield unpack_from(fmt, buf, offset)
+        else:
+            for offset in range(0, count, frame_size):
+                yield self.scale_fifo_frame(unpack_from(fmt, buf, offset))
+
+    def scale_fifo_frame(self, raw_frame) -> Tuple[Tuple[float, float, float], Tuple[float, float, float], float]:
+        """Scale a raw frame from ``fifo_frames(raw=True)`` to
+        ``(acceleration, gyro, temperature)`` like `fifo_frames`"""
+        accel_index, gyro_index, temp_index = self._fifo_layout
+        return (
+            self.scale_accel(raw_frame[accel_index:accel_index + 3]) if accel_index >= 0 else None,
+            self.scale_gyro(raw_frame[gyro_index:gyro_index + 3]) if gyro_index >= 0 else None,
+            self.scale_temperature(raw_frame[temp_index]) if temp_index >= 0 else None,
+        )
+
+
+    def enable_data_ready(self, pin=None) -> None:
+        """Signal every new sample on the sensor's INT pin.
+
+        Once enabled, `wait_for_data` and `wait_for_data_async` return exactly
+        once per new sample, so the loop runs at the sensor's sample rate
+        instead of sleeping a guessed interval.
+
+        :param ~microcontroller.Pin pin: The board pin wired to the sensor's INT
+            pin. Edges are counted with `countio` when the pin supports it,
+            otherwise the pin is watched with `keypad`. Without a pin the
+            DATA_RDY flag is polled over I2C instead.
+        """
+        self.disable_data_ready()
+        if pin is not None:
+            try:
+                import countio  # pylint: disable=import-outside-toplevel
+
+                self._data_ready_counter = countio.Counter(pin, edge=countio.Edge.RISE)
+                self._data_ready_counted = 0
+            except (ImportError, ValueError):
+                import keypad  # pylint: disable=import-outside-toplevel
+
+                self._data_ready_keys = keypad.Keys((pin,), value_when_pressed=True, pull=False, interval=0.001)
+                self._data_ready_event = keypad.Event()
+        self._arm_data_ready()
+        self._data_ready_armed = True
+
+    def _arm_data_ready(self) -> None:
+        self._int_active_low = False
+        self._int_open_drain = False
+        # keypad scans the pin level, so keep INT high until the sample is read
+        latch = self._data_ready_keys is not None
+        self._int_latch = latch
+        self._int_any_read_clears = latch
+        self._data_ready_enable = True
+
+    def disable_data_ready(self) -> None:
+        """Stop signalling new samples and release the INT pin"""
+        self._data_ready_armed = False
+        self._data_ready_enable = False
+        if self._data_ready_counter is not None:
+            self._data_ready_counter.deinit()
+            self._data_ready_counter = None
+        if self._data_ready_keys is not None:
+            self._data_ready_keys.deinit()
+            self._data_ready_keys = None
+            self._data_ready_event = None
+
+    @property
+    def data_ready(self) -> bool:
+        """`True` once per new sample. Does not block, see `enable_data_ready`"""
+        counter = self._data_ready_counter
+        if counter is not None:
+            # Compare with the total seen so far instead of resetting the
+            # counter, which would lose an edge arriving in between
+            total = counter.count
+            count = total - self._data_ready_counted
+            if not count:
+                return False
+            self._data_ready_counted = total
+            self.data_ready_overruns += count - 1
+            return True
+        keys = self._data_ready_keys
+        if keys is not None:
+            event = self._data_ready_event
+            while keys.events.get_into(event):
+                if event.pressed:
+                    return True
+            return False
+        return bool(self._take_int_status(_INT_DATA_READY))
+
+    def wait_for_data(self, timeout: float = None) -> bool:
+        """Block until a new sample is available.
+
+        :param float timeout: Give up after this many seconds, wait forever if `None`
+        :return: `True` if a new sample is ready, `False` on timeout
+        """
+        if timeout is not None:
+            deadline = monotonic() + timeout
+        pause = self._data_ready_poll_interval()
+        while not self.data_ready:
+            if timeout is not None and monotonic() >= deadline:
+                return False
+            if pause:
+                sleep(pause)
+        return True
+
+    def _data_ready_poll_interval(self) -> float:
+        # Without an INT pin every check reads INT_STATUS over the shared bus,
+        # check about four times per sample instead of as fast as possible
+        if self._data_ready_counter is not None or self._data_ready_keys is not None:
+            return 0.0
+        return 0.25 / self.data_rate
+
+    async def wait_for_data_async(self) -> None:
+        """Wait for a new sample, letting other `asyncio` tasks run meanwhile"""
+        import asyncio  # pylint: disable=import-outside-toplevel
+
+        pause = self._data_ready_poll_interval()
+        while not self.data_ready:
+            await asyncio.sleep(pause)
+
+
+    def wake_on_motion(self, threshold_mg: int, rate: int = Rate.CYCLE_5_HZ) -> None:
+        """Put the sensor into low power wake-on-motion mode.
+
+        The gyroscope is switched off and the accelerometer only wakes up at
+        ``rate`` to compare each sample with the previous one. When the change
+        on any axis exceeds ``threshold_mg`` the INT pin goes high and stays
+        high until a register is read. Use `wake_alarm` to sleep the board
+        until that happens.
+
+        Call `stop_wake_on_motion` to go back to normal measurements.
+
+        :param int threshold_mg: Motion threshold in milli-g, 2 mg steps up to
+            510 mg on the MPU6050, 4 mg steps up to 1020 mg on the MPU6500/MPU9250
+        :param int rate: How often the accelerometer wakes up, a `Rate`. The
+            MPU6500/MPU9250 use their closest low power rate
+        """
+        if (rate < 0) or (rate > 3):
+            raise ValueError("rate must be a Rate")
+        step = 2 if self._chip_id == 0x68 else 4
+        threshold = round(threshold_mg / step)
+        if (threshold < 1) or (threshold > 255):
+            raise ValueError(f"threshold_mg must be between {step} and {255 * step} mg")
+
+        self.disable_data_ready()
+        self.cycle = False
+        self._standby = 0b00000111  # gyroscope X, Y and Z in standby
+        if self._chip_id == 0x68:
+            self._accel_high_pass = 1  # 5 Hz, motion is detected on the high-pass output
+            self._motion_threshold = threshold
+            self._motion_duration = 1
+            self._motion_detect_ctrl = 0b00010000  # 1 ms extra accelerometer power-on delay
+            self.cycle_rate = rate  # rewrites PWR_MGMT_2, gyro standby bits are kept
+        else:
+            self._accel_config2 = 0b00000001  # 184 Hz accelerometer low pass filter
+            self._lp_accel_odr = _LP_ACCEL_ODR[rate]
+            self._motion_threshold = threshold
+            self._motion_detect_ctrl = 0b11000000  # compare each sample with the previous one
+            self._cached_cycle_rate = rate
+        # Latch INT high until any register read so a pin alarm cannot miss it
+        self._int_active_low = False
+        self._int_open_drain = False
+        self._int_latch = True
+        self._int_any_read_clears = True
+        self._interrupt_enable = 0b01000000  # MOT_EN / WOM_EN
+        self._motion_status  # clear stale flags
+        self.cycle = True
+
+    def stop_wake_on_motion(self) -> None:
+        """Leave wake-on-motion mode and resume normal measurements"""
+        self._interrupt_enable = 0
+        self._motion_detect_ctrl = 0
+        self.cycle = False
+        self.sleep = False
+        self._standby = 0
+        self._int_latch = False
+        self._int_any_read_clears = False
+        if self._chip_id == 0x68:
+            self._accel_high_pass = 0
+        else:
+            self._accel_config2 = self._cached_filter_bandwidth
+        self.sync()
+
+    @property
+    def motion_detected(self) -> bool:
+        """`True` if motion was detected since the last check, see `wake_on_motion`"""
+        return self._motion_status
+
+    @staticmethod
+    def wake_alarm(pin):
+        """Create an `alarm.pin.PinAlarm` that wakes the board when the sensor
+        detects motion.
+
+        .. code-block:: python
+
+            import alarm
+
+            mpu.wake_on_motion(threshold_mg=100)
+            alarm.exit_and_deep_sleep_until_alarms(mpu.wake_alarm(board.GP15))
+
+        :param ~microcontroller.Pin pin: The board pin wired to the sensor's INT pin
+        """
+        import alarm  # pylint: disable=import-outside-toplevel
+
+        return alarm.pin.PinAlarm(pin, value=True, pull=False)
+
+    def enable_magnetometer(self) -> None:
+        """Start the AK8963 magnetometer of an MPU9250 and let the MPU read it.
+
+        The AK8963 is set up once through the bypass multiplexer, then the MPU's
+        own I2C master copies every magnetometer sample into EXT_SENS_DATA right
+        behind the gyroscope registers. `magnetic` and `read_motion_mag_into`
+        then read it from the MPU, the latter together with acceleration and
+        gyroscope in a single 21 byte burst.
+
+        Magnetic values are in µT and rotated into the accelerometer axes.
+
+        :raises RuntimeError: if the chip is not an MPU9250 or the AK8963 does not answer
+        """
+        if self._chip_id != 0x71:
+            raise RuntimeError("Magnetometer is only available on the MPU9250")
+        self._i2c_master_enable = False
+        self._i2c_bypass = True
+        try:
+            magnetometer = i2c_device.I2CDevice(self.i2c_device.i2c, _AK8963_ADDRESS)
+            buf = bytearray(3)
+            with magnetometer:
+                magnetometer.write_then_readinto(bytes([_AK8963_WIA]), buf, in_end=1)
+                if buf[0] != _AK8963_DEVICE_ID:
+                    raise RuntimeError(f"AK8963 not found! WIA = 0x{buf[0]:02x}")
+                for mode in (_AK8963_MODE_POWER_DOWN, _AK8963_MODE_FUSE_ROM):
+                    magnetometer.write(bytes([_AK8963_CNTL1, mode]))
+                    sleep(_AK8963_MODE_DELAY)
+                magnetometer.write_then_readinto(bytes([_AK8963_ASAX]), buf)
+                for mode in (_AK8963_MODE_POWER_DOWN, _AK8963_MODE_CONTINUOUS_100HZ):
+                    magnetometer.write(bytes([_AK8963_CNTL1, mode]))
+                    sleep(_AK8963_MODE_DELAY)
+        finally:
+            self._i2c_bypass = False
+        # Sensitivity adjustment from the datasheet: H * ((ASA - 128) / 256 + 1)
+        self._mag_scales = tuple(_AK8963_SENSITIVITY * ((asa - 128) / 256 + 1) for asa in buf)
+
+        self._i2c_master_clock = _I2C_MASTER_400KHZ
+        with self.i2c_device:
+            # Slave 0: read 7 bytes from HXL of the AK8963 on every sample
+            self.i2c_device.write(
+                bytes([_MPU_I2C_SLV0_ADDR, 0x80 | _AK8963_ADDRESS, _AK8963_HXL, 0x80 | _MAG_DATA_LENGTH])
+            )
+        self._i2c_master_enable = True
+        self._mag_buffer = bytearray(_MOTION_DATA_LENGTH + _MAG_DATA_LENGTH)
+        sleep(_AK8963_MODE_DELAY)  # first magnetometer sample
+
+    @property
+    def magnetic(self) -> Tuple[float, float, float]:
+        """Magnetic field X, Y and Z in µT, see `enable_magnetometer`"""
+        buf = array("f", [0] * 3)
+        data = self._mag_buffer
+        if data is None:
+            raise RuntimeError("Call enable_magnetometer() first")
+        with self.i2c_device:
+            self.i2c_device.write_then_readinto(
+                bytes([_MPU_EXT_SENS_DATA]), data, in_start=_MOTION_DATA_LENGTH
+            )
+        self._decode_magnetic_into(data, buf, 0, False)
+        return (buf[0], buf[1], buf[2])
+
+    def read_motion_mag_into(self, buf, raw: bool = False) -> None:
+        """Read acceleration, gyroscope, temperature and magnetic field into
+        ``buf`` in one I2C transaction, without allocating memory.
+
+        ``buf`` receives the 7 values of `read_motion_into` followed by the
+        magnetic field X, Y and Z in µT. See `enable_magnetometer`.
+
+        :param buf: Caller-owned buffer with room for 10 values
+        :param bool raw: Store raw sensor counts instead of scaled values.
+            Raw magnetometer counts are in the AK8963 axes, X and Y swapped
+            and Z negated against the accelerometer
+        """
+        data = self._mag_buffer
+        if data is None:
+            raise RuntimeError("Call enable_magnetometer() first")
+        with self.i2c_device:
+            self.i2c_device.write_then_readinto(self._motion_register, data)
+        self._decode_motion_into(data, buf, 0, raw)
+        self._decode_magnetic_into(data, buf, 7, raw)
+
+    def _decode_magnetic_into(self, data, buf, offset: int, raw: bool) -> None:
+        # Little endian AK8963 X/Y/Z at _MOTION_DATA_LENGTH, rotated into the
+        # accelerometer frame: X = mag Y, Y = mag X, Z = -mag Z
+        start = _MOTION_DATA_LENGTH
+        scales = self._mag_scales
+        hard_iron = self.magnetometer_offset
+        for axis in range(3):
+            value = data[start] | (data[start + 1] << 8)
+            if value > 32767:
+                value -= 65536
+            start += 2
+            if raw:
+                buf[offset + axis] = value
+                continue
+            value *= scales[axis]
+            if axis == 0:
+                buf[offset + 1] = value - hard_iron[1]
+            elif axis == 1:
+                buf[offset] = value - hard_iron[0]
+            else:
+                buf[offset + 2] = -value - hard_iron[2]
+
+    @property
+    def calibration(self) -> Tuple[Tuple[float, float, float], Tuple[float, float, float], Tuple[float, float, float]]:
+        """The calibration applied to scaled readings as ``(accel_bias, accel_scale, gyro_bias)``.
+
+        ``accel_bias`` is in g and ``gyro_bias`` in °/s, both subtracted from the
+        readings, ``accel_scale`` multiplies the bias corrected acceleration.
+
+        On the MPU6500 and MPU9250 the biases are programmed into the chip's
+        offset registers, so reads only need to scale the data. The MPU6050
+        subtracts them in software.
+        """
+        return (self._cal_accel_bias, self._cal_accel_scale, self._cal_gyro_bias)
+
+    @calibration.setter
+    def calibration(self, value) -> None:
+        accel_bias, accel_scale, gyro_bias = value
+        self._cal_accel_bias = tuple(accel_bias)
+        self._cal_accel_scale = tuple(accel_scale)
+        self._cal_gyro_bias = tuple(gyro_bias)
+        self._gyro_bias_applied = self._cal_gyro_bias
+        if self._hardware_offsets:
+            self._write_offsets(self._cal_accel_bias, self._cal_gyro_bias)
+        self._update_scales()
+        self._start_temperature_compensation()
+
+    @property
+    def gyro_temperature_model(self) -> Tuple[float, Tuple[float, float, float]]:
+        """Linear model of the gyroscope bias over temperature as
+        ``(reference_temperature, slopes)``, or `None` without a model.
+
+        The gyroscope bias from `calibration` applies at ``reference_temperature``
+        (°C) and changes by ``slopes`` (°/s per °C) for each axis. While a model
+        is set, the bias is updated whenever the temperature changed by 0.5 °C.
+        The temperature comes for free with `read_all`, `read_motion_into` and
+        friends; reads without it fetch the temperature at most once a second.
+
+        `calibrate` sets the reference temperature, and fits the slopes once it
+        has been called at temperatures at least 2 °C apart. See also
+        `learn_gyro_temperature`.
+        """
+        if self._cal_gyro_temperature is None:
+            return None
+        return (self._cal_gyro_temperature, self._cal_gyro_slope)
+
+    @gyro_temperature_model.setter
+    def gyro_temperature_model(self, value) -> None:
+        if value is None:
+            self._cal_gyro_temperature = None
+            self._cal_gyro_slope = (0.0, 0.0, 0.0)
+        else:
+            reference_temperature, slopes = value
+            self._cal_gyro_temperature = reference_temperature
+            self._cal_gyro_slope = tuple(slopes)
+        self._set_gyro_bias(self._cal_gyro_bias)
+        self._start_temperature_compensation()
+
+    def _start_temperature_compensation(self) -> None:
+        # Any temperature is outside the empty window, the next read recomputes the bias
+        self._gyro_temperature_compensation = self._cal_gyro_temperature is not None and any(self._cal_gyro_slope)
+        self._temperature_low = 32767
+        self._temperature_high = -32768
+        self._temperature_refresh = 0.0
+
+    def _refresh_temperature(self) -> None:
+        # For reads without temperature data, fetch it at a low rate
+        now = monotonic()
+        if now >= self._temperature_refresh:
+            self._temperature_refresh = now + _GYRO_TEMPERATURE_REFRESH
+            self._check_temperature(self._raw_temp_data)
+
+    def _check_temperature_data(self, data) -> None:
+        raw_temperature = (data[6] << 8) | data[7]
+        if raw_temperature > 32767:
+            raw_temperature -= 65536
+        self._check_temperature(raw_temperature)
+
+    def _check_temperature(self, raw_temperature: int) -> None:
+        if self._temperature_low <= raw_temperature <= self._temperature_high:
+            return
+        half_step = int(_GYRO_TEMPERATURE_STEP * _TEMPERATURE_SENSITIVITY / 2)
+        self._temperature_low = raw_temperature - half_step
+        self._temperature_high = raw_temperature + half_step
+        difference = self.scale_temperature(raw_temperature) - self._cal_gyro_temperature
+        bias = self._cal_gyro_bias
+        slope = self._cal_gyro_slope
+        self._set_gyro_bias(
+            (
+                bias[0] + slope[0] * difference,
+                bias[1] + slope[1] * difference,
+                bias[2] + slope[2] * difference,
+            )
+        )
+
+    def _set_gyro_bias(self, gyro_bias) -> None:
+        self._gyro_bias_applied = gyro_bias
+        if self._hardware_offsets:
+            self._write_gyro_offsets(gyro_bias)
+        else:
+            self._update_scales()
+
+    def _measure_raw(self, samples: int):
+        # Average raw readings with hardware offsets and temperature compensation off
+        self._gyro_temperature_compensation = False
+        if self._hardware_offsets:
+            self._write_offsets((0.0, 0.0, 0.0), (0.0, 0.0, 0.0))
+        raw = array("h", [0] * 7)
+        sums = [0] * 7
+        for _ in range(samples):
+            self.read_motion_into(raw, True)
+            for i in range(7):
+                sums[i] += raw[i]
+            sleep(0.002)
+        return [total / samples for total in sums]
+
+    def _add_gyro_temperature_point(self, temperature: float, gyro_bias) -> Tuple[float, Tuple[float, float, float]]:
+        # Least squares line through all gyro biases measured in this session,
+        # returns (reference temperature, bias there)
+        points = self._cal_gyro_points
+        points.append((temperature, tuple(gyro_bias)))
+        temperatures = [point[0] for point in points]
+        if max(temperatures) - min(temperatures) < _GYRO_TEMPERATURE_MIN_SPAN:
+            return (temperature, tuple(gyro_bias))
+        count = len(points)
+        mean_temperature = sum(temperatures) / count
+        variance = sum((t - mean_temperature) ** 2 for t in temperatures)
+        bias = []
+        slopes = []
+        for axis in range(3):
+            mean_bias = sum(point[1][axis] for point in points) / count
+            covariance = sum((point[0] - mean_temperature) * (point[1][axis] - mean_bias) for point in points)
+            bias.append(mean_bias)
+            slopes.append(covariance / variance)
+        self._cal_gyro_slope = tuple(slopes)
+        return (mean_temperature, tuple(bias))
+
+    def calibrate(self, samples: int = 200) -> None:
+        """Measure the sensor's offsets. The board must lie still while this runs.
+
+        The gyroscope bias is the average rate at rest. For the accelerometer the
+        axis closest to vertical is expected to read ±1 g and the other two 0 g.
+
+        The accelerometer scale of an axis can only be measured with that axis
+        pointing both up and down. Call `calibrate` once for each of the six
+        faces of the board, in any order, and every axis seen both ways gets
+        its scale computed as well.
+
+        The result is applied right away, use `save_calibration` to keep it.
+
+        The gyroscope bias is stored together with the temperature it was
+        measured at. Calibrating again at a temperature at least 2 °C away
+        fits how the bias changes with temperature, see `gyro_temperature_model`.
+
+        :param int samples: Number of samples to average
+        """
+        averages = self._measure_raw(samples)
+        accel_sensitivity = _ACCEL_SENSITIVITY[self._cached_accel_range]
+        gyro_sensitivity = _GYRO_SENSITIVITY[self._cached_gyro_range]
+        accel = [averages[i] / accel_sensitivity for i in range(3)]
+        gyro_bias = tuple(averages[i] / gyro_sensitivity for i in range(3, 6))
+        self._cal_gyro_temperature, gyro_bias = self._add_gyro_temperature_point(
+            self.scale_temperature(averages[6]), gyro_bias
+        )
+
+        vertical = 0
+        for axis in (1, 2):
+            if abs(accel[axis]) > abs(accel[vertical]):
+                vertical = axis
+        if accel[vertical] > 0:
+            self._cal_accel_up[vertical] = accel[vertical]
+        else:
+            self._cal_accel_down[vertical] = accel[vertical]
+
+        accel_bias = list(self._cal_accel_bias)
+        accel_scale = list(self._cal_accel_scale)
+        for axis in range(3):
+            up = self._cal_accel_up[axis]
+            down = self._cal_accel_down[axis]
+            if up is not None and down is not None:
+                accel_bias[axis] = (up + down) / 2
+                accel_scale[axis] = 2.0 / (up - down)
+            elif axis == vertical:
+                gravity = 1.0 if accel[axis] > 0 else -1.0
+                accel_bias[axis] = accel[axis] - gravity / accel_scale[axis]
+            else:
+                accel_bias[axis] = accel[axis]
+
+        self.calibration = (accel_bias, accel_scale, gyro_bias)
+
+    def learn_gyro_temperature(self, duration: float, interval: float = 10.0, samples: int = 200) -> int:
+        """Measure the gyroscope bias repeatedly while the temperature changes.
+
+        Leave the board still while it warms up, e.g. right after power-up in a
+        cold room. Every ``interval`` seconds the gyroscope bias is measured and
+        the temperature model of `gyro_temperature_model` is fitted again. The
+        accelerometer calibration is kept.
+
+        :param float duration: Seconds to keep measuring
+        :param float interval: Seconds between measurements
+        :param int samples: Number of samples to average per measurement
+        :return: The number of measurements taken
+        """
+        gyro_sensitivity = _GYRO_SENSITIVITY[self._cached_gyro_range]
+        end = monotonic() + duration
+        measurements = 0
+        while True:
+            averages = self._measure_raw(samples)
+            gyro_bias = tuple(averages[i] / gyro_sensitivity for i in range(3, 6))
+            self._cal_gyro_temperature, gyro_bias = self._add_gyro_temperature_point(
+                self.scale_temperature(averages[6]), gyro_bias
+            )
+            measurements += 1
+            self.calibration = (self._cal_accel_bias, self._cal_accel_scale, gyro_bias)
+            if monotonic() + interval > end:
+                return measurements
+            sleep(interval)
+
+    def save_calibration(self) -> None:
+        """Store the current calibration in ``microcontroller.nvm``.
+
+        The record is tied to this chip type (WHO_AM_I) and I2C address and is
+        applied automatically the next time the sensor is created.
+
+        :raises RuntimeError: If the board has no NVM, e.g. Blinka on a computer
+        """
+        nvm = makerclass_nvm.nvm()
+        if nvm is None:
+            raise RuntimeError("No microcontroller.nvm to store the calibration in")
+        accel_bias, accel_scale, gyro_bias = self.calibration
+        factory = self._factory_accel_offsets or (0, 0, 0)
+        reference_temperature = self._cal_gyro_temperature
+        if reference_temperature is None:
+            reference_temperature = float("nan")
+        record = pack(
+            _CALIBRATION_FORMAT,
+            _CALIBRATION_MAGIC,
+            _CALIBRATION_VERSION,
+            self._chip_id,
+            self._address,
+            *accel_bias,
+            *accel_scale,
+            *gyro_bias,
+            *factory,
+            reference_temperature,
+            *self._cal_gyro_slope,
+        )
+        offset = self._nvm_calibration_offset()
+        nvm[offset:offset + len(record)] = record
+
+    def load_calibration(self) -> bool:
+        """Apply the calibration stored by `save_calibration`.
+
+        :return: `True` if a matching record was found, `False` if there is no
+            NVM or it holds no calibration for this chip and address
+        """
+        record = self._stored_calibration()
+        if record is None:
+            return False
+        if self._hardware_offsets and self._factory_accel_offsets is None:
+            # No reset in this session (keep_configuration), the registers may
+            # already hold a programmed calibration instead of the factory trim
+            self._factory_accel_offsets = record[13:16]
+        reference_temperature = record[16]
+        if reference_temperature != reference_temperature:  # NaN
+            self._cal_gyro_temperature = None
+            self._cal_gyro_slope = (0.0, 0.0, 0.0)
+        else:
+            self._cal_gyro_temperature = reference_temperature
+            self._cal_gyro_slope = record[17:20]
+        self.calibration = (record[4:7], record[7:10], record[10:13])
+        return True
+
+    def _nvm_calibration_offset(self) -> int:
+        return makerclass_nvm.CALIBRATION_OFFSET + (self._address & 1) * makerclass_nvm.CALIBRATION_SLOT_SIZE
+
+    def _stored_calibration(self):
+        # The record saved for this chip type and address, or None
+        nvm = makerclass_nvm.nvm()
+        if nvm is None:
+            return None
+        offset = self._nvm_calibration_offset()
+        record = unpack_from(_CALIBRATION_FORMAT, nvm[offset:offset + makerclass_nvm.CALIBRATION_SLOT_SIZE])
+        if (
+            record[0] != _CALIBRATION_MAGIC
+            or record[1] != _CALIBRATION_VERSION
+            or record[2] != self._chip_id
+            or record[3] != self._address
+        ):
+            return None
+        return record
+
+
+class MakerClassAccelerometerArray:
+    """Several MPU sensors on one I2C bus sampled as one source.
+
+    Every read locks the bus once and bursts the 14 data bytes of all sensors
+    back to back, so the samples are as close in time as the bus allows
+    (about 0.4 ms apart at 400 kHz). The moment each burst started is kept in
+    :attr:`timestamps`.
+
+    The sensors sample on their own clocks, there is no way to trigger them
+    together. Give them the same configuration, e.g. the same
+    `MakerClassAccelerometer.sample_rate_divisor`, so their samples age the same.
+
+    :param ~busio.I2C i2c_bus: The I2C bus the sensors are connected to
+    :param addresses: I2C addresses of the sensors. Defaults to ``(0x68, 0x69)``
+    :param kwargs: Passed to every `MakerClassAccelerometer`
+
+    .. code-block:: python
+
+        imus = makerclass_accelerometer.MakerClassAccelerometerArray(i2c)
+        frame = array("f", [0] * 14)  # 7 values per sensor
+        while True:
+            imus.read_motion_into(frame)
+            skew = imus.timestamps[1] - imus.timestamps[0]  # ns
+    """
+
+    def __init__(
+        self,
+        i2c_bus: I2C,
+        addresses: Tuple[int, ...] = (_MPU_DEFAULT_ADDRESS, _MPU_ALT_ADDRESS),
+        **kwargs,
+    ) -> None:
+        self._i2c = i2c_bus
+        self.sensors = tuple(MakerClassAccelerometer(i2c_bus, address, **kwargs) for address in addresses)
+        """The `MakerClassAccelerometer` of every address, for configuration"""
+        self.timestamps = [0] * len(self.sensors)
+        """`time.monotonic_ns` at the start of each sensor's burst in the last read"""
+
+    def __len__(self) -> int:
+        return len(self.sensors)
+
+    def __getitem__(self, index: int) -> MakerClassAccelerometer:
+        return self.sensors[index]
+
+    def _read_all_sensors(self) -> None:
+        # One bus lock for all bursts, I2CDevice would lock and unlock per sensor
+        i2c = self._i2c
+        sensors = self.sensors
+        timestamps = self.timestamps
+        while not i2c.try_lock():
+            pass
+        try:
+            for i in range(len(sensors)):
+                sensor = sensors[i]
+                timestamps[i] = monotonic_ns()
+                i2c.writeto_then_readfrom(sensor._address, sensor._motion_register, sensor._motion_buffer)
+        finally:
+            i2c.unlock()
+
+    @property
+    def motion(self) -> Tuple[Tuple[Tuple[float, float, float], Tuple[float, float, float], float], ...]:
+        """`MakerClassAccelerometer.motion` of every sensor from one pass over the bus"""
+        self._read_all_sensors()
+        frame = array("f", [0] * 7)
+        result = []
+        for sensor in self.sensors:
+            sensor._decode_motion_into(sensor._motion_buffer, frame, 0, False)
+            result.append(((frame[0], frame[1], frame[2]), (frame[3], frame[4], frame[5]), frame[6]))
+        return tuple(result)
+
+    def read_motion_into(self, buf, raw: bool = False) -> None:
+        """Read all sensors into ``buf`` in one pass over the bus.
+
+        ``buf`` receives the `MakerClassAccelerometer.read_motion_into` values
+        of each sensor one after another, 7 values per sensor.
+
+        :param buf: Caller-owned buffer with room for 7 values per sensor
+        :param bool raw: Store raw sensor counts instead of m/s^2, °/s and °C
+        """
+        self._read_all_sensors()
+        sensors = self.sensors
+        for i in range(len(sensors)):
+            sensors[i]._decode_motion_into(sensors[i]._motion_buffer, buf, i * 7, raw)
+
+    def read_motion_milli_into(self, buf) -> None:
+        """Integer version of `read_motion_into`, see
+        `MakerClassAccelerometer.read_motion_milli_into`
+
+        :param buf: Caller-owned buffer with room for 7 values per sensor, usually ``array("l")``
+        """
+        self._read_all_sensors()
+        sensors = self.sensors
+        for i in range(len(sensors)):
+            sensors[i]._decode_motion_milli_into(sensors[i]._motion_buffer, buf, i * 7)
+
 
 # Aliases for compatibility
 MPU6050 = MakerClassAccelerometer  # Backward compatibility
@@ -0,0 +1,190 @@
+"""
+`makerclass_dashboard`
+================================================================================
+
+MakerClass CircuitPython library for text dashboards on small displays that
+redraw only what changed, at a limited frame rate.
+
+* Author: MakerClass
+
+With ``auto_refresh`` the display is redrawn up to 60 times a second,
+whenever any label was assigned, even to the text it already had. On an
+SSD1306 every redraw goes over the I2C bus shared with the sensors.
+
+Implementation Notes
+--------------------
+
+`Dashboard` turns ``auto_refresh`` off. Labels are set through
+`Dashboard.set`, which compares the text first and leaves unchanged labels
+alone. `Dashboard.refresh` redraws the display only if a label changed and
+the frame budget allows it:
+
+* at most ``max_fps`` frames a second
+* the display gets at most ``bus_share`` of the time, measured from how long
+  the last refresh took, so the sensors on the same bus keep their rate
+
+A change that doesn't fit into the budget waits for a later call, several
+changes are then sent in one frame. The refresh is called with
+``target_frames_per_second=None``: with a target, displayio sleeps to align
+the frame and skips it if refresh wasn't called often enough, both of which
+the budget already handles without blocking the loop.
+
+Bytes are estimated from the areas of the changed labels. The SSD1306 is
+written in pages of 8 rows, one byte per column and page. Saved bytes are
+counted against redrawing every label on every `set`.
+
+**Software and Dependencies:**
+
+* Adafruit CircuitPython firmware for the supported boards:
+  https://circuitpython.org/downloads
+
+* Adafruit's Display Text library:
+  https://github.com/adafruit/Adafruit_CircuitPython_Display_Text
+
+"""
+
+# imports
+__version__ = "1.0.0"
+__repo__ = "https://github.com/makerclass/workshop"
+
+from time import monotonic_ns
+
+try:
+    from typing import Callable, Optional
+    from adafruit_display_text.label import Label
+except ImportError:
+    pass
+
+_PAGE_ROWS = 8
+
+
+def _area_bytes(label: "Label") -> int:
+    # Bytes of the display pages covered by the label, e.g. 6 x 8 pixels of
+    # one character within a single page is 6 bytes
+    x, y, width, height = label.bounding_box
+    if not width or not height:
+        return 0
+    scale = label.scale
+    top = label.y + y * scale
+    bottom = top + height * scale
+    return width * scale * ((bottom - 1) // _PAGE_ROWS - top // _PAGE_ROWS + 1)
+
+
+class Dashboard:
+    """Change-driven updates of labels on a display with a frame budget.
+
+    :param display: The display, e.g. ``adafruit_displayio_ssd1306.SSD1306``.
+        Its ``auto_refresh`` is turned off
+    :param float max_fps: Most frames a second. Defaults to 10
+    :param float bus_share: Largest fraction of time spent refreshing.
+        Defaults to 0.5
+    :param clock: Function returning the time in nanoseconds. Defaults to
+        `time.monotonic_ns`
+
+    .. code-block:: python
+
+        dashboard = makerclass_dashboard.Dashboard(display)
+        while True:
+            dashboard.set(temp_value, f"{sht.temperature:.1f}°C")
+            dashboard.refresh()
+    """
+
+    def __init__(
+        self,
+        display,
+        max_fps: float = 10,
+        bus_share: float = 0.5,
+        clock: "Optional[Callable[[], int]]" = None,
+    ) -> None:
+        display.auto_refresh = False
+        self.display = display
+        self.max_fps = max_fps
+        self.bus_share = bus_share
+        self.clock = clock or monotonic_ns
+        self._dirty = {}  # id: bytes of the area to redraw
+        self._next_ns = 0  # earliest next refresh
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        """Zero the statistics"""
+        self.updates = 0
+        """Number of `set` calls"""
+        self.changes = 0
+        """Number of `set` calls that changed the text"""
+        self.refreshes = 0
+        """Number of display refreshes"""
+        self.unneeded = 0
+        """Number of `refresh` calls skipped because nothing changed"""
+        self.deferred = 0
+        """Number of `refresh` calls that waited for the frame budget"""
+        self.bytes_sent = 0
+        """Estimated bytes of the refreshed areas"""
+        self.bytes_saved = 0
+        """Estimated bytes not sent, against redrawing every label on every `set`"""
+        self.refresh_ns = 0
+        """Total time spent refreshing"""
+
+    @property
+    def dirty(self) -> bool:
+        """`True` if a label changed since the last refresh"""
+        return bool(self._dirty)
+
+    def set(self, label: "Label", text: str) -> bool:
+        """Set the text of ``label`` if it differs.
+
+        :return: `True` if the text changed
+        """
+        self.updates += 1
+        if label.text == text:
+            self.bytes_saved += _area_bytes(label)
+            return False
+        self.changes += 1
+        old_area = _area_bytes(label)
+        label.text = text
+        area = max(old_area, _area_bytes(label))
+        key = id(label)
+        if key in self._dirty:
+            # changed again before the last change was shown, sent only once
+            self.bytes_saved += self._dirty[key]
+            area = max(area, self._dirty[key])
+        self._dirty[key] = area
+        return True
+
+    def refresh(self, force: bool = False) -> bool:
+        """Redraw the display if a label changed and the frame budget allows.
+
+        :param bool force: Redraw now, ignoring the budget, e.g. after
+            changing the display other than through `set`
+        :return: `True` if the display was redrawn
+        """
+        if not self._dirty and not force:
+            self.unneeded += 1
+            return False
+        now = self.clock()
+        if now < self._next_ns and not force:
+            self.deferred += 1
+            return False
+        self.display.refresh(target_frames_per_second=None)
+        end = self.clock()
+        duration = end - now
+        self.refreshes += 1
+        self.refresh_ns += duration
+        self.bytes_sent += sum(self._dirty.values())
+        self._dirty = {}
+        interval = 1_000_000_000 / self.max_fps if self.max_fps else 0
+        if self.bus_share:
+            interval = max(interval, duration / self.bus_share)
+        self._next_ns = now + int(interval)
+        return True
+
+    def report(self) -> str:
+        """Statistics since `reset_stats` in a few lines"""
+        average = self.refresh_ns / self.refreshes / 1_000_000 if self.refreshes else 0.0
+        return "\n".join(
+            (
+                f"labels: {self.updates} set, {self.changes} changed, {self.updates - self.changes} unchanged",
+                f"refreshes: {self.refreshes} done ({average:.1f} ms each), "
+                f"{self.unneeded} not needed, {self.deferred} deferred",
+                f"bytes: ~{self.bytes_sent} sent, ~{self.bytes_saved} saved",
+            )
+        )
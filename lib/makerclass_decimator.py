@@ -0,0 +1,102 @@
+"""
+`makerclass_decimator`
+================================================================================
+
+MakerClass CircuitPython library for averaging MPU6050/MPU6500/MPU9250 FIFO
+samples down to a lower output rate.
+
+* Author: MakerClass
+
+Reading the sensor every now and then with `time.sleep` in between picks
+single samples out of a fast stream: noise stays in and vibrations faster
+than the reading rate show up as slow false movements (aliasing). Instead,
+let the sensor sample fast into its FIFO and average every ``factor`` frames
+into one output frame.
+
+Implementation Notes
+--------------------
+
+This is a boxcar filter with decimation, the same as a first-order CIC
+filter: the raw integer values are summed and the sum is dumped every
+``factor`` frames. Each FIFO frame costs only integer additions, the
+scaling to m/s^2 and °/s is done once per output frame.
+
+**Software and Dependencies:**
+
+* Adafruit CircuitPython firmware for the supported boards:
+  https://circuitpython.org/downloads
+
+* makerclass_accelerometer
+
+"""
+
+# imports
+__version__ = "1.0.0"
+__repo__ = "https://github.com/makerclass/workshop"
+
+from array import array
+
+try:
+    from makerclass_accelerometer import MakerClassAccelerometer
+except ImportError:
+    pass
+
+
+class Decimator:
+    """Average every ``factor`` FIFO frames into one.
+
+    Configure the sensor to ``factor`` times the wanted rate with
+    `MakerClassAccelerometer.configure_odr`, which also picks the matching
+    hardware low pass filter.
+
+    :param int factor: Number of FIFO frames averaged into one output frame
+
+    .. code-block:: python
+
+        mpu.configure_odr(1000)  # sample at 1 kHz
+        mpu.start_fifo()
+        decimator = makerclass_decimator.Decimator(factor=50)  # 20 Hz output
+        while True:
+            for accel, gyro, temperature in decimator.frames(mpu):
+                print(accel, gyro)
+            time.sleep(0.02)
+    """
+
+    def __init__(self, factor: int) -> None:
+        if factor < 1:
+            raise ValueError("factor must be at least 1")
+        self.factor = factor
+        self._sums = array("l", [0] * 7)
+        self._count = 0
+        self.frames_in = 0
+        """Number of FIFO frames processed"""
+
+    def reset(self) -> None:
+        """Drop the partially averaged frame"""
+        for i in range(len(self._sums)):
+            self._sums[i] = 0
+        self._count = 0
+
+    def frames(self, sensor: "MakerClassAccelerometer"):
+        """Drain the sensor's FIFO and yield the averaged frames, oldest first.
+
+        Frames are ``(acceleration, gyro, temperature)`` like
+        `MakerClassAccelerometer.fifo_frames`. Leftover FIFO frames are kept
+        and completed by the next call. After a FIFO overflow the partial
+        frame is dropped, as it would average across the gap.
+        """
+        sums = self._sums
+        factor = self.factor
+        overflows = sensor.fifo_overflows
+        for raw in sensor.fifo_frames(raw=True):
+            words = len(raw)
+            for i in range(words):
+                sums[i] += raw[i]
+            self.frames_in += 1
+            self._count += 1
+            if self._count == factor:
+                average = [sums[i] / factor for i in range(words)]
+                self.reset()
+                yield sensor.scale_fifo_frame(average)
+        if sensor.fifo_overflows != overflows:
+            self.reset()
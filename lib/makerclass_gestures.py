@@ -0,0 +1,255 @@
+"""
+`makerclass_gestures`
+================================================================================
+
+MakerClass CircuitPython library for detecting gestures in MPU6050/MPU6500/MPU9250
+accelerometer data: single and double tap, shake, free fall and flipping the
+board over.
+
+* Author: MakerClass
+
+Implementation Notes
+--------------------
+
+`GestureDetector` is fed one accelerometer sample at a time and puts the
+detected gestures into an event queue, so the application only reacts to
+events instead of checking thresholds on raw values. Every sample costs a
+fixed number of comparisons, no history is stored.
+
+All durations are counted in samples, so the detector gives the same result
+whether samples come from a polling loop or in bursts from the sensor's FIFO.
+Set ``sample_rate`` to the rate the samples are taken at.
+
+**Software and Dependencies:**
+
+* Adafruit CircuitPython firmware for the supported boards:
+  https://circuitpython.org/downloads
+
+* makerclass_accelerometer
+
+"""
+
+# imports
+__version__ = "1.0.0"
+__repo__ = "https://github.com/makerclass/workshop"
+
+from array import array
+from collections import deque
+
+try:
+    from typing import Optional, Tuple
+    from makerclass_accelerometer import MakerClassAccelerometer
+except ImportError:
+    pass
+
+STANDARD_GRAVITY = 9.80665
+
+_FACE_UP = 1
+_FACE_DOWN = -1
+_FACE_THRESHOLD = 0.8  # g on Z to count as lying face up or down
+
+
+class Gesture:
+    """Gesture event types."""
+    TAP = 1         # One short knock
+    DOUBLE_TAP = 2  # Two knocks within double_tap_window
+    SHAKE = 3       # shake_count strong movements within shake_window
+    FREE_FALL = 4   # Falling, the sensor feels almost no gravity
+    FLIP = 5        # Turned from face up to face down or back
+
+    NAMES = {1: "TAP", 2: "DOUBLE_TAP", 3: "SHAKE", 4: "FREE_FALL", 5: "FLIP"}
+
+
+class GestureDetector:
+    """Streaming gesture detector for accelerometer samples.
+
+    Events are ``(gesture, sample)`` tuples, where ``gesture`` is a `Gesture`
+    value and ``sample`` the number of the sample that completed it.
+
+    :param float sample_rate: Rate of the samples in Hz. Defaults to 100
+    :param float tap_threshold: Change between two samples in g that counts
+        as a tap. Defaults to 1.0
+    :param float double_tap_window: Seconds after a tap in which a second tap
+        makes a double tap. A single tap is reported after this time.
+        Defaults to 0.4
+    :param float shake_threshold: Acceleration above gravity in g that counts
+        as a shake movement. Defaults to 1.0
+    :param int shake_count: Movements needed for a shake. Defaults to 4
+    :param float shake_window: Seconds in which the movements must happen.
+        Defaults to 1.0
+    :param float free_fall_threshold: Total acceleration in g below which the
+        board is falling. Defaults to 0.3
+    :param float free_fall_time: Seconds of falling before the event. Defaults to 0.08
+    :param float flip_time: Seconds the new side must stay up. Defaults to 0.3
+    :param int queue_size: Events kept until read, the oldest are dropped. Defaults to 16
+
+    .. code-block:: python
+
+        gestures = makerclass_gestures.GestureDetector(sample_rate=100)
+        while True:
+            gestures.update_from_sensor(mpu)
+            event = gestures.get()
+            if event:
+                print(makerclass_gestures.Gesture.NAMES[event[0]])
+            time.sleep(0.01)
+    """
+
+    def __init__(
+        self,
+        sample_rate: float = 100.0,
+        *,
+        tap_threshold: float = 1.0,
+        double_tap_window: float = 0.4,
+        shake_threshold: float = 1.0,
+        shake_count: int = 4,
+        shake_window: float = 1.0,
+        free_fall_threshold: float = 0.3,
+        free_fall_time: float = 0.08,
+        flip_time: float = 0.3,
+        queue_size: int = 16,
+    ) -> None:
+        self.sample_rate = sample_rate
+        # Thresholds are compared in m/s^2, squared where a magnitude is involved
+        self._tap_threshold = tap_threshold * STANDARD_GRAVITY
+        shake_limit = (1.0 + shake_threshold) * STANDARD_GRAVITY
+        self._shake_threshold_sq = shake_limit * shake_limit
+        free_fall_limit = free_fall_threshold * STANDARD_GRAVITY
+        self._free_fall_threshold_sq = free_fall_limit * free_fall_limit
+        self._face_threshold = _FACE_THRESHOLD * STANDARD_GRAVITY
+        self._double_tap_samples = self._samples(double_tap_window)
+        self._tap_refractory_samples = max(1, self._samples(0.05))
+        self._shake_count = shake_count
+        self._shake_samples = self._samples(shake_window)
+        self._free_fall_samples = max(1, self._samples(free_fall_time))
+        self._flip_samples = max(1, self._samples(flip_time))
+
+        self._events = deque((), queue_size)
+        self._sample = array("f", [0] * 3)
+        self.samples = 0
+        """Number of samples processed"""
+        self.reset()
+
+    def _samples(self, seconds: float) -> int:
+        return int(seconds * self.sample_rate + 0.5)
+
+    def reset(self) -> None:
+        """Forget the gesture state and all queued events"""
+        while self.get():
+            pass
+        self._previous = None
+        self._last_tap = None
+        self._tap_pending = False
+        self._shake_above = False
+        self._shake_movements = 0
+        self._shake_start = -self._shake_samples - 1
+        self._shaking = False
+        self._last_shake_movement = 0
+        self._falling = 0
+        self._fall_reported = False
+        self._face = 0
+        self._new_face = 0
+        self._new_face_samples = 0
+
+    def update(self, ax: float, ay: float, az: float) -> None:
+        """Feed one accelerometer sample in m/s^2"""
+        self.samples += 1
+        now = self.samples
+        magnitude_sq = ax * ax + ay * ay + az * az
+
+        # Tap: a sudden change between two samples, then a pause
+        previous = self._previous
+        if previous is None:
+            previous = self._previous = array("f", (ax, ay, az))
+        change = max(abs(ax - previous[0]), abs(ay - previous[1]), abs(az - previous[2]))
+        previous[0] = ax
+        previous[1] = ay
+        previous[2] = az
+        last_tap = self._last_tap
+        if change > self._tap_threshold and (last_tap is None or now - last_tap > self._tap_refractory_samples):
+            if self._tap_pending and now - last_tap <= self._double_tap_samples:
+                self._tap_pending = False
+                self._emit(Gesture.DOUBLE_TAP, now)
+            else:
+                self._tap_pending = True
+            self._last_tap = now
+        elif self._tap_pending and now - last_tap > self._double_tap_samples:
+            self._tap_pending = False
+            self._emit(Gesture.TAP, now)
+
+        # Shake: several strong movements within the shake window, reported
+        # once until the movements stop for a whole window
+        above = magnitude_sq > self._shake_threshold_sq
+        if above and not self._shake_above:
+            if now - self._shake_start > self._shake_samples:
+                self._shake_movements = 0
+                self._shake_start = now
+            self._shake_movements += 1
+            if self._shake_movements >= self._shake_count and not self._shaking:
+                self._shaking = True
+                self._tap_pending = False  # the movements were not taps
+                self._emit(Gesture.SHAKE, now)
+            self._last_shake_movement = now
+        elif self._shaking and now - self._last_shake_movement > self._shake_samples:
+            self._shaking = False
+            self._shake_movements = 0
+        self._shake_above = above
+
+        # Free fall: almost no acceleration for a while, reported once per fall
+        if magnitude_sq < self._free_fall_threshold_sq:
+            self._falling += 1
+            if self._falling >= self._free_fall_samples and not self._fall_reported:
+                self._fall_reported = True
+                self._emit(Gesture.FREE_FALL, now)
+        else:
+            self._falling = 0
+            self._fall_reported = False
+
+        # Flip: the side facing up changed and stayed
+        if az > self._face_threshold:
+            face = _FACE_UP
+        elif az < -self._face_threshold:
+            face = _FACE_DOWN
+        else:
+            face = 0
+        if face and face != self._face:
+            if face != self._new_face:
+                self._new_face = face
+                self._new_face_samples = 0
+            self._new_face_samples += 1
+            if self._new_face_samples >= self._flip_samples:
+                if self._face:
+                    self._emit(Gesture.FLIP, now)
+                self._face = face
+                self._new_face = 0
+        else:
+            self._new_face = 0
+
+    def update_from_sensor(self, sensor: "MakerClassAccelerometer") -> None:
+        """Read one sample with `MakerClassAccelerometer.read_accel_into` and feed it"""
+        sample = self._sample
+        sensor.read_accel_into(sample)
+        self.update(sample[0], sample[1], sample[2])
+
+    def update_from_fifo(self, sensor: "MakerClassAccelerometer") -> int:
+        """Feed all frames waiting in the sensor's FIFO, which must include the accelerometer.
+
+        :return: The number of frames processed
+        """
+        frames = 0
+        for accel, _, _ in sensor.fifo_frames():
+            self.update(accel[0], accel[1], accel[2])
+            frames += 1
+        return frames
+
+    def _emit(self, gesture: int, sample: int) -> None:
+        self._events.append((gesture, sample))
+
+    def get(self) -> Optional[Tuple[int, int]]:
+        """Take the oldest event from the queue.
+
+        :return: ``(gesture, sample)`` or `None` if there is no event
+        """
+        try:
+            return self._events.popleft()
+        except IndexError:
+            return None
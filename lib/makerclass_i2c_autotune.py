@@ -0,0 +1,247 @@
+"""
+`makerclass_i2c_autotune`
+================================================================================
+
+MakerClass CircuitPython library for finding the fastest I2C clock the
+connected devices and the wiring handle without errors.
+
+* Author: MakerClass
+
+`busio.I2C` runs at 100 kHz unless told otherwise, although the SSD1306,
+SHT40 and MPU sensors all work at 400 kHz, and on short wires often faster.
+A display refresh or a FIFO burst then takes several times longer than
+needed. How fast a bus really can go depends on wire length and pull-up
+resistors, so it is measured.
+
+Implementation Notes
+--------------------
+
+For each candidate frequency, slowest first, a new bus is created and every
+device is asked for its identity (see ``makerclass_i2c_discovery``) a number
+of times. NACKs, timeouts and wrong answers are counted. The first
+frequency with more errors than allowed, or without a single successful
+check, ends the search, and a bus at the fastest error-free frequency is
+returned. If no frequency passed, the bus runs at the slowest one.
+
+Only the transfers themselves are timed, not the waits between them (the
+SHT4x needs 10 ms to prepare its serial number), so `BusTest.throughput`
+shows how much faster the bus moves data at each frequency.
+
+**Software and Dependencies:**
+
+* Adafruit CircuitPython firmware for the supported boards:
+  https://circuitpython.org/downloads
+
+* makerclass_i2c_discovery
+
+"""
+
+# imports
+__version__ = "1.0.0"
+__repo__ = "https://github.com/makerclass/workshop"
+
+from time import monotonic_ns
+
+from makerclass_i2c_discovery import I2CRegistry
+
+try:
+    from errno import ETIMEDOUT
+except ImportError:
+    ETIMEDOUT = 110
+
+try:
+    from typing import Callable, List, Optional, Tuple
+    from busio import I2C
+    from microcontroller import Pin
+    from makerclass_i2c_discovery import Device
+except ImportError:
+    pass
+
+FREQUENCIES = (100_000, 400_000, 800_000, 1_000_000)
+"""Frequencies tried by `autotune` by default, in Hz"""
+
+
+class BusTest:
+    """Result of `test_bus` at one frequency."""
+
+    def __init__(self, frequency: int) -> None:
+        self.frequency = frequency
+        """Bus clock in Hz"""
+        self.rounds = 0
+        """Number of times every device was checked"""
+        self.transfers = 0
+        """Number of identity checks"""
+        self.errors = 0
+        """Checks that ended with a NACK or another bus error"""
+        self.timeouts = 0
+        """Checks that timed out, e.g. a device holding SCL low"""
+        self.mismatches = 0
+        """Checks answered with wrong data"""
+        self.seconds = 0.0
+        """Time spent in transfers"""
+        self.bytes = 0
+        """Bytes moved by the transfers, without the address bytes"""
+
+    @property
+    def successes(self) -> int:
+        """Checks answered correctly"""
+        return self.transfers - self.errors - self.timeouts - self.mismatches
+
+    @property
+    def error_rate(self) -> float:
+        """Failed checks as a fraction of all checks"""
+        if not self.transfers:
+            return 0.0
+        return (self.errors + self.timeouts + self.mismatches) / self.transfers
+
+    @property
+    def throughput(self) -> float:
+        """Bytes per second while transferring"""
+        if not self.seconds:
+            return 0.0
+        return self.bytes / self.seconds
+
+
+class _TimedI2C:
+    # Sums up the time and bytes of the transfers, everything else is passed to the bus
+
+    def __init__(self, i2c: "I2C") -> None:
+        self.i2c = i2c
+        self.ns = 0
+        self.bytes = 0
+
+    def __getattr__(self, name: str):
+        return getattr(self.i2c, name)
+
+    def writeto(self, address: int, buffer, **kwargs) -> None:
+        start = monotonic_ns()
+        try:
+            self.i2c.writeto(address, buffer, **kwargs)
+        finally:
+            self.ns += monotonic_ns() - start
+        self.bytes += len(buffer)
+
+    def readfrom_into(self, address: int, buffer, **kwargs) -> None:
+        start = monotonic_ns()
+        try:
+            self.i2c.readfrom_into(address, buffer, **kwargs)
+        finally:
+            self.ns += monotonic_ns() - start
+        self.bytes += len(buffer)
+
+    def writeto_then_readfrom(self, address: int, buffer_out, buffer_in, **kwargs) -> None:
+        start = monotonic_ns()
+        try:
+            self.i2c.writeto_then_readfrom(address, buffer_out, buffer_in, **kwargs)
+        finally:
+            self.ns += monotonic_ns() - start
+        self.bytes += len(buffer_out) + len(buffer_in)
+
+
+def test_bus(i2c: "I2C", devices: "List[Device]", frequency: int, rounds: int = 20) -> BusTest:
+    """Check every device ``rounds`` times and count the failures.
+
+    :param ~busio.I2C i2c: The bus, not locked
+    :param devices: Devices from ``makerclass_i2c_discovery.I2CRegistry``
+    :param int frequency: Frequency of ``i2c`` in Hz, for the result
+    :param int rounds: How many times to check every device. Defaults to 20
+    """
+    timed = _TimedI2C(i2c)
+    registry = I2CRegistry(timed, cache=False)
+    result = BusTest(frequency)
+    for _ in range(rounds):
+        for device in devices:
+            result.transfers += 1
+            try:
+                if not registry.verify(device):
+                    result.mismatches += 1
+            except OSError as error:
+                if error.errno == ETIMEDOUT:
+                    result.timeouts += 1
+                else:
+                    result.errors += 1
+        result.rounds += 1
+    result.seconds = timed.ns / 1_000_000_000
+    result.bytes = timed.bytes
+    return result
+
+
+def autotune(
+    scl: "Pin",
+    sda: "Pin",
+    *,
+    frequencies=FREQUENCIES,
+    rounds: int = 20,
+    max_error_rate: float = 0.0,
+    devices: "Optional[List[Device]]" = None,
+    bus_factory: "Optional[Callable[[int], I2C]]" = None,
+) -> "Tuple[I2C, int, List[BusTest]]":
+    """Measure the bus at each frequency and return a bus at the fastest
+    frequency that worked.
+
+    Run it with all devices connected, then use the returned bus like one
+    from `busio.I2C`. To save the test at start-up, note the frequency and
+    pass it to `busio.I2C` directly.
+
+    .. code-block:: python
+
+        i2c, frequency, results = makerclass_i2c_autotune.autotune(board.GP17, board.GP16)
+        print(makerclass_i2c_autotune.report(results))
+
+    :param ~microcontroller.Pin scl: The clock pin
+    :param ~microcontroller.Pin sda: The data pin
+    :param frequencies: Candidate frequencies in Hz, those the port doesn't
+        support are skipped. Defaults to `FREQUENCIES`
+    :param int rounds: Checks of every device per frequency. Defaults to 20
+    :param float max_error_rate: Failed checks allowed, as a fraction. Defaults to 0
+    :param devices: Devices to check. Defaults to the result of
+        ``I2CRegistry.discover`` at the slowest supported frequency
+    :param bus_factory: Function creating a bus for a frequency, defaults to
+        `busio.I2C` on ``scl`` and ``sda``
+    :return: The bus, its frequency in Hz and the `BusTest` of each frequency
+        tried. Without any successful check, e.g. when no device answers, the
+        bus runs at the slowest supported frequency
+    :raises ValueError: If the port supports none of the frequencies
+    """
+    if bus_factory is None:
+        import busio  # pylint: disable=import-outside-toplevel
+
+        def bus_factory(frequency):
+            return busio.I2C(scl, sda, frequency=frequency)
+
+    results = []
+    slowest = None
+    best = None
+    for frequency in sorted(frequencies):
+        try:
+            i2c = bus_factory(frequency)
+        except ValueError:
+            continue  # not supported by the port
+        try:
+            if slowest is None:
+                slowest = frequency
+                if devices is None:
+                    devices = list(I2CRegistry(i2c).discover().values())
+            result = test_bus(i2c, devices, frequency, rounds)
+        finally:
+            i2c.deinit()
+        results.append(result)
+        if not result.successes or result.error_rate > max_error_rate:
+            break
+        best = frequency
+    if slowest is None:
+        raise ValueError("None of the frequencies is supported")
+    if best is None:
+        best = slowest
+    return bus_factory(best), best, results
+
+
+def report(results: "List[BusTest]") -> str:
+    """The results of `autotune` as a table"""
+    lines = ["    kHz  checks errors timeouts wrong   bytes/s"]
+    for result in results:
+        lines.append(
+            f"{result.frequency // 1000:7d} {result.transfers:7d} {result.errors:6d} "
+            f"{result.timeouts:8d} {result.mismatches:5d} {result.throughput:9.0f}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,276 @@
+"""
+`makerclass_i2c_discovery`
+================================================================================
+
+MakerClass CircuitPython library for finding out which devices are connected
+to an I2C bus, confirmed by their ID registers, with the result cached in
+``microcontroller.nvm`` for a fast start.
+
+* Author: MakerClass
+
+Implementation Notes
+--------------------
+
+An address alone doesn't say what is connected, 0x68 is an MPU6050 as well
+as a DS3231 clock. Every known device type is checked by reading something
+only that chip answers with:
+
+* MPU6050/MPU6500/MPU9250: the WHO_AM_I register
+* SHT4x: the serial number, checked by its CRC
+* SSD1306: the status byte
+* BME280/BMP280: the chip ID register
+
+Addresses without a known type are listed as ``"unknown"``.
+
+`I2CRegistry.discover` first tries the devices stored by the previous scan and
+only checks those addresses again. If all of them still answer with the same
+identity, the full scan is skipped. Devices added since are only found by a
+new `I2CRegistry.scan`.
+
+**Software and Dependencies:**
+
+* Adafruit CircuitPython firmware for the supported boards:
+  https://circuitpython.org/downloads
+
+* makerclass_nvm
+
+"""
+
+# imports
+__version__ = "1.0.0"
+__repo__ = "https://github.com/makerclass/workshop"
+
+from struct import pack_into, unpack_from
+from time import sleep
+
+import makerclass_nvm
+
+try:
+    from typing import Dict, Optional
+    from busio import I2C
+except ImportError:
+    pass
+
+# Device cache in microcontroller.nvm, see makerclass_nvm for the layout
+_NVM_DISCOVERY_OFFSET = makerclass_nvm.DISCOVERY_OFFSET
+_NVM_DISCOVERY_SIZE = makerclass_nvm.DISCOVERY_SIZE
+_DISCOVERY_MAGIC = b"MI"
+_DISCOVERY_VERSION = 1
+_HEADER_FORMAT = "<2sBB"  # magic, version, device count
+_HEADER_SIZE = 4
+_ENTRY_FORMAT = "<BBI"    # address, type index, identity
+_ENTRY_SIZE = 6
+_MAX_DEVICES = (_NVM_DISCOVERY_SIZE - _HEADER_SIZE) // _ENTRY_SIZE
+
+_MPU_WHO_AM_I = 0x75
+_SHT4X_READ_SERIAL = 0x89
+_BMX280_CHIP_ID = 0xD0
+
+
+def _crc8(data) -> int:
+    # Sensirion CRC-8, polynomial 0x31, initial value 0xFF
+    crc = 0xFF
+    for byte in data:
+        crc ^= byte
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x31) & 0xFF if crc & 0x80 else (crc << 1) & 0xFF
+    return crc
+
+
+def _identify_mpu(i2c: "I2C", address: int) -> Optional[int]:
+    buf = bytearray(1)
+    i2c.writeto_then_readfrom(address, bytes((_MPU_WHO_AM_I,)), buf)
+    return buf[0] if buf[0] in (0x68, 0x70, 0x71) else None
+
+
+def _identify_sht4x(i2c: "I2C", address: int) -> Optional[int]:
+    buf = bytearray(6)
+    i2c.writeto(address, bytes((_SHT4X_READ_SERIAL,)))
+    sleep(0.01)
+    i2c.readfrom_into(address, buf)
+    if _crc8(buf[0:2]) != buf[2] or _crc8(buf[3:5]) != buf[5]:
+        return None
+    return (buf[0] << 24) | (buf[1] << 16) | (buf[3] << 8) | buf[4]
+
+
+def _identify_ssd1306(i2c: "I2C", address: int) -> Optional[int]:
+    buf = bytearray(1)
+    i2c.readfrom_into(address, buf)
+    if buf[0] & 0x80:
+        return None
+    return buf[0] & 0x3F  # bit 6 only says whether the display is on
+
+
+def _identify_bmx280(i2c: "I2C", address: int) -> Optional[int]:
+    buf = bytearray(1)
+    i2c.writeto_then_readfrom(address, bytes((_BMX280_CHIP_ID,)), buf)
+    return buf[0] if buf[0] in (0x58, 0x60) else None
+
+
+# Known device types: (name, addresses, identify, names by identity).
+# The index is stored in NVM, append new types at the end.
+_TYPES = (
+    ("unknown", (), None, None),
+    ("MPU", (0x68, 0x69), _identify_mpu, {0x68: "MPU6050", 0x70: "MPU6500", 0x71: "MPU9250"}),
+    ("SHT4x", (0x44, 0x45, 0x46), _identify_sht4x, None),
+    ("SSD1306", (0x3C, 0x3D), _identify_ssd1306, None),
+    ("BMx280", (0x76, 0x77), _identify_bmx280, {0x58: "BMP280", 0x60: "BME280"}),
+)
+
+
+class Device:
+    """A device found on the bus.
+
+    :param int address: I2C address
+    :param int kind: Index of the device type
+    :param int identity: What the chip answered to identification, e.g. the
+        WHO_AM_I value or the SHT4x serial number. 0 for unknown devices
+    """
+
+    def __init__(self, address: int, kind: int, identity: int) -> None:
+        self.address = address
+        self.kind = kind
+        self.identity = identity
+
+    @property
+    def name(self) -> str:
+        """Chip name, e.g. ``"MPU6500"``, or ``"unknown"``"""
+        kind_name, _, _, names = _TYPES[self.kind]
+        if names:
+            return names.get(self.identity, kind_name)
+        return kind_name
+
+    def __repr__(self) -> str:
+        return f"<Device 0x{self.address:02X} {self.name} 0x{self.identity:X}>"
+
+
+class I2CRegistry:
+    """Devices on an I2C bus, identified and cached in NVM.
+
+    :param ~busio.I2C i2c: The I2C bus, not locked
+    :param bool cache: Read and write the NVM cache. Defaults to `True`
+
+    .. code-block:: python
+
+        registry = makerclass_i2c_discovery.I2CRegistry(i2c)
+        registry.discover()
+        mpu_address = registry.find("MPU")
+    """
+
+    def __init__(self, i2c: "I2C", cache: bool = True) -> None:
+        self.i2c = i2c
+        self.cache = cache
+        self.devices = {}  # type: Dict[int, Device]
+        """Found devices by address"""
+        self.from_cache = False
+        """`True` if the last `discover` confirmed the cached devices instead of scanning"""
+
+    def _lock(self) -> None:
+        while not self.i2c.try_lock():
+            pass
+
+    def _identify(self, address: int) -> Device:
+        for kind, (_, addresses, identify, _) in enumerate(_TYPES):
+            if address in addresses:
+                try:
+                    identity = identify(self.i2c, address)
+                except OSError:
+                    continue
+                if identity is not None:
+                    return Device(address, kind, identity)
+        return Device(address, 0, 0)
+
+    def _check(self, device: Device) -> bool:
+        if device.kind == 0:
+            self.i2c.writeto(device.address, b"")
+            return True
+        return _TYPES[device.kind][2](self.i2c, device.address) == device.identity
+
+    def verify(self, device: Device) -> bool:
+        """Check that ``device`` still answers with the same identity.
+
+        :return: `False` if a different chip answered
+        :raises OSError: If the device did not answer
+        """
+        self._lock()
+        try:
+            return self._check(device)
+        finally:
+            self.i2c.unlock()
+
+    def _confirm(self, device: Device) -> bool:
+        try:
+            return self._check(device)
+        except OSError:
+            return False
+
+    def scan(self) -> Dict[int, Device]:
+        """Probe all addresses, identify the devices and store them in NVM.
+
+        :return: `devices`
+        """
+        self._lock()
+        try:
+            self.devices = {address: self._identify(address) for address in self.i2c.scan()}
+        finally:
+            self.i2c.unlock()
+        self.from_cache = False
+        if self.cache:
+            self._save()
+        return self.devices
+
+    def discover(self) -> Dict[int, Device]:
+        """Confirm the devices cached by the last `scan`, or `scan` if any
+        of them is missing or answers differently.
+
+        :return: `devices`
+        """
+        cached = self._load() if self.cache else None
+        if cached:
+            self._lock()
+            try:
+                confirmed = all(self._confirm(device) for device in cached.values())
+            finally:
+                self.i2c.unlock()
+            if confirmed:
+                self.devices = cached
+                self.from_cache = True
+                return cached
+        return self.scan()
+
+    def find(self, name: str) -> Optional[int]:
+        """Address of the first device whose type or chip name is ``name``,
+        e.g. ``"MPU"``, ``"MPU6500"`` or ``"SSD1306"``, `None` if there is none"""
+        for address in sorted(self.devices):
+            device = self.devices[address]
+            if name in (_TYPES[device.kind][0], device.name):
+                return address
+        return None
+
+    def _save(self) -> None:
+        nvm = makerclass_nvm.nvm()
+        if nvm is None:
+            return
+        devices = [self.devices[address] for address in sorted(self.devices)][:_MAX_DEVICES]
+        record = bytearray(_HEADER_SIZE + _ENTRY_SIZE * len(devices))
+        pack_into(_HEADER_FORMAT, record, 0, _DISCOVERY_MAGIC, _DISCOVERY_VERSION, len(devices))
+        for i, device in enumerate(devices):
+            pack_into(_ENTRY_FORMAT, record, _HEADER_SIZE + i * _ENTRY_SIZE, device.address, device.kind, device.identity)
+        if nvm[_NVM_DISCOVERY_OFFSET:_NVM_DISCOVERY_OFFSET + len(record)] != record:
+            nvm[_NVM_DISCOVERY_OFFSET:_NVM_DISCOVERY_OFFSET + len(record)] = record
+
+    def _load(self) -> Optional[Dict[int, Device]]:
+        nvm = makerclass_nvm.nvm()
+        if nvm is None:
+            return None
+        record = nvm[_NVM_DISCOVERY_OFFSET:_NVM_DISCOVERY_OFFSET + _NVM_DISCOVERY_SIZE]
+        magic, version, count = unpack_from(_HEADER_FORMAT, record)
+        if magic != _DISCOVERY_MAGIC or version != _DISCOVERY_VERSION or not 0 < count <= _MAX_DEVICES:
+            return None
+        devices = {}
+        for i in range(count):
+            address, kind, identity = unpack_from(_ENTRY_FORMAT, record, _HEADER_SIZE + i * _ENTRY_SIZE)
+            if kind >= len(_TYPES):
+                return None
+            devices[address] = Device(address, kind, identity)
+        return devices
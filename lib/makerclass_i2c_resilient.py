@@ -0,0 +1,310 @@
+"""
+`makerclass_i2c_resilient`
+================================================================================
+
+MakerClass CircuitPython library for an I2C bus that survives glitches:
+failed transfers are retried, devices that keep failing are skipped for a
+while and a stuck bus is freed and started again.
+
+* Author: MakerClass
+
+A loose wire or interference on the shared I2C lines makes a single read
+raise `OSError`, and a program without ``try``/``except`` stops. Worse, a
+device interrupted in the middle of a byte can keep holding SDA low, and
+then no transfer works until the power is cycled.
+
+Implementation Notes
+--------------------
+
+`ResilientI2C` creates the `busio.I2C` itself and behaves like it, so it can
+be passed to any driver. Every transfer is tried up to ``retries`` more
+times, waiting ``backoff`` seconds before the first retry and twice as long
+before each next one.
+
+When a transfer still fails, the device's failure count grows. After
+``failure_threshold`` failures in a row the device's circuit opens: its
+transfers fail at once for ``open_time`` seconds, without spending bus time,
+so one dead sensor doesn't slow down the others. Then one transfer is let
+through and closes the circuit again if it works.
+
+After a timeout, or ``recover_after`` bus errors (``EIO``) in a row on any
+devices, the bus is recovered: `busio.I2C` is released, SCL is clocked by
+`digitalio` until the device holding SDA lets go, a STOP condition is sent
+and a new `busio.I2C` is created. If even that fails, because a device still
+holds a line low, the next transfer tries again. A device that doesn't
+answer its address (``ENODEV``), e.g. because it was unplugged, only counts
+towards its own circuit, the bus itself is fine.
+
+``displayio.I2CDisplay`` only accepts a real `busio.I2C`, pass it
+`ResilientI2C.i2c`. It would keep refreshing over the old bus while it is
+released, so release the display in ``before_recover``, which runs before
+the old bus is touched. Both hooks run in the middle of a driver's transfer,
+with the bus locked, and creating a display there would wait for the lock
+forever: note the recovery in ``on_recover`` and create the display again
+from the main loop.
+
+**Software and Dependencies:**
+
+* Adafruit CircuitPython firmware for the supported boards:
+  https://circuitpython.org/downloads
+
+"""
+
+# imports
+__version__ = "1.0.0"
+__repo__ = "https://github.com/makerclass/workshop"
+
+from time import monotonic_ns, sleep
+
+try:
+    from errno import EIO, ETIMEDOUT
+except ImportError:
+    EIO = 5
+    ETIMEDOUT = 110
+
+try:
+    from typing import Callable, Dict, List, Optional
+    from busio import I2C
+    from microcontroller import Pin
+except ImportError:
+    pass
+
+_CLOCK_PULSES = 9  # a device can be in the middle of at most 8 data bits and an ACK
+
+
+def clear_bus(scl: "Pin", sda: "Pin") -> bool:
+    """Free a bus held by a device that was interrupted in the middle of a byte.
+
+    The pins must not be in use by `busio.I2C`. SCL is pulsed until the device
+    releases SDA, at most 9 times, and a STOP condition ends the transfer.
+
+    :return: `True` if SDA is high, so the bus is free
+    """
+    import digitalio  # pylint: disable=import-outside-toplevel
+
+    scl_pin = digitalio.DigitalInOut(scl)
+    sda_pin = digitalio.DigitalInOut(sda)
+    try:
+        sda_pin.switch_to_input(pull=digitalio.Pull.UP)
+        scl_pin.switch_to_output(value=True, drive_mode=digitalio.DriveMode.OPEN_DRAIN)
+        for _ in range(_CLOCK_PULSES):
+            if sda_pin.value:
+                break
+            scl_pin.value = False
+            scl_pin.value = True
+        # STOP: SDA goes high while SCL is high
+        scl_pin.value = False
+        sda_pin.switch_to_output(value=False, drive_mode=digitalio.DriveMode.OPEN_DRAIN)
+        scl_pin.value = True
+        sda_pin.value = True
+        sda_pin.switch_to_input(pull=digitalio.Pull.UP)
+        return sda_pin.value
+    finally:
+        scl_pin.deinit()
+        sda_pin.deinit()
+
+
+class ResilientI2C:
+    """A `busio.I2C` with retries, per-device circuit breakers and bus recovery.
+
+    :param ~microcontroller.Pin scl: The clock pin
+    :param ~microcontroller.Pin sda: The data pin
+    :param int frequency: Bus clock in Hz. Defaults to 100 kHz
+    :param int retries: Extra attempts of a failed transfer. Defaults to 2
+    :param float backoff: Seconds before the first retry, doubled for every
+        next one. Defaults to 0.001
+    :param float max_backoff: Longest wait between retries. Defaults to 0.05
+    :param int failure_threshold: Failed transfers in a row that open the
+        device's circuit. Defaults to 5
+    :param float open_time: Seconds the circuit stays open. Defaults to 5
+    :param int recover_after: Failed transfers in a row with a bus error
+        (``EIO``), on any devices, that trigger `recover`. Defaults to 3
+    :param before_recover: Called with this bus before `recover` releases the
+        old bus, e.g. to release the display
+    :param on_recover: Called with this bus once `recover` created the new
+        bus, e.g. to note that the display has to be set up again. The bus
+        may be locked by the driver whose transfer failed
+    :param bus_factory: Function creating the bus for a frequency, defaults
+        to `busio.I2C` on ``scl`` and ``sda``. With ``scl`` `None`, e.g. for
+        ``tools/mpu_simulator.py``, `recover` skips clocking out SDA
+
+    .. code-block:: python
+
+        i2c = makerclass_i2c_resilient.ResilientI2C(board.GP17, board.GP16)
+        sht = adafruit_sht4x.SHT4x(i2c)
+        while True:
+            try:
+                print(sht.temperature)
+            except OSError:
+                pass  # the sensor is skipped for now, the loop goes on
+    """
+
+    def __init__(
+        self,
+        scl: "Pin",
+        sda: "Pin",
+        frequency: int = 100_000,
+        *,
+        retries: int = 2,
+        backoff: float = 0.001,
+        max_backoff: float = 0.05,
+        failure_threshold: int = 5,
+        open_time: float = 5.0,
+        recover_after: int = 3,
+        before_recover: "Optional[Callable[[ResilientI2C], None]]" = None,
+        on_recover: "Optional[Callable[[ResilientI2C], None]]" = None,
+        bus_factory: "Optional[Callable[[int], I2C]]" = None,
+    ) -> None:
+        self.scl = scl
+        self.sda = sda
+        self.frequency = frequency
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.failure_threshold = failure_threshold
+        self._open_time_ns = int(open_time * 1_000_000_000)
+        self.recover_after = recover_after
+        self.before_recover = before_recover
+        self.on_recover = on_recover
+        if bus_factory is None:
+            import busio  # pylint: disable=import-outside-toplevel
+
+            def bus_factory(frequency):
+                return busio.I2C(scl, sda, frequency=frequency)
+
+        self._bus_factory = bus_factory
+        self._locked = False
+        self._failures = {}  # type: Dict[int, List[int]]  # address: [failures in a row, open until ns]
+        self._bus_failures = 0
+        self.retried = 0
+        """Number of retries that were needed"""
+        self.failed = 0
+        """Number of transfers that failed after all retries"""
+        self.rejected = 0
+        """Number of transfers refused because the device's circuit was open"""
+        self.recoveries = 0
+        """Number of times the bus was recovered"""
+        self.i2c = bus_factory(frequency)
+        """The `busio.I2C` in use, replaced by `recover`. Pass it to ``displayio.I2CDisplay``"""
+
+    def __enter__(self) -> "ResilientI2C":
+        return self
+
+    def __exit__(self, exception_type, exception_value, traceback) -> None:
+        self.deinit()
+
+    def deinit(self) -> None:
+        """Release the bus"""
+        if self.i2c is not None:
+            self.i2c.deinit()
+            self.i2c = None
+
+    def _bus(self) -> "I2C":
+        if self.i2c is None:
+            try:
+                self.recover()
+            except RuntimeError:
+                raise OSError(5, "I2C bus not available")
+        return self.i2c
+
+    def try_lock(self) -> bool:
+        """Lock the bus, see `busio.I2C.try_lock`"""
+        self._locked = self._bus().try_lock()
+        return self._locked
+
+    def unlock(self) -> None:
+        """Unlock the bus"""
+        self._locked = False
+        if self.i2c is not None:
+            self.i2c.unlock()
+
+    def scan(self) -> "List[int]":
+        """Addresses that answer, see `busio.I2C.scan`"""
+        return self._bus().scan()
+
+    def is_open(self, address: int) -> bool:
+        """`True` while transfers to ``address`` are refused after repeated failures"""
+        state = self._failures.get(address)
+        return state is not None and monotonic_ns() < state[1]
+
+    def recover(self) -> bool:
+        """Release the bus, clock out a device holding SDA and create a new bus.
+
+        Called automatically after a timeout or ``recover_after`` bus errors,
+        the bus stays locked if it was.
+
+        :return: `True` if SDA was free afterwards
+        :raises RuntimeError: If the new bus can't be created, e.g. a line is
+            still held low
+        """
+        self.recoveries += 1
+        if self.i2c is not None:
+            if self.before_recover:
+                self.before_recover(self)
+            self.i2c.deinit()
+            self.i2c = None
+        free = self.scl is not None and clear_bus(self.scl, self.sda)
+        self.i2c = self._bus_factory(self.frequency)
+        if self._locked:
+            while not self.i2c.try_lock():
+                pass
+        self._bus_failures = 0
+        if self.on_recover:
+            self.on_recover(self)
+        return free
+
+    def _transfer(self, address: int, function, *args, **kwargs) -> None:
+        state = self._failures.get(address)
+        if state is not None and state[1]:
+            if monotonic_ns() < state[1]:
+                self.rejected += 1
+                raise OSError(5, "Device skipped after repeated failures")
+            state[1] = 0  # let one transfer through to test the device
+
+        i2c = self._bus()
+        delay = self.backoff
+        attempt = 0
+        while True:
+            try:
+                getattr(i2c, function)(address, *args, **kwargs)
+                break
+            except OSError as error:
+                if error.errno == ETIMEDOUT or attempt == self.retries:
+                    self._failed(address, error)
+                    raise
+            attempt += 1
+            self.retried += 1
+            sleep(delay)
+            delay = min(delay * 2, self.max_backoff)
+        if state is not None:
+            del self._failures[address]
+        self._bus_failures = 0
+
+    def _failed(self, address: int, error: OSError) -> None:
+        self.failed += 1
+        state = self._failures.get(address)
+        if state is None:
+            state = self._failures[address] = [0, 0]
+        state[0] += 1
+        if state[0] >= self.failure_threshold:
+            state[1] = monotonic_ns() + self._open_time_ns
+        if error.errno not in (EIO, ETIMEDOUT):
+            return  # the device didn't answer, the bus is fine
+        self._bus_failures += 1
+        if error.errno == ETIMEDOUT or self._bus_failures >= self.recover_after:
+            try:
+                self.recover()
+            except RuntimeError:
+                pass  # tried again by the next transfer
+
+    def writeto(self, address: int, buffer, **kwargs) -> None:
+        """Write to a device, see `busio.I2C.writeto`"""
+        self._transfer(address, "writeto", buffer, **kwargs)
+
+    def readfrom_into(self, address: int, buffer, **kwargs) -> None:
+        """Read from a device, see `busio.I2C.readfrom_into`"""
+        self._transfer(address, "readfrom_into", buffer, **kwargs)
+
+    def writeto_then_readfrom(self, address: int, buffer_out, buffer_in, **kwargs) -> None:
+        """Write then read with a repeated start, see `busio.I2C.writeto_then_readfrom`"""
+        self._transfer(address, "writeto_then_readfrom", buffer_out, buffer_in, **kwargs)
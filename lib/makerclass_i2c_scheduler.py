@@ -0,0 +1,245 @@
+"""
+`makerclass_i2c_scheduler`
+================================================================================
+
+MakerClass CircuitPython library for sharing one I2C bus between devices that
+need it at different rates, e.g. an MPU sensor read 100 times a second and an
+SSD1306 display refreshed a few times a second.
+
+* Author: MakerClass
+
+Implementation Notes
+--------------------
+
+Each device gets a job with a period and a priority. The scheduler runs due
+jobs highest priority first; jobs due at the same time run back to back in
+one slot, and the scheduler sleeps until the next job is due.
+
+A job that takes long, like updating a display, can be written as a
+generator that ``yield``s between chunks of work (one label, one refresh).
+Between its chunks the scheduler runs any higher-priority job that became
+due, so a fast sensor read is not held up by the whole display update. A
+lower-priority chunk is also not started if, by its measured duration, it
+would still be running when a higher-priority job is due.
+
+This is cooperative: a single call, e.g. ``display.refresh()``, can't be
+interrupted. The bus lock is left to the device drivers, which take it for
+every transaction.
+
+Every job keeps statistics of how late it started (latency) and how long it
+ran, see `Job` and `I2CScheduler.report`.
+
+**Software and Dependencies:**
+
+* Adafruit CircuitPython firmware for the supported boards:
+  https://circuitpython.org/downloads
+
+"""
+
+# imports
+__version__ = "1.0.0"
+__repo__ = "https://github.com/makerclass/workshop"
+
+from time import monotonic_ns, sleep
+
+try:
+    from typing import Callable, List, Optional
+except ImportError:
+    pass
+
+# Weight of the newest chunk in the average chunk duration
+_DURATION_WEIGHT = 0.25
+
+
+class Job:
+    """A periodic piece of bus work, created by `I2CScheduler.add`.
+
+    The statistics are counted since the last `I2CScheduler.reset_stats`.
+    """
+
+    def __init__(self, name: str, callback: "Callable", period: float, priority: int) -> None:
+        self.name = name
+        self.callback = callback
+        self.period = period
+        self.priority = priority
+        self._period_ns = int(period * 1_000_000_000)
+        self._due_ns = 0
+        self._task = None  # running generator
+        self._duration_ns = 0  # average of one chunk
+        self._waiting = False  # held back for a higher-priority job
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        """Zero the statistics"""
+        self.runs = 0
+        """Number of completed runs"""
+        self.chunks = 0
+        """Number of chunks run, one per `yield` plus one"""
+        self.late = 0
+        """Number of runs that ended after the next run was already due, that run is skipped"""
+        self.deferred = 0
+        """Number of chunks that waited for a higher-priority job"""
+        self._latency_total_ns = 0
+        self._max_latency_ns = 0
+        self._max_duration_ns = 0
+
+    @property
+    def latency(self) -> float:
+        """Average time in seconds between a run being due and starting"""
+        if not self.runs:
+            return 0.0
+        return self._latency_total_ns / self.runs / 1_000_000_000
+
+    @property
+    def max_latency(self) -> float:
+        """Longest time in seconds between a run being due and starting"""
+        return self._max_latency_ns / 1_000_000_000
+
+    @property
+    def duration(self) -> float:
+        """Average duration of one chunk in seconds"""
+        return self._duration_ns / 1_000_000_000
+
+    @property
+    def max_duration(self) -> float:
+        """Longest chunk in seconds"""
+        return self._max_duration_ns / 1_000_000_000
+
+
+class I2CScheduler:
+    """Run periodic bus jobs by priority.
+
+    .. code-block:: python
+
+        scheduler = makerclass_i2c_scheduler.I2CScheduler()
+        scheduler.add("mpu", read_mpu, period=0.01, priority=2)
+        scheduler.add("oled", update_display, period=0.2, priority=1)
+        scheduler.run()
+    """
+
+    def __init__(self) -> None:
+        self.jobs = []  # type: List[Job]
+        """All jobs, highest priority first"""
+
+    def add(self, name: str, callback: "Callable", period: float, priority: int = 0) -> Job:
+        """Add a job.
+
+        :param str name: Name for `report`
+        :param callback: Function called without arguments. If it is a
+            generator function, every ``yield`` ends a chunk and lets
+            higher-priority jobs run
+        :param float period: Seconds between the starts of two runs
+        :param int priority: Higher runs first. Defaults to 0
+        :return: The `Job` with its statistics
+        """
+        job = Job(name, callback, period, priority)
+        job._due_ns = monotonic_ns()  # pylint: disable=protected-access
+        self.jobs.append(job)
+        self.jobs.sort(key=lambda job: job.priority, reverse=True)
+        return job
+
+    def remove(self, job: Job) -> None:
+        """Stop running ``job``"""
+        self.jobs.remove(job)
+
+    def _blocks(self, job: Job, now: int) -> bool:
+        # A chunk of job would overlap a higher-priority job becoming due.
+        # Once a whole period overdue it runs anyway, so it can't starve.
+        # pylint: disable=protected-access
+        if now - job._due_ns >= job._period_ns:
+            return False
+        end = now + job._duration_ns
+        for other in self.jobs:
+            if other.priority <= job.priority:
+                return False
+            if other._due_ns < end:
+                return True
+        return False
+
+    def run_once(self, wait: bool = True) -> Optional[Job]:
+        """Run one chunk of the most important due job.
+
+        :param bool wait: Sleep until a job is due if none is. Defaults to `True`
+        :return: The job that ran, or `None`
+        """
+        # pylint: disable=protected-access
+        now = monotonic_ns()
+        job = None
+        for candidate in self.jobs:
+            if candidate._task is not None or candidate._due_ns <= now:
+                if self._blocks(candidate, now):
+                    if not candidate._waiting:
+                        candidate._waiting = True
+                        candidate.deferred += 1
+                    continue
+                job = candidate
+                break
+        if job is None:
+            if wait:
+                # Sleep until the next job is due, that also unblocks waiting jobs
+                upcoming = [candidate._due_ns for candidate in self.jobs if candidate._due_ns > now]
+                if upcoming:
+                    sleep((min(upcoming) - now) / 1_000_000_000)
+            return None
+        job._waiting = False
+
+        if job._task is None:
+            latency = now - job._due_ns
+            job._latency_total_ns += latency
+            if latency > job._max_latency_ns:
+                job._max_latency_ns = latency
+            result = job.callback()
+            done = not hasattr(result, "send")
+            if not done:
+                job._task = result
+        else:
+            done = False
+        if not done:
+            try:
+                next(job._task)
+            except StopIteration:
+                done = True
+
+        end = monotonic_ns()
+        duration = end - now
+        if job._duration_ns:
+            job._duration_ns += int((duration - job._duration_ns) * _DURATION_WEIGHT)
+        else:
+            job._duration_ns = duration
+        if duration > job._max_duration_ns:
+            job._max_duration_ns = duration
+        job.chunks += 1
+        if done:
+            job._task = None
+            job.runs += 1
+            job._due_ns += job._period_ns
+            if job._due_ns <= end:
+                # Too late for the next run as well, don't try to catch up
+                job.late += 1
+                job._due_ns = end + job._period_ns
+        return job
+
+    def run(self, duration: float = None) -> None:
+        """Run the jobs, forever or for ``duration`` seconds"""
+        if duration is None:
+            while True:
+                self.run_once()
+        end = monotonic_ns() + int(duration * 1_000_000_000)
+        while monotonic_ns() < end:
+            self.run_once()
+
+    def reset_stats(self) -> None:
+        """Zero the statistics of all jobs"""
+        for job in self.jobs:
+            job.reset_stats()
+
+    def report(self) -> str:
+        """Statistics of all jobs as a table, times in milliseconds"""
+        lines = ["job          runs  late defer  lat avg  lat max  dur avg  dur max"]
+        for job in self.jobs:
+            lines.append(
+                f"{job.name:<10} {job.runs:6d} {job.late:5d} {job.deferred:5d} "
+                f"{job.latency * 1000:8.2f} {job.max_latency * 1000:8.2f} "
+                f"{job.duration * 1000:8.2f} {job.max_duration * 1000:8.2f}"
+            )
+        return "\n".join(lines)
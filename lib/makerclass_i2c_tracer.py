@@ -0,0 +1,303 @@
+"""
+`makerclass_i2c_tracer`
+================================================================================
+
+MakerClass CircuitPython library for recording I2C transactions: how many
+went to each device, how many bytes they moved and how long they took.
+
+* Author: MakerClass
+
+When a program gets slow, the tracer shows whether the time goes to the bus,
+and to which device, or to the Python code in between.
+
+Implementation Notes
+--------------------
+
+`I2CTracer.wrap` returns a `TracedI2C`, which behaves like the `busio.I2C`
+it wraps and can be passed to any driver. A driver already created can be
+traced with `I2CTracer.attach`, which wraps the bus of its
+``adafruit_bus_device.I2CDevice``.
+
+``displayio.I2CDisplay`` only accepts a real `busio.I2C` and talks to the
+bus from C, so display traffic is not seen by the wrapper. Time it with
+`I2CTracer.section` around ``display.refresh()`` instead.
+
+Totals per device are kept for the whole run, the last ``size``
+transactions also individually in a ring of arrays, for `I2CTracer.write_csv`.
+Tracing costs a few microseconds of Python per transaction.
+
+The tracer also works with ``tools/mpu_simulator.py``, pass the simulation
+clock as ``clock`` to get simulated instead of host times.
+
+**Software and Dependencies:**
+
+* Adafruit CircuitPython firmware for the supported boards:
+  https://circuitpython.org/downloads
+
+"""
+
+# imports
+__version__ = "1.0.0"
+__repo__ = "https://github.com/makerclass/workshop"
+
+from array import array
+from time import monotonic_ns
+
+try:
+    from typing import Callable, Dict, Optional, Union
+    from busio import I2C
+    from adafruit_bus_device.i2c_device import I2CDevice
+except ImportError:
+    pass
+
+# Transaction types in the ring, ERROR is or-ed in when the transaction raised
+WRITE = 1
+READ = 2
+WRITE_READ = 3
+SECTION = 4
+ERROR = 0x80
+
+_OPERATION_NAMES = {WRITE: "write", READ: "read", WRITE_READ: "write_read", SECTION: "section"}
+
+
+class TracedI2C:
+    """A `busio.I2C` that reports every transaction to an `I2CTracer`.
+
+    Create it with `I2CTracer.wrap`. Everything not listed here is passed
+    to the wrapped bus.
+    """
+
+    def __init__(self, i2c: "I2C", tracer: "I2CTracer") -> None:
+        self.i2c = i2c
+        self.tracer = tracer
+
+    def __getattr__(self, name: str):
+        return getattr(self.i2c, name)
+
+    def __enter__(self) -> "TracedI2C":
+        return self
+
+    def __exit__(self, exception_type, exception_value, traceback) -> None:
+        self.i2c.deinit()
+
+    def try_lock(self) -> bool:
+        return self.i2c.try_lock()
+
+    def unlock(self) -> None:
+        self.i2c.unlock()
+
+    def writeto(self, address: int, buffer, *, start: int = 0, end: Optional[int] = None) -> None:
+        if end is None:
+            end = len(buffer)
+        tracer = self.tracer
+        begin = tracer.clock()
+        try:
+            self.i2c.writeto(address, buffer, start=start, end=end)
+        except OSError:
+            tracer.record(address, WRITE | ERROR, end - start, begin)
+            raise
+        tracer.record(address, WRITE, end - start, begin)
+
+    def readfrom_into(self, address: int, buffer, *, start: int = 0, end: Optional[int] = None) -> None:
+        if end is None:
+            end = len(buffer)
+        tracer = self.tracer
+        begin = tracer.clock()
+        try:
+            self.i2c.readfrom_into(address, buffer, start=start, end=end)
+        except OSError:
+            tracer.record(address, READ | ERROR, end - start, begin)
+            raise
+        tracer.record(address, READ, end - start, begin)
+
+    def writeto_then_readfrom(
+        self,
+        address: int,
+        buffer_out,
+        buffer_in,
+        *,
+        out_start: int = 0,
+        out_end: Optional[int] = None,
+        in_start: int = 0,
+        in_end: Optional[int] = None,
+    ) -> None:
+        if out_end is None:
+            out_end = len(buffer_out)
+        if in_end is None:
+            in_end = len(buffer_in)
+        length = out_end - out_start + in_end - in_start
+        tracer = self.tracer
+        begin = tracer.clock()
+        try:
+            self.i2c.writeto_then_readfrom(
+                address,
+                buffer_out,
+                buffer_in,
+                out_start=out_start,
+                out_end=out_end,
+                in_start=in_start,
+                in_end=in_end,
+            )
+        except OSError:
+            tracer.record(address, WRITE_READ | ERROR, length, begin)
+            raise
+        tracer.record(address, WRITE_READ, length, begin)
+
+
+class _Section:
+    def __init__(self, tracer: "I2CTracer", name: str) -> None:
+        self._tracer = tracer
+        self._name = name
+        self._begin = 0
+
+    def __enter__(self) -> None:
+        self._begin = self._tracer.clock()
+
+    def __exit__(self, exception_type, exception_value, traceback) -> None:
+        operation = SECTION | ERROR if exception_type else SECTION
+        self._tracer.record(self._name, operation, 0, self._begin)
+
+
+class I2CTracer:
+    """Transaction statistics per device and a ring of the last transactions.
+
+    :param int size: Number of transactions kept in the ring. Defaults to 256
+    :param clock: Function returning the time in nanoseconds. Defaults to
+        `time.monotonic_ns`
+    :param dict names: Names for the report by address, e.g. ``{0x68: "MPU"}``
+
+    .. code-block:: python
+
+        tracer = makerclass_i2c_tracer.I2CTracer(names={0x68: "MPU"})
+        mpu = makerclass_accelerometer.MakerClassAccelerometer(tracer.wrap(i2c))
+        ...
+        with tracer.section("OLED"):
+            display.refresh()
+        print(tracer.report())
+    """
+
+    def __init__(
+        self,
+        size: int = 256,
+        clock: "Optional[Callable[[], int]]" = None,
+        names: "Optional[Dict[int, str]]" = None,
+    ) -> None:
+        self.size = size
+        self.clock = clock or monotonic_ns
+        self.names = names or {}
+        self._keys = []  # addresses and section names, indexed by the ring
+        self._ring_time = array("L", [0] * size)      # µs since reset, wraps after 71 minutes
+        self._ring_duration = array("L", [0] * size)  # µs
+        self._ring_length = array("H", [0] * size)
+        self._ring_operation = array("B", [0] * size)
+        self._ring_key = array("B", [0] * size)
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget all statistics and recorded transactions"""
+        self._start = self.clock()
+        self._index = 0
+        self._filled = 0
+        self.stats = {}
+        """Totals per address or section name:
+        ``[transactions, bytes, total ns, longest ns, errors]``"""
+
+    def wrap(self, i2c: "I2C") -> TracedI2C:
+        """Return a traced bus to use instead of ``i2c``"""
+        return TracedI2C(i2c, self)
+
+    def attach(self, i2c_device: "I2CDevice") -> None:
+        """Trace an ``adafruit_bus_device.I2CDevice`` already created by a driver,
+        e.g. ``tracer.attach(mpu.i2c_device)``"""
+        if not isinstance(i2c_device.i2c, TracedI2C):
+            i2c_device.i2c = self.wrap(i2c_device.i2c)
+
+    def section(self, name: str) -> _Section:
+        """Context manager timing the code inside as ``name``, for work not
+        visible to the wrapper like ``display.refresh()``"""
+        return _Section(self, name)
+
+    def record(self, key: "Union[int, str]", operation: int, length: int, begin: int) -> None:
+        """Add one transaction that started at ``begin`` (see ``clock``) and ends now.
+
+        :param key: I2C address or section name
+        :param int operation: `WRITE`, `READ`, `WRITE_READ` or `SECTION`, or-ed with `ERROR`
+        :param int length: Bytes moved
+        """
+        end = self.clock()
+        duration = end - begin
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = self.stats[key] = [0, 0, 0, 0, 0]
+        stats[0] += 1
+        stats[1] += length
+        stats[2] += duration
+        if duration > stats[3]:
+            stats[3] = duration
+        if operation & ERROR:
+            stats[4] += 1
+
+        try:
+            key_index = self._keys.index(key)
+        except ValueError:
+            key_index = len(self._keys)
+            if key_index > 255:
+                return  # no room in the ring for another device, totals are kept
+            self._keys.append(key)
+        index = self._index
+        self._ring_time[index] = ((begin - self._start) // 1000) & 0xFFFFFFFF
+        self._ring_duration[index] = min(duration // 1000, 0xFFFFFFFF)
+        self._ring_length[index] = min(length, 0xFFFF)
+        self._ring_operation[index] = operation
+        self._ring_key[index] = key_index
+        index += 1
+        self._index = 0 if index == self.size else index
+        if self._filled < self.size:
+            self._filled += 1
+
+    def _name(self, key: "Union[int, str]") -> str:
+        if isinstance(key, str):
+            return key
+        name = self.names.get(key)
+        return f"0x{key:02X} {name}" if name else f"0x{key:02X}"
+
+    def report(self) -> str:
+        """Totals per device since `reset` as a table"""
+        elapsed = self.clock() - self._start
+        lines = ["device            count    bytes   total ms   avg us   max us  errors"]
+        traced = 0
+        for key in sorted(self.stats, key=lambda key: self.stats[key][2], reverse=True):
+            count, length, total, longest, errors = self.stats[key]
+            traced += total
+            lines.append(
+                f"{self._name(key):<15} {count:7d} {length:8d} {total / 1e6:10.1f} "
+                f"{total / count / 1000:8.0f} {longest / 1000:8.0f} {errors:7d}"
+            )
+        if elapsed:
+            lines.append(
+                f"traced {traced / 1e6:.1f} ms of {elapsed / 1e6:.1f} ms "
+                f"({100 * traced / elapsed:.0f} %), the rest is Python and sleep"
+            )
+        return "\n".join(lines)
+
+    def write_csv(self, stream=None) -> None:
+        """Write the transactions in the ring, oldest first, as CSV.
+
+        :param stream: Writable text stream, e.g. an open file. Defaults to
+            printing to the serial console
+        """
+        write = stream.write if stream else lambda line: print(line, end="")
+        write("time_us,device,operation,bytes,duration_us,error\n")
+        index = self._index - self._filled
+        if index < 0:
+            index += self.size
+        for _ in range(self._filled):
+            operation = self._ring_operation[index]
+            write(
+                f"{self._ring_time[index]},{self._name(self._keys[self._ring_key[index]])},"
+                f"{_OPERATION_NAMES[operation & ~ERROR]},{self._ring_length[index]},"
+                f"{self._ring_duration[index]},{1 if operation & ERROR else 0}\n"
+            )
+            index += 1
+            if index == self.size:
+                index = 0
@@ -0,0 +1,209 @@
+"""
+`makerclass_motion_stats`
+================================================================================
+
+MakerClass CircuitPython library for running statistics of MPU6050/MPU6500/MPU9250
+samples: minimum, maximum, peak-to-peak, mean, variance and RMS per axis.
+
+* Author: MakerClass
+
+Implementation Notes
+--------------------
+
+Samples are fed at the sensor rate and the statistics are read at a much
+lower rate, e.g. a few times per second for an OLED display, then `reset`.
+Every update costs O(1) per axis: the mean and variance use Welford's
+algorithm, RMS keeps a running sum of squares, and minimum and maximum are
+compared in place. Nothing is allocated after construction.
+
+The last ``size`` samples are also kept in a ring buffer, backed by a single
+``array("f")``, for plotting or further processing.
+
+**Software and Dependencies:**
+
+* Adafruit CircuitPython firmware for the supported boards:
+  https://circuitpython.org/downloads
+
+* makerclass_accelerometer
+
+"""
+
+# imports
+__version__ = "1.0.0"
+__repo__ = "https://github.com/makerclass/workshop"
+
+from array import array
+from math import sqrt
+
+try:
+    from makerclass_accelerometer import MakerClassAccelerometer
+except ImportError:
+    pass
+
+
+class MotionStats:
+    """Running statistics and a ring buffer of the last samples for each axis.
+
+    :param int size: Number of samples kept in the ring buffer. Defaults to 64
+    :param int axes: Number of values per sample. 3 for acceleration X, Y, Z,
+        6 adds gyroscope X, Y, Z, 7 adds temperature, in the order of
+        `MakerClassAccelerometer.read_motion_into`. Defaults to 3
+
+    .. code-block:: python
+
+        stats = makerclass_motion_stats.MotionStats()
+        while True:
+            stats.update_from_sensor(mpu)
+            if stats.count >= 100:
+                print(stats.rms(2), stats.peak_to_peak(2))
+                stats.reset()
+    """
+
+    def __init__(self, size: int = 64, axes: int = 3) -> None:
+        if size < 1:
+            raise ValueError("size must be at least 1")
+        if not 1 <= axes <= 7:
+            raise ValueError("axes must be between 1 and 7")
+        self.size = size
+        self.axes = axes
+        self._buffer = array("f", [0] * (size * axes))
+        self._index = 0
+        self._filled = 0
+        self._sample = array("f", [0] * 7)
+        self._mean = array("f", [0] * axes)
+        self._m2 = array("f", [0] * axes)
+        self._sum_squares = array("f", [0] * axes)
+        self._minimum = array("f", [0] * axes)
+        self._maximum = array("f", [0] * axes)
+        self.count = 0
+        """Number of samples since the last `reset`"""
+
+    def reset(self) -> None:
+        """Start new statistics, the ring buffer keeps its samples"""
+        self.count = 0
+        for axis in range(self.axes):
+            self._mean[axis] = 0.0
+            self._m2[axis] = 0.0
+            self._sum_squares[axis] = 0.0
+            self._minimum[axis] = 0.0
+            self._maximum[axis] = 0.0
+
+    def update(self, sample) -> None:
+        """Add one sample.
+
+        :param sample: Indexable with at least `axes` values, e.g. the buffer
+            filled by `MakerClassAccelerometer.read_motion_into`
+        """
+        self.count += 1
+        count = self.count
+        axes = self.axes
+        buffer = self._buffer
+        position = self._index * axes
+        mean = self._mean
+        m2 = self._m2
+        sum_squares = self._sum_squares
+        minimum = self._minimum
+        maximum = self._maximum
+        for axis in range(axes):
+            value = sample[axis]
+            buffer[position + axis] = value
+            # Welford: numerically stable running mean and sum of squared differences
+            delta = value - mean[axis]
+            mean[axis] += delta / count
+            m2[axis] += delta * (value - mean[axis])
+            sum_squares[axis] += value * value
+            if count == 1 or value < minimum[axis]:
+                minimum[axis] = value
+            if count == 1 or value > maximum[axis]:
+                maximum[axis] = value
+        self._index += 1
+        if self._index == self.size:
+            self._index = 0
+        if self._filled < self.size:
+            self._filled += 1
+
+    def update_from_sensor(self, sensor: "MakerClassAccelerometer") -> None:
+        """Read one sample from the sensor and add it, without allocating memory"""
+        if self.axes <= 3:
+            sensor.read_accel_into(self._sample)
+        else:
+            sensor.read_motion_into(self._sample)
+        self.update(self._sample)
+
+    def update_from_fifo(self, sensor: "MakerClassAccelerometer") -> int:
+        """Add all frames waiting in the sensor's FIFO.
+
+        The FIFO must be running with the sources for `axes`, see
+        `MakerClassAccelerometer.start_fifo`.
+
+        :return: The number of frames added
+        """
+        sample = self._sample
+        frames = 0
+        for accel, gyro, temperature in sensor.fifo_frames():
+            sample[0], sample[1], sample[2] = accel
+            if gyro is not None:
+                sample[3], sample[4], sample[5] = gyro
+            if temperature is not None:
+                sample[6] = temperature
+            self.update(sample)
+            frames += 1
+        return frames
+
+    def mean(self, axis: int) -> float:
+        """Mean of ``axis`` since the last `reset`"""
+        return self._mean[axis]
+
+    def variance(self, axis: int) -> float:
+        """Population variance of ``axis`` since the last `reset`"""
+        if self.count < 2:
+            return 0.0
+        return self._m2[axis] / self.count
+
+    def std_dev(self, axis: int) -> float:
+        """Standard deviation of ``axis`` since the last `reset`"""
+        return sqrt(self.variance(axis))
+
+    def rms(self, axis: int) -> float:
+        """Root mean square of ``axis`` since the last `reset`.
+
+        Includes the constant part, e.g. gravity. `std_dev` is the RMS of the
+        vibration around the mean."""
+        if not self.count:
+            return 0.0
+        return sqrt(self._sum_squares[axis] / self.count)
+
+    def minimum(self, axis: int) -> float:
+        """Smallest value of ``axis`` since the last `reset`"""
+        return self._minimum[axis]
+
+    def maximum(self, axis: int) -> float:
+        """Largest value of ``axis`` since the last `reset`"""
+        return self._maximum[axis]
+
+    def peak_to_peak(self, axis: int) -> float:
+        """Difference between the largest and smallest value of ``axis`` since the last `reset`"""
+        return self._maximum[axis] - self._minimum[axis]
+
+    def __len__(self) -> int:
+        """Number of samples in the ring buffer"""
+        return self._filled
+
+    def copy_into(self, buf, axis: int) -> int:
+        """Copy the ring buffer samples of ``axis`` into ``buf``, oldest first.
+
+        :param buf: Caller-owned buffer, usually ``array("f")``
+        :return: The number of samples copied, at most ``len(buf)`` of the newest
+        """
+        count = min(self._filled, len(buf))
+        axes = self.axes
+        index = self._index - count
+        if index < 0:
+            index += self.size
+        buffer = self._buffer
+        for i in range(count):
+            buf[i] = buffer[index * axes + axis]
+            index += 1
+            if index == self.size:
+                index = 0
+        return count
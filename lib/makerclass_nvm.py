@@ -0,0 +1,51 @@
+"""
+`makerclass_nvm`
+================================================================================
+
+MakerClass CircuitPython library sharing ``microcontroller.nvm`` between the
+MakerClass libraries that keep data across restarts.
+
+* Author: MakerClass
+
+Implementation Notes
+--------------------
+
+Every library gets its own area, so one doesn't overwrite the other's data:
+
+* bytes 0-127: `makerclass_accelerometer` calibration, a 64 byte slot per
+  I2C address (0x68, 0x69)
+* bytes 256-383: `makerclass_i2c_discovery` device cache
+
+Blinka on a computer has a ``microcontroller`` module without ``nvm``,
+`nvm` returns `None` there and the libraries skip storing.
+
+**Software and Dependencies:**
+
+* Adafruit CircuitPython firmware for the supported boards:
+  https://circuitpython.org/downloads
+
+"""
+
+# imports
+__version__ = "1.0.0"
+__repo__ = "https://github.com/makerclass/workshop"
+
+try:
+    from typing import Optional
+    from microcontroller import ByteArray
+except ImportError:
+    pass
+
+CALIBRATION_OFFSET = 0
+CALIBRATION_SLOT_SIZE = 64
+DISCOVERY_OFFSET = 256
+DISCOVERY_SIZE = 128
+
+
+def nvm() -> "Optional[ByteArray]":
+    """The board's ``microcontroller.nvm``, `None` if there is none"""
+    try:
+        import microcontroller  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        return None
+    return getattr(microcontroller, "nvm", None)
@@ -0,0 +1,310 @@
+"""
+`makerclass_orientation`
+================================================================================
+
+MakerClass CircuitPython library for orientation (pitch/roll/yaw) estimation
+from MPU6050/MPU6500/MPU9250 accelerometer and gyroscope data.
+
+* Author: MakerClass
+
+Available filters:
+- ComplementaryFilter - cheap, blends gyro integration with accelerometer tilt
+- MadgwickFilter - gradient descent quaternion filter by Sebastian Madgwick
+
+With the MPU9250 magnetometer, `tilt_compensated_heading` gives the compass
+heading of the board at any tilt.
+
+Implementation Notes
+--------------------
+
+Filter state lives in plain float attributes that are created once, and every
+update works on separate axis values instead of tuples, so a loop running
+200+ times per second creates no garbage besides the float math itself.
+
+Yaw is only integrated from the gyroscope and slowly drifts, the accelerometer
+cannot observe rotation around the gravity vector. Use the heading from the
+magnetometer when an absolute direction is needed.
+
+**Software and Dependencies:**
+
+* Adafruit CircuitPython firmware for the supported boards:
+  https://circuitpython.org/downloads
+
+* makerclass_accelerometer
+
+"""
+
+# imports
+__version__ = "1.0.0"
+__repo__ = "https://github.com/makerclass/workshop"
+
+from array import array
+from math import asin, atan2, cos, degrees, radians, sin, sqrt
+from time import monotonic_ns
+
+try:
+    from typing import Tuple
+    from makerclass_accelerometer import MakerClassAccelerometer
+except ImportError:
+    pass
+
+
+class _OrientationFilter:
+    """Sample handling shared by the orientation filters, which provide
+    ``update``, ``quaternion`` and ``euler``"""
+
+    def __init__(self) -> None:
+        self._sample = array("f", [0] * 7)
+        self._last_update = None
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget the current orientation, the next update starts from accelerometer tilt"""
+        self._last_update = None
+        self._initialized = False
+
+    def update_from_sensor(self, sensor: "MakerClassAccelerometer") -> None:
+        """Read one sample with `read_motion_into` and feed it into the filter.
+        The time step is measured between calls."""
+        now = monotonic_ns()
+        last_update = self._last_update
+        self._last_update = now
+        sample = self._sample
+        sensor.read_motion_into(sample)
+        dt = 0.0 if last_update is None else (now - last_update) * 1e-9
+        self.update(sample[0], sample[1], sample[2], sample[3], sample[4], sample[5], dt)
+
+    def update_from_fifo(self, sensor: "MakerClassAccelerometer", dt: float) -> int:
+        """Feed all frames waiting in the sensor's FIFO into the filter.
+
+        The FIFO must be running with both accelerometer and gyroscope enabled,
+        see `MakerClassAccelerometer.start_fifo`.
+
+        :param float dt: FIFO sample period in seconds
+        :return: The number of frames processed
+        :raises ValueError: If the FIFO doesn't hold both accelerometer and
+            gyroscope data, checked before anything is read
+        """
+        accel, gyro, _ = sensor.fifo_contents
+        if not (accel and gyro):
+            raise ValueError("The FIFO must hold accelerometer and gyroscope data")
+        frames = 0
+        for accel, gyro, _ in sensor.fifo_frames():
+            self.update(accel[0], accel[1], accel[2], gyro[0], gyro[1], gyro[2], dt)
+            frames += 1
+        return frames
+
+
+class ComplementaryFilter(_OrientationFilter):
+    """Complementary filter for roll and pitch.
+
+    Integrates the gyroscope for fast response and pulls the result towards the
+    accelerometer tilt to cancel gyro drift. Costs only a few multiplications
+    and two ``atan2`` per sample.
+
+    :param float alpha: Weight of the gyroscope, between 0 and 1. Higher values
+        are smoother but follow the accelerometer slower. Defaults to 0.98
+    """
+
+    def __init__(self, alpha: float = 0.98) -> None:
+        if not 0.0 <= alpha <= 1.0:
+            raise ValueError("alpha must be between 0 and 1")
+        self.alpha = alpha
+        self.roll = 0.0
+        """Rotation around X in degrees"""
+        self.pitch = 0.0
+        """Rotation around Y in degrees"""
+        self.yaw = 0.0
+        """Rotation around Z in degrees, integrated from the gyroscope only"""
+        super().__init__()
+
+    def reset(self) -> None:
+        super().reset()
+        self.roll = 0.0
+        self.pitch = 0.0
+        self.yaw = 0.0
+
+    def update(self, ax: float, ay: float, az: float, gx: float, gy: float, gz: float, dt: float) -> None:
+        """Feed one sample into the filter.
+
+        :param float ax: Acceleration X in m/s^2 (any unit works, only the direction is used)
+        :param float ay: Acceleration Y
+        :param float az: Acceleration Z
+        :param float gx: Angular rate around X in °/s
+        :param float gy: Angular rate around Y in °/s
+        :param float gz: Angular rate around Z in °/s
+        :param float dt: Time since the previous sample in seconds
+        """
+        accel_roll = degrees(atan2(ay, az))
+        accel_pitch = degrees(atan2(-ax, sqrt(ay * ay + az * az)))
+        if not self._initialized:
+            self.roll = accel_roll
+            self.pitch = accel_pitch
+            self._initialized = True
+            return
+        alpha = self.alpha
+        # Blend the difference wrapped to ±180°, so upside down a step from
+        # +179° to -179° is 2° and not a swing through 0°
+        roll = self.roll + gx * dt
+        roll += (1.0 - alpha) * ((accel_roll - roll + 180.0) % 360.0 - 180.0)
+        self.roll = (roll + 180.0) % 360.0 - 180.0
+        self.pitch = alpha * (self.pitch + gy * dt) + (1.0 - alpha) * accel_pitch
+        self.yaw += gz * dt
+
+    @property
+    def quaternion(self) -> Tuple[float, float, float, float]:
+        """Orientation as a unit quaternion ``(w, x, y, z)``"""
+        return _euler_to_quaternion(self.roll, self.pitch, self.yaw)
+
+    @property
+    def euler(self) -> Tuple[float, float, float]:
+        """Orientation as ``(roll, pitch, yaw)`` in degrees"""
+        return (self.roll, self.pitch, self.yaw)
+
+
+class MadgwickFilter(_OrientationFilter):
+    """Madgwick gradient descent orientation filter (IMU version).
+
+    Tracks the full orientation as a quaternion, so it behaves well at any
+    angle, including pitch near ±90° where the complementary filter breaks down.
+
+    :param float beta: Gain of the accelerometer correction. Higher values
+        converge faster but pass more accelerometer noise. Defaults to 0.1
+    """
+
+    def __init__(self, beta: float = 0.1) -> None:
+        self.beta = beta
+        self.q0 = 1.0
+        self.q1 = 0.0
+        self.q2 = 0.0
+        self.q3 = 0.0
+        super().__init__()
+
+    def reset(self) -> None:
+        super().reset()
+        self.q0 = 1.0
+        self.q1 = 0.0
+        self.q2 = 0.0
+        self.q3 = 0.0
+
+    def update(self, ax: float, ay: float, az: float, gx: float, gy: float, gz: float, dt: float) -> None:
+        """Feed one sample into the filter, the parameters are the same as
+        for `ComplementaryFilter.update`"""
+        if not self._initialized:
+            # Start from the accelerometer tilt instead of converging from level
+            if ax or ay or az:
+                roll = degrees(atan2(ay, az))
+                pitch = degrees(atan2(-ax, sqrt(ay * ay + az * az)))
+                self.q0, self.q1, self.q2, self.q3 = _euler_to_quaternion(roll, pitch, 0.0)
+                self._initialized = True
+            return
+
+        q0 = self.q0
+        q1 = self.q1
+        q2 = self.q2
+        q3 = self.q3
+        gx = radians(gx)
+        gy = radians(gy)
+        gz = radians(gz)
+
+        # Rate of change of quaternion from gyroscope
+        q_dot0 = 0.5 * (-q1 * gx - q2 * gy - q3 * gz)
+        q_dot1 = 0.5 * (q0 * gx + q2 * gz - q3 * gy)
+        q_dot2 = 0.5 * (q0 * gy - q1 * gz + q3 * gx)
+        q_dot3 = 0.5 * (q0 * gz + q1 * gy - q2 * gx)
+
+        norm = ax * ax + ay * ay + az * az
+        if norm:
+            norm = 1.0 / sqrt(norm)
+            ax *= norm
+            ay *= norm
+            az *= norm
+
+            # Gradient descent step towards the measured gravity direction
+            q0q0 = q0 * q0
+            q1q1 = q1 * q1
+            q2q2 = q2 * q2
+            q3q3 = q3 * q3
+            s0 = 4.0 * q0 * q2q2 + 2.0 * q2 * ax + 4.0 * q0 * q1q1 - 2.0 * q1 * ay
+            s1 = (
+                4.0 * q1 * q3q3 - 2.0 * q3 * ax + 4.0 * q0q0 * q1 - 2.0 * q0 * ay - 4.0 * q1
+                + 8.0 * q1 * q1q1 + 8.0 * q1 * q2q2 + 4.0 * q1 * az
+            )
+            s2 = (
+                4.0 * q0q0 * q2 + 2.0 * q0 * ax + 4.0 * q2 * q3q3 - 2.0 * q3 * ay - 4.0 * q2
+                + 8.0 * q2 * q1q1 + 8.0 * q2 * q2q2 + 4.0 * q2 * az
+            )
+            s3 = 4.0 * q1q1 * q3 - 2.0 * q1 * ax + 4.0 * q2q2 * q3 - 2.0 * q2 * ay
+            norm = s0 * s0 + s1 * s1 + s2 * s2 + s3 * s3
+            if norm:
+                norm = self.beta / sqrt(norm)
+                q_dot0 -= norm * s0
+                q_dot1 -= norm * s1
+                q_dot2 -= norm * s2
+                q_dot3 -= norm * s3
+
+        q0 += q_dot0 * dt
+        q1 += q_dot1 * dt
+        q2 += q_dot2 * dt
+        q3 += q_dot3 * dt
+        norm = 1.0 / sqrt(q0 * q0 + q1 * q1 + q2 * q2 + q3 * q3)
+        self.q0 = q0 * norm
+        self.q1 = q1 * norm
+        self.q2 = q2 * norm
+        self.q3 = q3 * norm
+
+    @property
+    def quaternion(self) -> Tuple[float, float, float, float]:
+        """Orientation as a unit quaternion ``(w, x, y, z)``"""
+        return (self.q0, self.q1, self.q2, self.q3)
+
+    @property
+    def euler(self) -> Tuple[float, float, float]:
+        """Orientation as ``(roll, pitch, yaw)`` in degrees"""
+        q0 = self.q0
+        q1 = self.q1
+        q2 = self.q2
+        q3 = self.q3
+        roll = atan2(2.0 * (q0 * q1 + q2 * q3), 1.0 - 2.0 * (q1 * q1 + q2 * q2))
+        pitch = 2.0 * (q0 * q2 - q3 * q1)
+        pitch = asin(max(-1.0, min(1.0, pitch)))
+        yaw = atan2(2.0 * (q0 * q3 + q1 * q2), 1.0 - 2.0 * (q2 * q2 + q3 * q3))
+        return (degrees(roll), degrees(pitch), degrees(yaw))
+
+
+def _euler_to_quaternion(roll: float, pitch: float, yaw: float) -> Tuple[float, float, float, float]:
+    half_roll = radians(roll) * 0.5
+    half_pitch = radians(pitch) * 0.5
+    half_yaw = radians(yaw) * 0.5
+    cr = cos(half_roll)
+    sr = sin(half_roll)
+    cp = cos(half_pitch)
+    sp = sin(half_pitch)
+    cy = cos(half_yaw)
+    sy = sin(half_yaw)
+    return (
+        cr * cp * cy + sr * sp * sy,
+        sr * cp * cy - cr * sp * sy,
+        cr * sp * cy + sr * cp * sy,
+        cr * cp * sy - sr * sp * cy,
+    )
+
+
+def tilt_compensated_heading(ax: float, ay: float, az: float, mx: float, my: float, mz: float) -> float:
+    """Compass heading of the board's X axis from accelerometer and magnetometer data.
+
+    The magnetic field is rotated back to level with the roll and pitch from
+    the accelerometer, so the heading stays correct while the board is tilted.
+    Both vectors must be in the same axes, as `MakerClassAccelerometer.read_motion_mag_into`
+    returns them. The result is magnetic north, add the local declination for true north.
+
+    :return: Heading in degrees, 0 to 360, clockwise from north
+    """
+    roll = atan2(ay, az)
+    pitch = atan2(-ax, sqrt(ay * ay + az * az))
+    sin_roll = sin(roll)
+    cos_roll = cos(roll)
+    sin_pitch = sin(pitch)
+    level_x = mx * cos(pitch) + (my * sin_roll + mz * cos_roll) * sin_pitch
+    level_y = my * cos_roll - mz * sin_roll
+    return degrees(atan2(level_y, level_x)) % 360.0
@@ -0,0 +1,237 @@
+"""
+`makerclass_spectrum`
+================================================================================
+
+MakerClass CircuitPython library for vibration spectrum analysis of
+MPU6050/MPU6500/MPU9250 accelerometer data.
+
+* Author: MakerClass
+
+Samples are collected from the sensor's FIFO into power-of-two blocks, so the
+sample rate is set by the sensor and not by the speed of the Python loop.
+Each block is windowed and transformed with an FFT, giving the vibration
+amplitude per frequency, the dominant frequencies and the energy in bands.
+
+Implementation Notes
+--------------------
+
+The FFT runs in ``ulab.numpy.fft`` when the firmware includes ulab. Without
+it a pure Python radix-2 FFT with precomputed twiddle factors is used, which
+gives the same results but is much slower. See ``tools/benchmark_spectrum.py``.
+
+**Software and Dependencies:**
+
+* Adafruit CircuitPython firmware for the supported boards:
+  https://circuitpython.org/downloads
+
+* Optional: CircuitPython firmware built with ulab
+
+* makerclass_accelerometer
+
+"""
+
+# imports
+__version__ = "1.0.0"
+__repo__ = "https://github.com/makerclass/workshop"
+
+from array import array
+from math import cos, pi, sin, sqrt
+
+try:
+    from ulab import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from typing import List, Tuple
+    from makerclass_accelerometer import MakerClassAccelerometer
+except ImportError:
+    pass
+
+
+class VibrationSpectrum:
+    """Amplitude spectrum of one accelerometer axis.
+
+    :param float sample_rate: Rate of the FIFO samples in Hz, set on the sensor
+        with `MakerClassAccelerometer.configure_odr`
+    :param int size: Samples per block, a power of two. The frequency resolution
+        is ``sample_rate / size``. Defaults to 256
+    :param int axis: Accelerometer axis, 0 = X, 1 = Y, 2 = Z. Defaults to 2
+    :param bool use_ulab: Use ``ulab`` if available. Defaults to `True`
+
+    .. code-block:: python
+
+        mpu.configure_odr(500)
+        mpu.start_fifo(gyro=False)
+        spectrum = makerclass_spectrum.VibrationSpectrum(sample_rate=500)
+        while True:
+            if spectrum.update_from_fifo(mpu):
+                spectrum.compute()
+                print(spectrum.dominant_frequencies())
+    """
+
+    def __init__(self, sample_rate: float, size: int = 256, axis: int = 2, use_ulab: bool = True) -> None:
+        if size < 4 or size & (size - 1):
+            raise ValueError("size must be a power of two, at least 4")
+        self.sample_rate = sample_rate
+        self.size = size
+        self.axis = axis
+        self._ulab = np is not None and use_ulab
+        self._block = array("f", [0] * size)
+        self._filled = 0
+        self.magnitudes = array("f", [0] * (size // 2))
+        """Amplitude of each frequency bin in the input unit (m/s^2), bin ``i``
+        is at `frequency` ``(i)``. Updated by `compute`"""
+
+        # Hann window, its sum scales the FFT back to amplitudes
+        self._window = array("f", (0.5 - 0.5 * cos(2 * pi * i / size) for i in range(size)))
+        self._amplitude_scale = 2.0 / sum(self._window)
+        if self._ulab:
+            self._window_np = np.array(self._window)
+        else:
+            self._real = array("f", [0] * size)
+            self._imag = array("f", [0] * size)
+            self._cos = array("f", (cos(2 * pi * i / size) for i in range(size // 2)))
+            self._sin = array("f", (-sin(2 * pi * i / size) for i in range(size // 2)))
+            bits = size.bit_length() - 1
+            self._bit_reverse = array("H", (_reverse_bits(i, bits) for i in range(size)))
+
+    @property
+    def ready(self) -> bool:
+        """`True` when a full block is waiting for `compute`"""
+        return self._filled == self.size
+
+    def update(self, value: float) -> bool:
+        """Add one sample to the block. Samples beyond a full block are ignored.
+
+        :return: `ready`
+        """
+        if self._filled < self.size:
+            self._block[self._filled] = value
+            self._filled += 1
+        return self._filled == self.size
+
+    def update_from_fifo(self, sensor: "MakerClassAccelerometer") -> bool:
+        """Add the frames waiting in the sensor's FIFO to the block.
+
+        The FIFO must be running with the accelerometer enabled. Frames read
+        after the block is full are dropped, so every block is contiguous.
+
+        :return: `ready`
+        """
+        axis = self.axis
+        for accel, _, _ in sensor.fifo_frames():
+            self.update(accel[axis])
+        return self._filled == self.size
+
+    def frequency(self, index: int) -> float:
+        """Frequency of bin ``index`` in Hz"""
+        return index * self.sample_rate / self.size
+
+    def compute(self) -> array:
+        """Transform the collected block into `magnitudes` and start a new block.
+
+        The mean (e.g. gravity) is removed and a Hann window applied first.
+
+        :return: `magnitudes`
+        """
+        if self._filled < self.size:
+            raise RuntimeError("Block is not full yet")
+        block = self._block
+        half = self.size // 2
+        magnitudes = self.magnitudes
+        scale = self._amplitude_scale
+        mean = sum(block) / self.size
+
+        if self._ulab:
+            samples = (np.array(block) - mean) * self._window_np
+            result = np.fft.fft(samples)
+            if isinstance(result, tuple):  # CircuitPython ulab without complex numbers
+                real, imag = result
+                spectrum = np.sqrt(real * real + imag * imag)
+            else:
+                spectrum = abs(result)
+            for i in range(half):
+                magnitudes[i] = spectrum[i] * scale
+        else:
+            real = self._real
+            imag = self._imag
+            window = self._window
+            bit_reverse = self._bit_reverse
+            for i in range(self.size):
+                j = bit_reverse[i]
+                real[j] = (block[i] - mean) * window[i]
+                imag[j] = 0.0
+            self._fft(real, imag)
+            for i in range(half):
+                magnitudes[i] = sqrt(real[i] * real[i] + imag[i] * imag[i]) * scale
+
+        self._filled = 0
+        return magnitudes
+
+    def _fft(self, real, imag) -> None:
+        # In-place iterative radix-2 FFT, input already in bit-reversed order
+        size = self.size
+        cos_table = self._cos
+        sin_table = self._sin
+        span = 1
+        while span < size:
+            step = size // (span * 2)
+            for start in range(0, size, span * 2):
+                twiddle = 0
+                for i in range(start, start + span):
+                    j = i + span
+                    w_real = cos_table[twiddle]
+                    w_imag = sin_table[twiddle]
+                    t_real = w_real * real[j] - w_imag * imag[j]
+                    t_imag = w_real * imag[j] + w_imag * real[j]
+                    real[j] = real[i] - t_real
+                    imag[j] = imag[i] - t_imag
+                    real[i] += t_real
+                    imag[i] += t_imag
+                    twiddle += step
+            span *= 2
+
+    def dominant_frequencies(self, count: int = 3) -> List[Tuple[float, float]]:
+        """The strongest peaks of the last `compute`, strongest first.
+
+        Peak frequencies are refined between bins by parabolic interpolation.
+
+        :param int count: Maximum number of peaks
+        :return: List of ``(frequency in Hz, amplitude)``
+        """
+        magnitudes = self.magnitudes
+        peaks = []
+        for i in range(1, len(magnitudes) - 1):
+            if magnitudes[i] > magnitudes[i - 1] and magnitudes[i] >= magnitudes[i + 1]:
+                peaks.append(i)
+        peaks.sort(key=lambda i: magnitudes[i], reverse=True)
+        result = []
+        for i in peaks[:count]:
+            left = magnitudes[i - 1]
+            center = magnitudes[i]
+            right = magnitudes[i + 1]
+            denominator = left - 2 * center + right
+            shift = 0.5 * (left - right) / denominator if denominator else 0.0
+            result.append((self.frequency(i + shift), center))
+        return result
+
+    def band_energy(self, low: float, high: float) -> float:
+        """Sum of squared amplitudes of the bins from ``low`` up to and
+        including ``high`` Hz in the last `compute`"""
+        magnitudes = self.magnitudes
+        resolution = self.sample_rate / self.size
+        first = max(0, int(low / resolution + 0.5))
+        last = min(len(magnitudes) - 1, int(high / resolution + 0.5))
+        energy = 0.0
+        for i in range(first, last + 1):
+            energy += magnitudes[i] * magnitudes[i]
+        return energy
+
+
+def _reverse_bits(value: int, bits: int) -> int:
+    result = 0
+    for _ in range(bits):
+        result = (result << 1) | (value & 1)
+        value >>= 1
+    return result
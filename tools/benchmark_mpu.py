@@ -0,0 +1,224 @@
+"""
+Benchmark of makerclass_accelerometer against the simulated MPU on the host.
+
+Run from the repository root:
+
+    pip install adafruit-circuitpython-busdevice adafruit-circuitpython-register
+    python tools/benchmark_mpu.py
+
+Bus figures (transactions, bytes, bus time) are exact for the simulated
+100 kHz bus, CPU times are for the host and only useful for comparisons.
+"""
+
+import os
+import sys
+import time
+from array import array
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+# Appended, so the PyPI adafruit_register wins over the .mpy copy in lib/
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lib"))
+
+import makerclass_accelerometer  # pylint: disable=wrong-import-position
+import makerclass_decimator  # pylint: disable=wrong-import-position
+import mpu_simulator  # pylint: disable=wrong-import-position
+
+SAMPLES = 1000
+
+
+def create(chip_id=mpu_simulator.MPU6500, trace=None, frequency=100000, **kwargs):
+    """Return (simulator, bus, driver)"""
+    sensor = mpu_simulator.MPUSimulator(chip_id, trace or mpu_simulator.still(), noise_lsb=8)
+    bus = mpu_simulator.SimulatedI2C({0x68: sensor}, frequency=frequency)
+    mpu = makerclass_accelerometer.MakerClassAccelerometer(bus, fast_init=True, calibration=False, **kwargs)
+    mpu.configure_odr(1000)  # DLPF on: 1 kHz output rate instead of 8 kHz
+    bus.reset_stats()
+    return sensor, bus, mpu
+
+
+def report(name, bus, count, cpu_time=None):
+    line = (
+        f"  {name:<34} {bus.transactions / count:5.2f} transactions "
+        f"{(bus.bytes_written + bus.bytes_read) / count:6.1f} B "
+        f"{bus.bus_time / count * 1e6:8.1f} us bus"
+    )
+    if cpu_time is not None:
+        line += f" {cpu_time / count * 1e6:8.1f} us CPU"
+    print(line)
+
+
+def benchmark_read_paths():
+    print(f"Read paths, per sample ({SAMPLES} samples):")
+
+    def separate(mpu):
+        mpu.acceleration  # pylint: disable=pointless-statement
+        mpu.gyro  # pylint: disable=pointless-statement
+        mpu.temperature  # pylint: disable=pointless-statement
+
+    buf = array("f", [0] * 7)
+    raw = array("h", [0] * 7)
+    paths = (
+        ("acceleration + gyro + temperature", separate),
+        ("motion", lambda mpu: mpu.motion),
+        ("read_motion_into(array('f'))", lambda mpu: mpu.read_motion_into(buf)),
+        ("read_motion_into(array('h'), raw)", lambda mpu: mpu.read_motion_into(raw, True)),
+    )
+    for name, read in paths:
+        _, bus, mpu = create()
+        start = time.perf_counter()
+        for _ in range(SAMPLES):
+            read(mpu)
+        report(name, bus, SAMPLES, time.perf_counter() - start)
+    print()
+
+
+def benchmark_magnetometer():
+    print(f"MPU9250 9-axis sample ({SAMPLES} samples):")
+    sensor = mpu_simulator.MPUSimulator(mpu_simulator.MPU9250, noise_lsb=8)
+    bus = mpu_simulator.SimulatedI2C({0x68: sensor})
+    mpu = makerclass_accelerometer.MakerClassAccelerometer(bus, fast_init=True, calibration=False)
+    mpu.configure_odr(1000)
+    mpu.enable_magnetometer()
+    buf = array("f", [0] * 10)
+    for name, read in (
+        ("read_motion_into + magnetic", lambda: (mpu.read_motion_into(buf), mpu.magnetic)),
+        ("read_motion_mag_into", lambda: mpu.read_motion_mag_into(buf)),
+    ):
+        bus.reset_stats()
+        start = time.perf_counter()
+        for _ in range(SAMPLES):
+            read()
+        report(name, bus, SAMPLES, time.perf_counter() - start)
+    print()
+
+
+def benchmark_init():
+    print("Constructor until the first sample:")
+    for name, kwargs in (
+        ("default", {"fast_init": False}),
+        ("fast_init", {}),
+        ("fast_init + keep_configuration", {"keep_configuration": True}),
+    ):
+        sensor = mpu_simulator.MPUSimulator(mpu_simulator.MPU6500)
+        bus = mpu_simulator.SimulatedI2C({0x68: sensor})
+        if kwargs.get("keep_configuration"):
+            # Sensor already set up by a previous run of code.py
+            makerclass_accelerometer.MakerClassAccelerometer(bus, calibration=False, fast_init=True)
+            bus.reset_stats()
+        fast_init = kwargs.pop("fast_init", True)
+        start = time.perf_counter()
+        mpu = makerclass_accelerometer.MakerClassAccelerometer(bus, calibration=False, fast_init=fast_init, **kwargs)
+        mpu.motion  # pylint: disable=pointless-statement
+        elapsed = time.perf_counter() - start
+        print(f"  {name:<34} {elapsed * 1e3:8.1f} ms wall {bus.transactions:4d} transactions")
+    print()
+
+
+def benchmark_fifo():
+    duration = 1.0
+    print(f"1 kHz accel + gyro FIFO stream for {duration:.0f} s of simulated time, drained every 20 ms:")
+    for frequency in (100000, 400000):
+        sensor, bus, mpu = create(frequency=frequency)
+        mpu.start_fifo(sample_rate_divisor=0)
+        bus.reset_stats()
+        frames = 0
+        start = time.perf_counter()
+        end = sensor.clock() + duration
+        while sensor.clock() < end:
+            sensor.clock.advance(0.02)  # the application does other work for 20 ms
+            for _ in mpu.fifo_frames():
+                frames += 1
+        cpu_time = time.perf_counter() - start
+        name = f"{frequency // 1000} kHz: {frames} frames, {mpu.fifo_overflows} overflows"
+        report(name, bus, max(frames, 1), cpu_time)
+    print()
+
+
+class _CapturedFifo:
+    """Replays captured raw FIFO frames, so only the processing is timed"""
+
+    def __init__(self, mpu, frames):
+        self.fifo_overflows = 0
+        self.scale_fifo_frame = mpu.scale_fifo_frame
+        self._frames = frames
+
+    def fifo_frames(self, raw=False):
+        return iter(self._frames)
+
+
+def benchmark_decimator():
+    factor = 50
+    trace = mpu_simulator.vibrating((180.0,), amplitude_g=0.5)
+    sensor, _, mpu = create(trace=trace, frequency=400000)
+    mpu.start_fifo()
+    captured = []
+    while len(captured) < 20 * factor:
+        sensor.clock.advance(0.02)
+        captured.extend(mpu.fifo_frames(raw=True))
+    outputs = len(captured) // factor
+    print(f"{len(captured)} frames of 1 kHz FIFO averaged down to {1000 // factor} Hz, processing only:")
+
+    start = time.perf_counter()
+    sums = [0.0] * 3
+    frames = 0
+    values = []
+    for raw in captured:
+        accel, _, _ = mpu.scale_fifo_frame(raw)
+        for axis in range(3):
+            sums[axis] += accel[axis]
+        frames += 1
+        if frames == factor:
+            values.append(sums[2] / factor)
+            sums = [0.0] * 3
+            frames = 0
+    cpu_time = time.perf_counter() - start
+    print(f"  {'scale every frame, then average':<34} {cpu_time / outputs * 1e6:8.1f} us CPU per output")
+
+    decimator = makerclass_decimator.Decimator(factor)
+    start = time.perf_counter()
+    values = [accel[2] for accel, _, _ in decimator.frames(_CapturedFifo(mpu, captured))]
+    cpu_time = time.perf_counter() - start
+    print(f"  {'Decimator':<34} {cpu_time / outputs * 1e6:8.1f} us CPU per output")
+    print(f"  averaged Z from {min(values):.2f} to {max(values):.2f} m/s^2")
+
+    sensor, _, mpu = create(trace=trace)
+    values = []
+    while sensor.clock() < 2.0:
+        values.append(mpu.acceleration[2])
+        sensor.clock.advance(1 / 20)
+    print(f"  polling at 20 Hz instead: Z from {min(values):.2f} to {max(values):.2f} m/s^2 (aliased 180 Hz)")
+    print()
+
+
+def benchmark_wake_on_motion():
+    idle = 60.0
+    print(f"{idle:.0f} s at rest, then motion:")
+    trace = mpu_simulator.sequence((idle, mpu_simulator.still()), (1.0, mpu_simulator.rotating(180.0, axis=0)))
+
+    sensor, bus, mpu = create(trace=trace)
+    polls = 0
+    while sensor.clock() < idle + 0.5:
+        mpu.motion  # pylint: disable=pointless-statement
+        polls += 1
+        sensor.clock.advance(0.02)  # level15 style 50 Hz loop
+    print(f"  polling at 50 Hz:        {bus.transactions:6d} transactions, sensor fully powered")
+
+    sensor, bus, mpu = create(trace=trace)
+    mpu.wake_on_motion(threshold_mg=100, rate=makerclass_accelerometer.Rate.CYCLE_5_HZ)
+    bus.reset_stats()
+    # The board sleeps until the INT pin goes high
+    while not sensor.interrupt:
+        sensor.clock.advance(0.01)
+    woke = sensor.clock()
+    print(f"  wake_on_motion:          {bus.transactions:6d} transactions, {sensor.samples} accel-only samples")
+    print(f"  woke up {woke - idle:.2f} s after motion started")
+    print()
+
+
+if __name__ == "__main__":
+    benchmark_read_paths()
+    benchmark_magnetometer()
+    benchmark_init()
+    benchmark_fifo()
+    benchmark_decimator()
+    benchmark_wake_on_motion()
@@ -0,0 +1,105 @@
+"""
+Benchmark of makerclass_spectrum on the host: pure Python FFT against the
+ulab (numpy) code path, fed from the simulated MPU FIFO.
+
+Run from the repository root:
+
+    pip install adafruit-circuitpython-busdevice adafruit-circuitpython-register
+    pip install numpy  # optional, stands in for ulab.numpy
+    python tools/benchmark_spectrum.py
+
+The host runs CPython, so only the ratio between the paths carries over to
+the board, not the absolute times.
+"""
+
+import cmath
+import math
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+# Appended, so the PyPI adafruit_register wins over the .mpy copy in lib/
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lib"))
+
+import makerclass_accelerometer  # pylint: disable=wrong-import-position
+import makerclass_spectrum  # pylint: disable=wrong-import-position
+import mpu_simulator  # pylint: disable=wrong-import-position
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+SAMPLE_RATE = 500.0
+VIBRATIONS = (37.0, 120.0)  # Hz
+AMPLITUDE_G = 0.2
+REPEATS = 20
+
+
+def collect_block(size):
+    """Fill a block from the simulated FIFO, return its samples"""
+    trace = mpu_simulator.vibrating(VIBRATIONS, amplitude_g=AMPLITUDE_G)
+    sensor = mpu_simulator.MPUSimulator(mpu_simulator.MPU6500, trace, noise_lsb=8)
+    bus = mpu_simulator.SimulatedI2C({0x68: sensor}, frequency=400000)
+    mpu = makerclass_accelerometer.MakerClassAccelerometer(bus, fast_init=True, calibration=False)
+    mpu.configure_odr(SAMPLE_RATE)
+    mpu.start_fifo(gyro=False)
+    spectrum = makerclass_spectrum.VibrationSpectrum(SAMPLE_RATE, size, use_ulab=False)
+    bus.reset_stats()
+    while not spectrum.update_from_fifo(mpu):
+        sensor.clock.advance(0.05)
+    print(
+        f"  collected {size} samples: {bus.transactions} transactions, "
+        f"{bus.bus_time * 1e3:.1f} ms bus, {mpu.fifo_overflows} overflows"
+    )
+    return list(spectrum._block)  # pylint: disable=protected-access
+
+
+def reference_magnitudes(samples):
+    """Direct DFT of the windowed block, O(n^2)"""
+    size = len(samples)
+    mean = sum(samples) / size
+    window = [0.5 - 0.5 * math.cos(2 * math.pi * i / size) for i in range(size)]
+    scale = 2.0 / sum(window)
+    windowed = [(samples[i] - mean) * window[i] for i in range(size)]
+    result = []
+    for k in range(size // 2):
+        total = sum(windowed[n] * cmath.exp(-2j * math.pi * k * n / size) for n in range(size))
+        result.append(abs(total) * scale)
+    return result
+
+
+def run(name, samples, use_ulab):
+    spectrum = makerclass_spectrum.VibrationSpectrum(SAMPLE_RATE, len(samples), use_ulab=use_ulab)
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        for value in samples:
+            spectrum.update(value)
+        spectrum.compute()
+    elapsed = (time.perf_counter() - start) / REPEATS
+    peaks = ", ".join(f"{f:6.2f} Hz {a / 9.80665:5.3f} g" for f, a in spectrum.dominant_frequencies(2))
+    print(f"  {name:<12} {elapsed * 1e3:8.2f} ms per block   {peaks}")
+    return spectrum
+
+
+def main():
+    print(f"Vibration at {VIBRATIONS} Hz, {AMPLITUDE_G} g each, sampled at {SAMPLE_RATE:.0f} Hz:")
+    for size in (64, 256, 1024):
+        print(f"Block of {size}:")
+        samples = collect_block(size)
+        python = run("pure Python", samples, use_ulab=False)
+        if numpy is not None:
+            makerclass_spectrum.np = numpy
+            run("numpy/ulab", samples, use_ulab=True)
+        else:
+            print("  numpy/ulab   not installed, skipped")
+        if size <= 256:
+            reference = reference_magnitudes(samples)
+            error = max(abs(a - b) for a, b in zip(python.magnitudes, reference))
+            print(f"  largest difference to a direct DFT: {error:.2e} m/s^2")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,554 @@
+"""
+`mpu_simulator`
+================================================================================
+
+Host-side simulator of the MPU6050/MPU6500/MPU9250 register map and of a
+`busio.I2C` bus, so `makerclass_accelerometer` runs unmodified on a PC
+without a GY-521 attached.
+
+* Author: MakerClass
+
+Simulated features:
+- WHO_AM_I, PWR_MGMT_1/2 (reset, sleep, cycle), SMPLRT_DIV, CONFIG, GYRO/ACCEL_CONFIG
+- Data registers (accel, temperature, gyro) generated from a motion trace
+- FIFO with FIFO_EN, USER_CTRL, FIFO_COUNT, FIFO_R_W and overflow
+- INT_STATUS (DATA_RDY, FIFO_OFLOW, motion) cleared on read
+- Wake-on-motion threshold on MOT_THR / WOM_THR
+- MPU6500/MPU9250 accel and gyro offset registers
+- MPU9250 AK8963 magnetometer, reachable through the bypass multiplexer or
+  copied into EXT_SENS_DATA by the I2C master (slave 0)
+- Bus errors: transactions NACKed at random with `SimulatedI2C.error_rate`
+
+Time is simulated: samples are produced when the simulation clock advances,
+either explicitly with `SimulatedClock.advance` or by the bus itself, which
+charges every transaction its duration at the configured bus frequency.
+
+**Software and Dependencies:**
+
+* CPython 3.8 or newer
+
+* To run the driver: Adafruit's Bus Device and Register libraries from PyPI
+  (``pip install adafruit-circuitpython-busdevice adafruit-circuitpython-register``)
+
+"""
+
+# imports
+__version__ = "1.0.0"
+__repo__ = "https://github.com/makerclass/workshop"
+
+import math
+import random
+import struct
+
+try:
+    from typing import Callable, Dict, Optional, Tuple
+except ImportError:
+    pass
+
+# Chip variants by WHO_AM_I
+MPU6050 = 0x68
+MPU6500 = 0x70
+MPU9250 = 0x71
+
+AK8963_ADDRESS = 0x0C
+
+_FIFO_SIZE = {MPU6050: 1024, MPU6500: 512, MPU9250: 512}
+_ACCEL_SENSITIVITY = (16384, 8192, 4096, 2048)  # LSB/g
+_GYRO_SENSITIVITY = (131, 65.5, 32.8, 16.4)     # LSB/(°/s)
+
+# Registers
+_SMPLRT_DIV = 0x19
+_CONFIG = 0x1A
+_GYRO_CONFIG = 0x1B
+_ACCEL_CONFIG = 0x1C
+_LP_ACCEL_ODR = 0x1E
+_MOT_THR = 0x1F
+_FIFO_EN = 0x23
+_INT_ENABLE = 0x38
+_INT_STATUS = 0x3A
+_ACCEL_OUT = 0x3B
+_MOT_DETECT_CTRL = 0x69
+_USER_CTRL = 0x6A
+_PWR_MGMT_1 = 0x6B
+_PWR_MGMT_2 = 0x6C
+_FIFO_COUNT_H = 0x72
+_FIFO_COUNT_L = 0x73
+_FIFO_R_W = 0x74
+_WHO_AM_I = 0x75
+_XG_OFFSET = 0x13
+_XA_OFFSET = 0x77
+_INT_PIN_CFG = 0x37
+_I2C_SLV0_ADDR = 0x25
+_I2C_SLV0_REG = 0x26
+_I2C_SLV0_CTRL = 0x27
+_EXT_SENS_DATA = 0x49
+
+_LP_WAKE_RATES = (1.25, 5.0, 20.0, 40.0)  # MPU6050 LP_WAKE_CTRL
+_LP_ACCEL_RATES = (0.24, 0.49, 0.98, 1.95, 3.91, 7.81, 15.63, 31.25, 62.5, 125.0, 250.0, 500.0)
+
+# Factory accelerometer trim of the simulated MPU6500/MPU9250, bit 0 reserved
+_FACTORY_ACCEL_OFFSETS = (0x1A2B, -0x0C45, 0x2311)
+
+
+class SimulatedClock:
+    """Monotonic clock driven by the simulation instead of the wall clock"""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        """Move the clock forward"""
+        self.now += seconds
+
+
+# Motion traces: callables returning
+# (accel X, Y, Z in g, gyro X, Y, Z in °/s, temperature in °C) for a time in seconds
+
+
+def still(x: float = 0.0, y: float = 0.0, z: float = 1.0, temperature: float = 25.0):
+    """Motion trace of a board lying still, gravity on ``(x, y, z)`` in g"""
+
+    def trace(_t: float) -> Tuple[float, float, float, float, float, float, float]:
+        return (x, y, z, 0.0, 0.0, 0.0, temperature)
+
+    return trace
+
+
+def rotating(rate_dps: float, axis: int = 2, temperature: float = 25.0):
+    """Motion trace of a board spinning around ``axis`` at ``rate_dps`` °/s,
+    starting flat with gravity on Z"""
+
+    def trace(t: float) -> Tuple[float, float, float, float, float, float, float]:
+        angle = math.radians(rate_dps * t)
+        gravity = [0.0, 0.0, 1.0]
+        if axis == 0:
+            gravity = [0.0, math.sin(angle), math.cos(angle)]
+        elif axis == 1:
+            gravity = [-math.sin(angle), 0.0, math.cos(angle)]
+        gyro = [0.0, 0.0, 0.0]
+        gyro[axis] = rate_dps
+        return (gravity[0], gravity[1], gravity[2], gyro[0], gyro[1], gyro[2], temperature)
+
+    return trace
+
+
+def vibrating(frequencies, amplitude_g: float = 0.1, axis: int = 2, temperature: float = 25.0):
+    """Motion trace of a still board vibrating along ``axis`` with the sum of
+    sine waves at ``frequencies`` (Hz), each ``amplitude_g`` strong"""
+
+    def trace(t: float) -> Tuple[float, float, float, float, float, float, float]:
+        accel = [0.0, 0.0, 1.0]
+        for frequency in frequencies:
+            accel[axis] += amplitude_g * math.sin(2 * math.pi * frequency * t)
+        return (accel[0], accel[1], accel[2], 0.0, 0.0, 0.0, temperature)
+
+    return trace
+
+
+def sequence(*segments):
+    """Chain motion traces, each segment is ``(duration in seconds, trace)``.
+    The last trace continues forever."""
+
+    def trace(t: float) -> Tuple[float, float, float, float, float, float, float]:
+        start = 0.0
+        for duration, segment in segments[:-1]:
+            if t < start + duration:
+                return segment(t - start)
+            start += duration
+        return segments[-1][1](t - start)
+
+    return trace
+
+
+class AK8963Simulator:
+    """Register level model of the AK8963 magnetometer inside the MPU9250.
+
+    :param field: Magnetic field ``(x, y, z)`` in µT in the accelerometer axes
+    :param asa: Fuse ROM sensitivity adjustment values for X, Y and Z
+    """
+
+    def __init__(self, field: Tuple[float, float, float] = (20.0, 0.0, -40.0), asa=(0xB0, 0xB3, 0xA6)) -> None:
+        self.field = field
+        self.asa = asa
+        self.registers = bytearray(0x13)
+        self.registers[0x00] = 0x48  # WIA
+        self._pointer = 0
+
+    def _measure(self) -> None:
+        # The AK8963 axes are X = accel Y, Y = accel X, Z = -accel Z
+        x, y, z = self.field
+        raw = []
+        for axis, value in enumerate((y, x, -z)):
+            adjustment = (self.asa[axis] - 128) / 256 + 1
+            raw.append(_clamp(round(value / 0.15 / adjustment)))
+        struct.pack_into("<3h", self.registers, 0x03, *raw)
+        self.registers[0x02] = 0x01  # ST1 DRDY
+        self.registers[0x09] = 0x10  # ST2 BITM, 16 bit output
+
+    def write(self, data: bytes) -> None:
+        """Handle an I2C write: register address followed by values"""
+        if not data:
+            return
+        self._pointer = data[0]
+        for value in data[1:]:
+            if self._pointer == 0x0A:  # CNTL1
+                self.registers[0x0A] = value
+                if value == 0x0F:  # fuse ROM access
+                    self.registers[0x10:0x13] = bytes(self.asa)
+            self._pointer += 1
+
+    def read(self, length: int) -> bytes:
+        """Handle an I2C read from the current register address"""
+        if self.registers[0x0A] & 0x0F in (0x02, 0x06):  # continuous measurement
+            self._measure()
+        out = bytearray()
+        for _ in range(length):
+            register = self._pointer
+            out.append(self.registers[register] if register < len(self.registers) else 0)
+            if register == 0x10 and self.registers[0x0A] != 0x0F:
+                out[-1] = 0  # fuse ROM only readable in fuse ROM mode
+            self._pointer += 1
+        return bytes(out)
+
+
+class MPUSimulator:
+    """Register level model of an MPU6050/MPU6500/MPU9250.
+
+    :param int chip_id: WHO_AM_I of the simulated chip, `MPU6050`, `MPU6500` or `MPU9250`
+    :param trace: Motion trace, see `still`, `rotating`, `vibrating` and `sequence`
+    :param SimulatedClock clock: Clock that drives the sample generation
+    :param float noise_lsb: Amplitude of deterministic pseudo random noise added to every axis
+    """
+
+    def __init__(
+        self,
+        chip_id: int = MPU6500,
+        trace=None,
+        clock: Optional[SimulatedClock] = None,
+        noise_lsb: float = 0.0,
+    ) -> None:
+        if chip_id not in _FIFO_SIZE:
+            raise ValueError("Unsupported chip_id")
+        self.chip_id = chip_id
+        self.trace = trace or still()
+        self.clock = clock or SimulatedClock()
+        self.noise_lsb = noise_lsb
+        self.registers = bytearray(128)
+        self.fifo = bytearray()
+        self.samples = 0
+        """Number of samples the simulated sensor has produced"""
+        self._noise_state = 12345
+        self._pointer = 0
+        self._next_sample = 0.0
+        self._previous_accel = None
+        self.magnetometer = AK8963Simulator() if chip_id == MPU9250 else None
+        """The `AK8963Simulator` of an MPU9250, `None` on other chips"""
+        self.power_on_reset()
+
+    def power_on_reset(self) -> None:
+        """Load the register reset values, as after power-up or a device reset"""
+        self.registers[:] = bytes(128)
+        self.registers[_WHO_AM_I] = self.chip_id
+        self.registers[_PWR_MGMT_1] = 0x40 if self.chip_id == MPU6050 else 0x01
+        if self.chip_id != MPU6050:
+            for axis, value in enumerate(_FACTORY_ACCEL_OFFSETS):
+                struct.pack_into(">h", self.registers, _XA_OFFSET + 3 * axis, value)
+        self.fifo = bytearray()
+        self._previous_accel = None
+        self._next_sample = self.clock()
+
+    # I2C side
+
+    def bypass_devices(self) -> Dict[int, object]:
+        """Devices behind the MPU visible on the main bus, the AK8963 while the
+        bypass multiplexer is on and the I2C master off"""
+        registers = self.registers
+        if self.magnetometer and registers[_INT_PIN_CFG] & 0x02 and not registers[_USER_CTRL] & 0x20:
+            return {AK8963_ADDRESS: self.magnetometer}
+        return {}
+
+    def write(self, data: bytes) -> None:
+        """Handle an I2C write: register address followed by values"""
+        self.update()
+        if not data:
+            return
+        self._pointer = data[0]
+        for value in data[1:]:
+            self._write_register(self._pointer, value)
+            if self._pointer != _FIFO_R_W:
+                self._pointer = (self._pointer + 1) & 0x7F
+
+    def read(self, length: int) -> bytes:
+        """Handle an I2C read from the current register address"""
+        self.update()
+        out = bytearray()
+        for _ in range(length):
+            out.append(self._read_register(self._pointer))
+            if self._pointer != _FIFO_R_W:
+                self._pointer = (self._pointer + 1) & 0x7F
+        return bytes(out)
+
+    def _write_register(self, register: int, value: int) -> None:
+        if register in (_WHO_AM_I, _INT_STATUS, _FIFO_COUNT_H, _FIFO_COUNT_L) or 0x3B <= register <= 0x60:
+            return  # read-only
+        if register == _PWR_MGMT_1 and value & 0x80:
+            self.power_on_reset()
+            return
+        if register == _USER_CTRL and value & 0x04:
+            self.fifo = bytearray()
+            value &= ~0x04
+        if register == _FIFO_R_W:
+            return
+        self.registers[register] = value
+
+    def _read_register(self, register: int) -> int:
+        if register == _FIFO_R_W:
+            return self.fifo.pop(0) if self.fifo else 0
+        if register == _FIFO_COUNT_H:
+            return (len(self.fifo) >> 8) & 0xFF
+        if register == _FIFO_COUNT_L:
+            return len(self.fifo) & 0xFF
+        value = self.registers[register]
+        if register == _INT_STATUS:
+            self.registers[_INT_STATUS] = 0
+        return value
+
+    # Sample generation
+
+    @property
+    def interrupt(self) -> bool:
+        """Level of the INT pin: `True` while an enabled interrupt is pending"""
+        self.update()
+        return bool(self.registers[_INT_STATUS] & self.registers[_INT_ENABLE])
+
+    @property
+    def sample_rate(self) -> float:
+        """Current output data rate in Hz"""
+        if self.registers[_PWR_MGMT_1] & 0x20:  # cycle mode
+            if self.chip_id == MPU6050:
+                return _LP_WAKE_RATES[self.registers[_PWR_MGMT_2] >> 6]
+            return _LP_ACCEL_RATES[min(self.registers[_LP_ACCEL_ODR] & 0x0F, 11)]
+        dlpf = self.registers[_CONFIG] & 0x07
+        gyro_rate = 8000.0 if dlpf in (0, 7) else 1000.0
+        return gyro_rate / (1 + self.registers[_SMPLRT_DIV])
+
+    def update(self) -> None:
+        """Produce all samples due up to the current clock time. Bus accesses
+        do this automatically."""
+        if self.registers[_PWR_MGMT_1] & 0x40 and not self.registers[_PWR_MGMT_1] & 0x20:
+            self._next_sample = self.clock()  # sleeping
+            return
+        now = self.clock()
+        period = 1.0 / self.sample_rate
+        if now - self._next_sample > period * 4096:
+            # Far behind (e.g. the clock jumped), only the last samples can matter
+            self._next_sample = now - period * 4096
+        while self._next_sample <= now:
+            self._sample(self._next_sample)
+            self._next_sample += period
+
+    def _noise(self) -> int:
+        if not self.noise_lsb:
+            return 0
+        self._noise_state = (self._noise_state * 1103515245 + 12345) & 0x7FFFFFFF
+        return round((self._noise_state / 0x7FFFFFFF * 2 - 1) * self.noise_lsb)
+
+    def _sample(self, t: float) -> None:
+        ax, ay, az, gx, gy, gz, temperature = self.trace(t)
+        registers = self.registers
+        accel_sensitivity = _ACCEL_SENSITIVITY[(registers[_ACCEL_CONFIG] >> 3) & 3]
+        gyro_sensitivity = _GYRO_SENSITIVITY[(registers[_GYRO_CONFIG] >> 3) & 3]
+        accel = [ax * accel_sensitivity, ay * accel_sensitivity, az * accel_sensitivity]
+        gyro = [gx * gyro_sensitivity, gy * gyro_sensitivity, gz * gyro_sensitivity]
+        if self.chip_id != MPU6050:
+            for axis in range(3):
+                # Offset registers relative to the factory trim, 0.98 mg and 1/32.8 °/s steps
+                accel_offset = struct.unpack_from(">h", registers, _XA_OFFSET + 3 * axis)[0] >> 1
+                accel_offset -= _FACTORY_ACCEL_OFFSETS[axis] >> 1
+                accel[axis] += accel_offset * accel_sensitivity / 1024
+                gyro_offset = struct.unpack_from(">h", registers, _XG_OFFSET + 2 * axis)[0]
+                gyro[axis] += gyro_offset * gyro_sensitivity / 32.8
+        raw = [_clamp(round(value) + self._noise()) for value in accel]
+        raw.append(_clamp(round((temperature - 36.53) * 340)))
+        raw.extend(_clamp(round(value) + self._noise()) for value in gyro)
+        struct.pack_into(">7h", registers, _ACCEL_OUT, *raw)
+        self.samples += 1
+        registers[_INT_STATUS] |= 0x01  # DATA_RDY
+
+        self._run_i2c_master()
+        self._detect_motion(ax, ay, az)
+        self._push_fifo(registers[_ACCEL_OUT:_ACCEL_OUT + 14])
+
+    def _run_i2c_master(self) -> None:
+        # Slave 0 read into EXT_SENS_DATA, as the I2C master does after every sample
+        registers = self.registers
+        control = registers[_I2C_SLV0_CTRL]
+        if not self.magnetometer or not registers[_USER_CTRL] & 0x20 or not control & 0x80:
+            return
+        if registers[_I2C_SLV0_ADDR] != 0x80 | AK8963_ADDRESS:
+            return
+        length = control & 0x0F
+        self.magnetometer.write(bytes([registers[_I2C_SLV0_REG]]))
+        registers[_EXT_SENS_DATA:_EXT_SENS_DATA + length] = self.magnetometer.read(length)
+
+    def _detect_motion(self, ax: float, ay: float, az: float) -> None:
+        previous = self._previous_accel
+        self._previous_accel = (ax, ay, az)
+        if previous is None or not self.registers[0x38] & 0x40:
+            return
+        step = 0.002 if self.chip_id == MPU6050 else 0.004
+        threshold = self.registers[_MOT_THR] * step
+        if max(abs(ax - previous[0]), abs(ay - previous[1]), abs(az - previous[2])) > threshold:
+            self.registers[_INT_STATUS] |= 0x40
+
+    def _push_fifo(self, data: bytes) -> None:
+        sources = self.registers[_FIFO_EN]
+        if not self.registers[_USER_CTRL] & 0x40 or not sources:
+            return
+        frame = bytearray()
+        if sources & 0x08:
+            frame += data[0:6]
+        if sources & 0x80:
+            frame += data[6:8]
+        for bit, offset in ((0x40, 8), (0x20, 10), (0x10, 12)):
+            if sources & bit:
+                frame += data[offset:offset + 2]
+        self.fifo += frame
+        overflow = len(self.fifo) - _FIFO_SIZE[self.chip_id]
+        if overflow > 0:
+            del self.fifo[:overflow]  # the oldest bytes are overwritten
+            self.registers[_INT_STATUS] |= 0x10  # FIFO_OFLOW
+
+
+def _clamp(value: int) -> int:
+    return max(-32768, min(32767, value))
+
+
+class SimulatedI2C:
+    """Drop-in replacement for `busio.I2C` talking to simulated devices.
+
+    Every transaction advances the simulation clock by the time it would take
+    on a real bus, so sample timing and throughput behave realistically.
+
+    :param dict devices: Simulated devices by I2C address, each with
+        ``write(data)`` and ``read(length)`` methods
+    :param int frequency: Bus clock in Hz
+    :param SimulatedClock clock: Clock to advance, defaults to the clock of the first device
+    :param float error_rate: Probability that a transaction is NACKed, e.g. to
+        model a bus clocked faster than its wiring allows
+    :param int seed: Seed of the error generator, for repeatable runs
+    """
+
+    def __init__(
+        self,
+        devices: Dict[int, object],
+        frequency: int = 100000,
+        clock: Optional[SimulatedClock] = None,
+        error_rate: float = 0.0,
+        seed: int = 0,
+    ) -> None:
+        self.devices = devices
+        self.frequency = frequency
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        if clock is None:
+            clock = next((d.clock for d in devices.values() if hasattr(d, "clock")), SimulatedClock())
+        self.clock = clock
+        self._locked = False
+        self.transactions = 0
+        """Number of transactions, a write followed by a repeated start read counts once"""
+        self.bytes_written = 0
+        self.bytes_read = 0
+        self.bus_time = 0.0
+        """Seconds the bus was busy"""
+        self.transactions_by_address = {}
+
+    def reset_stats(self) -> None:
+        """Zero all counters"""
+        self.transactions = 0
+        self.bytes_written = 0
+        self.bytes_read = 0
+        self.bus_time = 0.0
+        self.transactions_by_address = {}
+
+    def try_lock(self) -> bool:
+        if self._locked:
+            return False
+        self._locked = True
+        return True
+
+    def unlock(self) -> None:
+        self._locked = False
+
+    def deinit(self) -> None:
+        pass
+
+    def scan(self):
+        # One address-only probe per address, like busio
+        found = []
+        for address in range(0x08, 0x78):
+            try:
+                self._device(address)
+            except OSError:
+                continue
+            self._account(address, 0, 0)
+            found.append(address)
+        return found
+
+    def _device(self, address: int):
+        if self.error_rate and self._random.random() < self.error_rate:
+            self._account(address, 0, 0)
+            raise OSError(5, "Input/output error")  # EIO, a glitch on the bus
+        if address in self.devices:
+            return self.devices[address]
+        for device in self.devices.values():
+            hidden = device.bypass_devices() if hasattr(device, "bypass_devices") else {}
+            if address in hidden:
+                return hidden[address]
+        self._account(address, 0, 0)
+        raise OSError(19, "No such device")  # ENODEV, as busio on NACK
+
+    def _account(self, address: int, written: int, read: int, restart: bool = False) -> None:
+        # start + address + ack, 9 clocks per data byte, stop; a repeated start adds another address byte
+        clocks = 1 + 9 + 9 * (written + read) + 1 + (10 if restart else 0)
+        duration = clocks / self.frequency
+        self.transactions += 1
+        self.bytes_written += written
+        self.bytes_read += read
+        self.bus_time += duration
+        self.transactions_by_address[address] = self.transactions_by_address.get(address, 0) + 1
+        self.clock.advance(duration)
+
+    def writeto(self, address: int, buffer, *, start: int = 0, end: Optional[int] = None) -> None:
+        data = bytes(buffer[start:end])
+        device = self._device(address)
+        device.write(data)
+        self._account(address, len(data), 0)
+
+    def readfrom_into(self, address: int, buffer, *, start: int = 0, end: Optional[int] = None) -> None:
+        end = len(buffer) if end is None else end
+        device = self._device(address)
+        buffer[start:end] = device.read(end - start)
+        self._account(address, 0, end - start)
+
+    def writeto_then_readfrom(
+        self,
+        address: int,
+        buffer_out,
+        buffer_in,
+        *,
+        out_start: int = 0,
+        out_end: Optional[int] = None,
+        in_start: int = 0,
+        in_end: Optional[int] = None,
+    ) -> None:
+        data = bytes(buffer_out[out_start:out_end])
+        in_end = len(buffer_in) if in_end is None else in_end
+        device = self._device(address)
+        device.write(data)
+        buffer_in[in_start:in_end] = device.read(in_end - in_start)
+        # Time is charged after the transfer: a real FIFO drains while it is being read
+        self._account(address, len(data), in_end - in_start, restart=True)